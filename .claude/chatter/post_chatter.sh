@@ -0,0 +1,18 @@
+#!/bin/bash
+
+# Chatter PostToolUse Hook - Clean up progress file after completion
+
+# Read hook input from stdin
+hook_input=$(cat)
+
+# Extract project directory
+project_dir=$(echo "$hook_input" | jq -r '.projectDir // "."')
+
+# Delay cleanup to show completion status briefly
+sleep 3
+
+# Remove progress file
+rm -f "$project_dir/.claude/chatter_progress.json"
+
+# Log cleanup
+echo "Chatter progress tracking cleaned up" >&2
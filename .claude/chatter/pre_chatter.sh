@@ -0,0 +1,25 @@
+#!/bin/bash
+
+# Chatter PreToolUse Hook - Initialize progress tracking
+
+# Read hook input from stdin
+hook_input=$(cat)
+
+# Extract project directory
+project_dir=$(echo "$hook_input" | jq -r '.projectDir // "."')
+
+# Create progress file for Chatter initialization
+mkdir -p "$project_dir/.claude"
+
+echo '{
+  "owner": "Chatter",
+  "phase": "initializing",
+  "step": 0,
+  "total": 1,
+  "percent": 0,
+  "status": "starting",
+  "updated_at": "'$(date -u +%Y-%m-%dT%H:%M:%S.%3NZ)'"
+}' > "$project_dir/.claude/chatter_progress.json"
+
+# Log initialization (will appear in transcript with Ctrl+R)
+echo "Chatter progress tracking initialized" >&2
@@ -0,0 +1,69 @@
+#!/bin/bash
+
+# Chatter Status Line Multiplexer  
+# Preserves existing status line while adding Chatter collaboration progress
+
+# Read JSON input from Claude Code
+input_json=$(cat)
+
+# Extract project directory
+project_dir=$(echo "$input_json" | jq -r '.workspace.project_dir // .workspace.current_dir // "."')
+
+# Check if Chatter is disabled
+if [[ -f "$project_dir/.claude/chatter/disable_statusline" ]]; then
+    # No original status line to fall back to
+    echo "Claude Code"
+    exit 0
+fi
+
+# Check for Chatter progress file
+progress_file="$project_dir/.claude/chatter_progress.json"
+chatter_status=""
+
+if [[ -f "$progress_file" ]]; then
+    # Read Chatter progress
+    owner=$(jq -r '.owner // "Chatter"' "$progress_file")
+    phase=$(jq -r '.phase // "working"' "$progress_file")
+    step=$(jq -r '.step // 0' "$progress_file")
+    total=$(jq -r '.total // 1' "$progress_file")
+    percent=$(jq -r '.percent // 0' "$progress_file")
+    current_model=$(jq -r '.current_model // ""' "$progress_file")
+    eta_s=$(jq -r '.eta_s // null' "$progress_file")
+    
+    # Format ETA
+    eta_text=""
+    if [[ "$eta_s" != "null" && "$eta_s" -gt 0 ]]; then
+        if [[ "$eta_s" -lt 60 ]]; then
+            eta_text=" (ETA ${eta_s}s)"
+        else
+            eta_m=$((eta_s / 60))
+            eta_text=" (ETA ${eta_m}m)"
+        fi
+    fi
+    
+    # Format model name (short)
+    model_short=""
+    if [[ -n "$current_model" ]]; then
+        model_short=$(echo "$current_model" | sed 's/chat_with_//' | sed 's/gpt/GPT-/' | sed 's/gemini3/Gemini/' | sed 's/claude41/Claude/' | sed 's/claude45/Claude/')
+    fi
+    
+    # Build Chatter status
+    chatter_status="[$owner] $step/$total • $percent% • $model_short $phase$eta_text"
+fi
+
+# No original status line configured
+original_status=""
+
+# Combine status lines
+if [[ -n "$chatter_status" && -n "$original_status" ]]; then
+    echo "$original_status | $chatter_status"
+elif [[ -n "$chatter_status" ]]; then
+    echo "$chatter_status"
+elif [[ -n "$original_status" ]]; then
+    echo "$original_status"
+else
+    # Fallback status
+    model=$(echo "$input_json" | jq -r '.model // "Claude"')
+    cost=$(echo "$input_json" | jq -r '.cost.total_cost_usd // 0')
+    echo "[$model] Ready • \$$(printf "%.3f" "$cost")"
+fi
@@ -0,0 +1,12 @@
+#!/bin/bash
+
+# Chatter Stop Hook - Clean up progress on interruption
+
+# Read hook input from stdin  
+hook_input=$(cat)
+
+# Extract project directory
+project_dir=$(echo "$hook_input" | jq -r '.projectDir // "."')
+
+# Remove progress file immediately on stop
+rm -f "$project_dir/.claude/chatter_progress.json"
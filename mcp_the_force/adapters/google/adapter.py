@@ -16,6 +16,7 @@ from google.genai import types
 
 from ..errors import ConfigurationException
 from ..protocol import CallContext, ToolDispatcher
+from ..tool_dispatcher import gather_bounded, max_parallel_tool_exec
 from .definitions import GeminiToolParams, GEMINI_MODEL_CAPABILITIES
 from .converters import (
     responses_to_contents,
@@ -527,10 +528,17 @@ class GeminiAdapter:
             if response.candidates and response.candidates[0].content:
                 contents.append(response.candidates[0].content)
 
-            # Execute each function call and collect responses
-            function_response_parts: List[types.Part] = []
+            # Execute the function calls concurrently; results keep call order
+            results = await gather_bounded(
+                function_call_parts,
+                lambda part: self._execute_function_call(
+                    part.function_call, tool_dispatcher, ctx
+                ),
+                max_parallel_tool_exec(self.capabilities.provider),
+            )
 
-            for fc_part in function_call_parts:
+            function_response_parts: List[types.Part] = []
+            for fc_part, result_str in zip(function_call_parts, results):
                 fc = fc_part.function_call
 
                 # Record function call in history (with thought_signature!)
@@ -551,19 +559,6 @@ class GeminiAdapter:
                         )
                 tool_interactions.append(fc_history_item)
 
-                # Execute tool
-                try:
-                    args_str = json.dumps(fc.args) if fc.args else "{}"
-                    result = await tool_dispatcher.execute(
-                        tool_name=fc.name,
-                        tool_args=args_str,
-                        context=ctx,
-                    )
-                    result_str = str(result) if result is not None else ""
-                except Exception as e:
-                    logger.error(f"[GEMINI] Tool execution error: {e}")
-                    result_str = f"Error executing tool: {str(e)}"
-
                 # Record function output in history
                 tool_interactions.append(
                     {
@@ -599,6 +594,22 @@ class GeminiAdapter:
         logger.warning(f"[GEMINI] Max tool loop iterations ({max_iterations}) reached")
         return extract_text_from_response(response), tool_interactions
 
+    async def _execute_function_call(
+        self, fc: Any, tool_dispatcher: ToolDispatcher, ctx: CallContext
+    ) -> str:
+        """Execute one function call; errors are returned as its result."""
+        try:
+            args_str = json.dumps(fc.args) if fc.args else "{}"
+            result = await tool_dispatcher.execute(
+                tool_name=fc.name,
+                tool_args=args_str,
+                context=ctx,
+            )
+            return str(result) if result is not None else ""
+        except Exception as e:
+            logger.error(f"[GEMINI] Tool execution error: {e}")
+            return f"Error executing tool: {str(e)}"
+
     async def _save_session(
         self,
         ctx: CallContext,
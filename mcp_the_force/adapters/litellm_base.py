@@ -9,8 +9,10 @@ import litellm
 from litellm import aresponses
 
 from .protocol import CallContext, ToolDispatcher
+from .tool_dispatcher import gather_bounded, max_parallel_tool_exec
 from .capabilities import AdapterCapabilities
 from .errors import ToolExecutionException
+from ..config import get_settings
 from ..unified_session_cache import UnifiedSessionCache
 from ..utils.image_loader import LoadedImage, load_images, ImageLoadError
 from ..utils.image_formatter import format_for_anthropic
@@ -57,7 +59,9 @@ def _ensure_litellm_header_patch() -> None:
     litellm._mcp_header_patch_installed = True
 
 
-def _sanitize_conversation_input(conversation_input: List[Dict[str, Any]]) -> None:
+def _sanitize_conversation_input(
+    conversation_input: List[Dict[str, Any]], start: int = 0
+) -> int:
     """
     Sanitize conversation_input to fix common issues that cause provider errors.
 
@@ -68,7 +72,14 @@ def _sanitize_conversation_input(conversation_input: List[Dict[str, Any]]) -> No
     - Items without content field (litellm bug: it calls .get("content") on ALL items)
     - function_call items registered in litellm's cache (so outputs can be paired)
 
+    Only items from index start onward are processed, so a caller that keeps
+    appending to an already sanitized conversation can pass the returned
+    length back in and touch each item once.
+
     Mutates conversation_input in-place.
+
+    Returns:
+        Length of conversation_input, i.e. the now-sanitized prefix
     """
     # Import litellm's tool cache to register function_call items
     # This is needed because litellm expects tool calls to be in its cache
@@ -87,7 +98,8 @@ def _sanitize_conversation_input(conversation_input: List[Dict[str, Any]]) -> No
     # We need to remove them from the input because litellm doesn't know how to handle them
     # Instead, we register them in the cache and the outputs will create the proper message format
     items_to_remove = []
-    for i, msg in enumerate(conversation_input):
+    for i in range(start, len(conversation_input)):
+        msg = conversation_input[i]
         msg_type = msg.get("type")
 
         # Items without a type but with a role should be treated as messages
@@ -201,6 +213,8 @@ def _sanitize_conversation_input(conversation_input: List[Dict[str, Any]]) -> No
             f"Removed function_call from input: call_id={removed.get('call_id')}, name={removed.get('name')}"
         )
 
+    return len(conversation_input)
+
 
 def _dedup_tool_ids(conversation_input: List[Dict[str, Any]]) -> None:
     """
@@ -521,6 +535,102 @@ class LiteLLMBaseAdapter:
         """
         pass
 
+    def _function_call_item(self, tool_call: Any) -> Dict[str, Any]:
+        """Build the function_call record kept in the conversation for a call."""
+        logger.debug(
+            f"Executing tool: {tool_call.name} raw={getattr(tool_call, '__dict__', {})}"
+        )
+        # Preserve the function_call record (including thought_signature for Gemini)
+        fc_msg = {
+            "type": "function_call",
+            "name": getattr(tool_call, "name", None),
+            "arguments": getattr(tool_call, "arguments", None),
+            "call_id": getattr(tool_call, "call_id", None),
+        }
+        thought_sig = getattr(tool_call, "thought_signature", None)
+        if not thought_sig and hasattr(tool_call, "provider_specific_fields"):
+            thought_sig = getattr(tool_call, "provider_specific_fields", {}).get(
+                "thought_signature"
+            )
+        logger.debug(
+            f"[TOOL_CALL] name={getattr(tool_call, 'name', None)} "
+            f"call_id={getattr(tool_call, 'call_id', None)} "
+            f"has_thought_sig={bool(thought_sig)} "
+            f"provider_fields={getattr(tool_call, 'provider_specific_fields', None)}"
+        )
+        if not thought_sig:
+            # Use Gemini's special validator-skip signature when no real signature is available
+            # See: https://ai.google.dev/gemini-api/docs/thought-signatures
+            thought_sig = "skip_thought_signature_validator"
+        fc_msg["thought_signature"] = thought_sig
+        fc_msg["thoughtSignature"] = thought_sig  # some SDKs expect camelCase
+        # Gemini expects the signature nested under functionCall
+        try:
+            import json as _json
+
+            parsed_args = getattr(tool_call, "arguments", None)
+            if isinstance(parsed_args, str):
+                try:
+                    parsed_args = _json.loads(parsed_args)
+                except Exception:
+                    parsed_args = parsed_args
+            fc_msg["functionCall"] = {
+                "name": getattr(tool_call, "name", None),
+                "args": parsed_args,
+                "thoughtSignature": thought_sig,
+            }
+        except Exception:
+            pass  # non-fatal; best-effort enrichment
+        return fc_msg
+
+    async def _execute_tool_call(
+        self, tool_call: Any, tool_dispatcher: ToolDispatcher, ctx: CallContext
+    ) -> Dict[str, Any]:
+        """Execute one tool call and return its function_call_output item.
+
+        Errors are returned as the call's output so sibling calls of the
+        same turn are unaffected.
+        """
+        try:
+            result = await tool_dispatcher.execute(
+                tool_name=tool_call.name,
+                tool_args=tool_call.arguments,
+                context=ctx,
+            )
+            output = str(result)
+        except Exception as e:
+            tool_error = ToolExecutionException(
+                tool_name=tool_call.name, error=e, provider=self.display_name
+            )
+            logger.error(str(tool_error))
+            output = f"Error: {str(e)}"
+        return {
+            "type": "function_call_output",
+            "call_id": tool_call.call_id,
+            "output": output,
+        }
+
+    def _log_conversation_items(
+        self, label: str, items: List[Dict[str, Any]], start: int = 0
+    ) -> None:
+        """Log the shape of each conversation item from start onward.
+
+        Diagnostics for provider errors such as content=None; only called when
+        logging.debug_conversation_items is enabled.
+        """
+        for idx in range(start, len(items)):
+            item = items[idx]
+            item_content = item.get("content")
+            logger.warning(
+                f"[{self.display_name}] {label}[{idx}]: type={item.get('type', 'NO_TYPE')}, "
+                f"role={item.get('role', 'NO_ROLE')}, "
+                f"content_type={type(item_content).__name__}, has_content={'content' in item}"
+            )
+            if "content" in item and item_content is None:
+                logger.error(
+                    f"[{self.display_name}] {label} content=None at {idx}: {item}"
+                )
+
     async def _handle_tool_calls(
         self,
         response: Any,
@@ -542,6 +652,8 @@ class LiteLLMBaseAdapter:
         """
         final_response = response
         updated_conversation = list(conversation_input)
+        # generate() already sanitized conversation_input; only new items need it
+        sanitized = len(updated_conversation)
 
         # Handle tool calls in Responses API format
         while True:
@@ -576,105 +688,29 @@ class LiteLLMBaseAdapter:
                 }
             )
 
-            # Execute tool calls
-            for tool_call in tool_calls:
-                logger.debug(
-                    f"Executing tool: {tool_call.name} raw={getattr(tool_call, '__dict__', {})}"
-                )
-                # Preserve the function_call record (including thought_signature for Gemini)
-                fc_msg = {
-                    "type": "function_call",
-                    "name": getattr(tool_call, "name", None),
-                    "arguments": getattr(tool_call, "arguments", None),
-                    "call_id": getattr(tool_call, "call_id", None),
-                }
-                thought_sig = getattr(tool_call, "thought_signature", None)
-                if not thought_sig and hasattr(tool_call, "provider_specific_fields"):
-                    thought_sig = getattr(
-                        tool_call, "provider_specific_fields", {}
-                    ).get("thought_signature")
-                logger.debug(
-                    f"[TOOL_CALL] name={getattr(tool_call, 'name', None)} "
-                    f"call_id={getattr(tool_call, 'call_id', None)} "
-                    f"has_thought_sig={bool(thought_sig)} "
-                    f"provider_fields={getattr(tool_call, 'provider_specific_fields', None)}"
-                )
-                if not thought_sig:
-                    # Use Gemini's special validator-skip signature when no real signature is available
-                    # See: https://ai.google.dev/gemini-api/docs/thought-signatures
-                    thought_sig = "skip_thought_signature_validator"
-                fc_msg["thought_signature"] = thought_sig
-                fc_msg["thoughtSignature"] = thought_sig  # some SDKs expect camelCase
-                # Gemini expects the signature nested under functionCall
-                try:
-                    import json as _json
-
-                    parsed_args = getattr(tool_call, "arguments", None)
-                    if isinstance(parsed_args, str):
-                        try:
-                            parsed_args = _json.loads(parsed_args)
-                        except Exception:
-                            parsed_args = parsed_args
-                    fc_msg["functionCall"] = {
-                        "name": getattr(tool_call, "name", None),
-                        "args": parsed_args,
-                        "thoughtSignature": thought_sig,
-                    }
-                except Exception:
-                    pass  # non-fatal; best-effort enrichment
-                updated_conversation.append(fc_msg)
-
-                try:
-                    result = await tool_dispatcher.execute(
-                        tool_name=tool_call.name,
-                        tool_args=tool_call.arguments,
-                        context=ctx,
-                    )
-                    updated_conversation.append(
-                        {
-                            "type": "function_call_output",
-                            "call_id": tool_call.call_id,
-                            "output": str(result),
-                        }
-                    )
-                except Exception as e:
-                    tool_error = ToolExecutionException(
-                        tool_name=tool_call.name, error=e, provider=self.display_name
-                    )
-                    logger.error(str(tool_error))
-                    updated_conversation.append(
-                        {
-                            "type": "function_call_output",
-                            "call_id": tool_call.call_id,
-                            "output": f"Error: {str(e)}",
-                        }
-                    )
+            # Execute the turn's tool calls concurrently; outputs keep call order
+            fc_items = [self._function_call_item(call) for call in tool_calls]
+            outputs = await gather_bounded(
+                tool_calls,
+                lambda call: self._execute_tool_call(call, tool_dispatcher, ctx),
+                max_parallel_tool_exec(self.capabilities.provider),
+            )
+            for fc_item, output in zip(fc_items, outputs):
+                updated_conversation.append(fc_item)
+                updated_conversation.append(output)
 
             # Continue conversation with tool results
-            logger.warning(
-                f"[{self.display_name}] TOOL LOOP BEFORE SANITIZE: {len(updated_conversation)} items"
-            )
-            for idx, item in enumerate(updated_conversation):
-                if "content" in item and item["content"] is None:
-                    logger.error(
-                        f"[{self.display_name}] TOOL LOOP PRE-SANITIZE content=None at {idx}: {item}"
-                    )
-            _sanitize_conversation_input(updated_conversation)
-            logger.warning(
-                f"[{self.display_name}] TOOL LOOP AFTER SANITIZE: {len(updated_conversation)} items"
-            )
-            for idx, item in enumerate(updated_conversation):
-                item_type = item.get("type", "NO_TYPE")
-                item_content = item.get("content")
-                content_type = type(item_content).__name__
-                logger.warning(
-                    f"[{self.display_name}] TOOL_LOOP_INPUT[{idx}]: type={item_type}, "
-                    f"content_type={content_type}, has_content={'content' in item}"
+            debug_items = get_settings().logging.debug_conversation_items
+            if debug_items:
+                self._log_conversation_items(
+                    "TOOL LOOP PRE-SANITIZE", updated_conversation, start=sanitized
                 )
-                if "content" in item and item["content"] is None:
-                    logger.error(
-                        f"[{self.display_name}] TOOL LOOP POST-SANITIZE content=None at {idx}: {item}"
-                    )
+            sanitized = _sanitize_conversation_input(updated_conversation, sanitized)
+            logger.debug(
+                f"[{self.display_name}] Tool loop input: {len(updated_conversation)} items"
+            )
+            if debug_items:
+                self._log_conversation_items("TOOL_LOOP_INPUT", updated_conversation)
             request_params["input"] = updated_conversation
             response = await aresponses(**request_params)
             final_response = response
@@ -832,23 +868,10 @@ class LiteLLMBaseAdapter:
             )
 
             # Sanitize and deduplicate conversation input to satisfy providers (e.g., Anthropic)
-            logger.warning(
-                f"[{self.display_name}] BEFORE SANITIZE: {len(conversation_input)} items"
-            )
-            for idx, item in enumerate(conversation_input):
-                if "content" in item and item["content"] is None:
-                    logger.error(
-                        f"[{self.display_name}] PRE-SANITIZE content=None at {idx}: {item}"
-                    )
+            debug_items = get_settings().logging.debug_conversation_items
+            if debug_items:
+                self._log_conversation_items("PRE-SANITIZE", conversation_input)
             _sanitize_conversation_input(conversation_input)
-            logger.warning(
-                f"[{self.display_name}] AFTER SANITIZE: {len(conversation_input)} items"
-            )
-            for idx, item in enumerate(conversation_input):
-                if "content" in item and item["content"] is None:
-                    logger.error(
-                        f"[{self.display_name}] POST-SANITIZE content=None at {idx}: {item}"
-                    )
             _dedup_tool_ids(conversation_input)
 
             # Get tool declarations
@@ -883,20 +906,8 @@ class LiteLLMBaseAdapter:
                 f"input_size={input_size:,} bytes, tools_count={tools_count}"
             )
 
-            # DEBUG: Log each input item to find content=None issue
-            for idx, item in enumerate(input_data):
-                item_type = item.get("type", "NO_TYPE")
-                item_role = item.get("role", "NO_ROLE")
-                item_content = item.get("content")
-                content_type = type(item_content).__name__
-                logger.warning(
-                    f"[{self.display_name}] INPUT[{idx}]: type={item_type}, role={item_role}, "
-                    f"content_type={content_type}, has_content={'content' in item}"
-                )
-                if item_content is None and "content" in item:
-                    logger.error(
-                        f"[{self.display_name}] FOUND content=None at index {idx}: {item}"
-                    )
+            if debug_items:
+                self._log_conversation_items("INPUT", input_data)
 
             # Ensure headers propagate to acompletion even if aresponses drops them
             token = _LITELLM_EXTRA_HEADERS_CTX.set(request_params.get("extra_headers"))
@@ -29,8 +29,11 @@ GLOBAL_TOOL_LIMITER = asyncio.Semaphore(MAX_PARALLEL_TOOL_EXEC)
 # --- Polling ---
 # Start polling for background jobs after 3 seconds
 INITIAL_POLL_DELAY_SEC = 3.0
-# Cap the exponential backoff for polling at 30 seconds
+# Cap the polling interval at 30 seconds
 MAX_POLL_INTERVAL_SEC = 30.0
+# Poll interval as a fraction of the time a response has been running, by
+# status; queued responses still have to start, so they are polled less
+POLL_ELAPSED_FRACTION = {"queued": 1.0, "in_progress": 0.5}
 
 # --- Timeouts ---
 # Models with longer timeouts than this threshold use background mode
@@ -3,7 +3,6 @@
 import asyncio
 import copy
 import logging
-import random
 import json
 import jsonschema
 from abc import ABC, abstractmethod
@@ -15,6 +14,7 @@ from .client import OpenAIClientFactory
 from .models import OpenAIRequest
 from .definitions import get_model_capability
 from ..protocol import CallContext, ToolCall
+from ..tool_dispatcher import max_parallel_tool_exec
 from ..errors import (
     AdapterException,
     ErrorCategory,
@@ -22,11 +22,8 @@ from ..errors import (
     GatewayTimeoutException,
     RetryWithReducedContextException,
 )
-from .constants import (
-    INITIAL_POLL_DELAY_SEC,
-    MAX_POLL_INTERVAL_SEC,
-    STREAM_TIMEOUT_THRESHOLD,
-)
+from .constants import STREAM_TIMEOUT_THRESHOLD
+from .poller import get_background_poller
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +106,40 @@ class BaseFlowStrategy(ABC):
 
         return api_params
 
+    def _log_request_size(self, api_params: Dict[str, Any], label: str) -> None:
+        """Log how many tokens a request sends, without tokenizing on the hot path.
+
+        Uses the prompt size TokenBudgetOptimizer already computed when the
+        executor passed it along; otherwise the request is only tokenized
+        when DEBUG logging is enabled.
+        """
+        estimated = self.context.request.estimated_prompt_tokens
+        if isinstance(estimated, int):
+            logger.debug(
+                f"[OPENAI] {label} with ~{estimated:,} planned prompt tokens "
+                f"for session {self.context.session_id}"
+            )
+            return
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        from ...utils.token_counter import count_tokens
+
+        api_content_parts = []
+        if "input" in api_params:
+            api_content_parts.append(api_params["input"])
+        if "instructions" in api_params:
+            api_content_parts.append(api_params["instructions"])
+        if "messages" in api_params:
+            for msg in api_params["messages"]:
+                if isinstance(msg, dict) and "content" in msg:
+                    api_content_parts.append(msg["content"])
+
+        actual_api_tokens = count_tokens(api_content_parts)
+        logger.debug(
+            f"[OPENAI] {label} with {actual_api_tokens:,} tokens for session {self.context.session_id}"
+        )
+
     def _build_tools_list(self) -> List[Dict[str, Any]]:
         """Build the tools list for the API request using the tool_dispatcher."""
         capability = get_model_capability(self.context.request.model)
@@ -262,7 +293,7 @@ class BaseFlowStrategy(ABC):
             vector_store_ids=self.context.vector_store_ids,
         )
         tool_results = await self.context.tool_dispatcher.execute_batch(
-            tool_calls, call_context
+            tool_calls, call_context, limit=max_parallel_tool_exec("openai")
         )
 
         # The new input is just the list of tool outputs. The server maintains state.
@@ -314,30 +345,7 @@ class BackgroundFlowStrategy(BaseFlowStrategy):
         if self.context.tools:
             api_params["tools"] = self.context.tools
 
-        # DEBUG: Log exact API request for token analysis
-        import os
-        from ...utils.token_counter import count_tokens
-
-        debug_file = f".mcp-the-force/debug_api_request_{self.context.session_id}.json"
-        os.makedirs(os.path.dirname(debug_file), exist_ok=True)
-
-        # Calculate actual tokens that will be sent to API
-        api_content_parts = []
-        if "input" in api_params:
-            api_content_parts.append(api_params["input"])
-        if "instructions" in api_params:
-            api_content_parts.append(api_params["instructions"])
-        if "messages" in api_params:
-            for msg in api_params["messages"]:
-                if isinstance(msg, dict) and "content" in msg:
-                    api_content_parts.append(msg["content"])
-
-        actual_api_tokens = count_tokens(api_content_parts)
-
-        # Debug JSON file saving removed to reduce clutter
-        logger.debug(
-            f"[OPENAI] API request with {actual_api_tokens:,} tokens for session {self.context.session_id}"
-        )
+        self._log_request_size(api_params, "API request")
 
         initial_response = await self.context.client.responses.create(**api_params)
         response_id = initial_response.id
@@ -345,66 +353,62 @@ class BackgroundFlowStrategy(BaseFlowStrategy):
         if initial_response.status == "completed":
             job = initial_response
         else:
-            delay = INITIAL_POLL_DELAY_SEC
-            start_poll_time = asyncio.get_event_loop().time()
-            while True:
-                await asyncio.sleep(delay)
-                elapsed = asyncio.get_event_loop().time() - start_poll_time
-                if elapsed >= self.context.timeout_remaining:
-                    raise TimeoutException(
-                        f"Job {response_id} timed out",
-                        elapsed,
-                        self.context.request.timeout,
-                    )
+            # One shared task polls all outstanding responses of this client
+            # and wakes us when this one finishes
+            poller = get_background_poller(self.context.client)
+            try:
+                job = await poller.wait(response_id, self.context.timeout_remaining)
+            except asyncio.TimeoutError:
+                raise TimeoutException(
+                    f"Job {response_id} timed out",
+                    self.context.timeout_remaining,
+                    self.context.request.timeout,
+                )
 
-                job = await self.context.client.responses.retrieve(response_id)
-                if job.status == "completed":
-                    break
-                if job.status not in ["queued", "in_progress"]:
-                    error = getattr(job, "error", None)
-                    error_message = "Unknown error"
-                    if error:
-                        # Handle both object and dict forms
-                        if hasattr(error, "message"):
-                            error_message = error.message
-                        elif isinstance(error, dict):
-                            error_message = error.get("message", "Unknown error")
-                        else:
-                            error_message = str(error)
-
-                    # Check for incomplete_details when status is "incomplete"
-                    incomplete_details = getattr(job, "incomplete_details", None)
-                    if incomplete_details:
-                        reason = None
-                        if hasattr(incomplete_details, "reason"):
-                            reason = incomplete_details.reason
-                        elif isinstance(incomplete_details, dict):
-                            reason = incomplete_details.get("reason")
-
-                        if reason:
-                            logger.warning(
-                                f"[INCOMPLETE_RESPONSE] Job {response_id} incomplete. "
-                                f"Reason: {reason}. "
-                                f"Session: {self.context.session_id}"
-                            )
-                            error_message = f"{reason}"
-
-                            # For max_output_tokens, signal retry with reduced context
-                            if reason == "max_output_tokens":
-                                raise RetryWithReducedContextException(
-                                    reason=reason,
-                                )
-                            else:
-                                logger.info(
-                                    f"[INCOMPLETE_RESPONSE] Context retry not applicable for "
-                                    f"incomplete reason: {reason}"
-                                )
-
-                    raise AdapterException(
-                        ErrorCategory.TRANSIENT_API,
-                        f"Run failed with status {job.status}: {error_message}",
+        if job.status != "completed":
+            error = getattr(job, "error", None)
+            error_message = "Unknown error"
+            if error:
+                # Handle both object and dict forms
+                if hasattr(error, "message"):
+                    error_message = error.message
+                elif isinstance(error, dict):
+                    error_message = error.get("message", "Unknown error")
+                else:
+                    error_message = str(error)
+
+            # Check for incomplete_details when status is "incomplete"
+            incomplete_details = getattr(job, "incomplete_details", None)
+            if incomplete_details:
+                reason = None
+                if hasattr(incomplete_details, "reason"):
+                    reason = incomplete_details.reason
+                elif isinstance(incomplete_details, dict):
+                    reason = incomplete_details.get("reason")
+
+                if reason:
+                    logger.warning(
+                        f"[INCOMPLETE_RESPONSE] Job {response_id} incomplete. "
+                        f"Reason: {reason}. "
+                        f"Session: {self.context.session_id}"
                     )
-                delay = min(delay * 1.8 + random.uniform(0, 0.2), MAX_POLL_INTERVAL_SEC)
+                    error_message = f"{reason}"
+
+                    # For max_output_tokens, signal retry with reduced context
+                    if reason == "max_output_tokens":
+                        raise RetryWithReducedContextException(
+                            reason=reason,
+                        )
+                    else:
+                        logger.info(
+                            f"[INCOMPLETE_RESPONSE] Context retry not applicable for "
+                            f"incomplete reason: {reason}"
+                        )
+
+            raise AdapterException(
+                ErrorCategory.TRANSIENT_API,
+                f"Run failed with status {job.status}: {error_message}",
+            )
 
         function_calls = self._extract_function_calls(job)
         if function_calls:
@@ -437,32 +441,7 @@ class StreamingFlowStrategy(BaseFlowStrategy):
         if self.context.tools:
             api_params["tools"] = self.context.tools
 
-        # DEBUG: Log exact API request for token analysis (streaming)
-        import os
-        from ...utils.token_counter import count_tokens
-
-        debug_file = (
-            f".mcp-the-force/debug_api_request_streaming_{self.context.session_id}.json"
-        )
-        os.makedirs(os.path.dirname(debug_file), exist_ok=True)
-
-        # Calculate actual tokens that will be sent to API
-        api_content_parts = []
-        if "input" in api_params:
-            api_content_parts.append(api_params["input"])
-        if "instructions" in api_params:
-            api_content_parts.append(api_params["instructions"])
-        if "messages" in api_params:
-            for msg in api_params["messages"]:
-                if isinstance(msg, dict) and "content" in msg:
-                    api_content_parts.append(msg["content"])
-
-        actual_api_tokens = count_tokens(api_content_parts)
-
-        # Debug JSON file saving removed to reduce clutter
-        logger.debug(
-            f"[OPENAI] Streaming API request with {actual_api_tokens:,} tokens for session {self.context.session_id}"
-        )
+        self._log_request_size(api_params, "Streaming API request")
 
         stream = await asyncio.wait_for(
             self.context.client.responses.create(**api_params),
@@ -31,6 +31,8 @@ class OpenAIRequest(BaseModel):
     disable_history_search: bool = Field(default=False, exclude=True)
     return_debug: bool = Field(default=False, exclude=True)
     max_output_tokens: Optional[int] = Field(default=None, exclude=True)
+    # Prompt size computed by TokenBudgetOptimizer, used for request logging
+    estimated_prompt_tokens: Optional[int] = Field(default=None, exclude=True)
     timeout: float = Field(
         default=1800.0, exclude=True
     )  # 30 minutes for reasoning models
@@ -0,0 +1,204 @@
+"""Shared poller for OpenAI background responses.
+
+Every background request used to run its own ``responses.retrieve`` loop.
+A ``BackgroundResponsePoller`` instead tracks all outstanding response IDs
+of one client from a single task: each response is polled on its own
+schedule, which stretches as the response keeps running, and the coroutine
+awaiting it is woken as soon as a poll sees it finish.
+"""
+
+import asyncio
+import logging
+import random
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .constants import (
+    INITIAL_POLL_DELAY_SEC,
+    MAX_POLL_INTERVAL_SEC,
+    POLL_ELAPSED_FRACTION,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses of a response that is still running
+PENDING_STATUSES = frozenset({"queued", "in_progress"})
+
+
+@dataclass
+class _Pending:
+    """An outstanding response and the waiters for it."""
+
+    client: Any
+    response_id: str
+    future: "asyncio.Future[Any]"
+    started_at: float
+    next_poll_at: float
+    waiters: int = 1
+    polls: int = 0
+
+
+def next_poll_interval(elapsed: float, status: Optional[str]) -> float:
+    """Seconds until the next poll of a response.
+
+    A response that has been running for a while is unlikely to finish in
+    the next few seconds, so the interval grows with elapsed time. Queued
+    responses have not started yet and are polled less eagerly.
+
+    Args:
+        elapsed: Seconds since the response was created
+        status: Status seen on the last poll
+
+    Returns:
+        Interval between INITIAL_POLL_DELAY_SEC and MAX_POLL_INTERVAL_SEC,
+        with a little jitter so responses do not stay in lockstep
+    """
+    fraction = POLL_ELAPSED_FRACTION.get(status or "", 0.5)
+    interval = elapsed * fraction + random.uniform(0, 0.2)
+    return min(max(interval, INITIAL_POLL_DELAY_SEC), MAX_POLL_INTERVAL_SEC)
+
+
+class BackgroundResponsePoller:
+    """Polls all outstanding background responses of one client.
+
+    The polling task runs only while responses are outstanding. A response
+    whose poll raises resolves its waiters with that exception.
+    """
+
+    def __init__(self, client: Any):
+        # Only pending entries reference the client, so the poller does not
+        # keep it alive through the module-level WeakKeyDictionary
+        self._client_ref = weakref.ref(client)
+        self._pending: Dict[str, _Pending] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def outstanding(self) -> int:
+        """Number of responses currently being polled."""
+        return len(self._pending)
+
+    async def wait(self, response_id: str, timeout: float) -> Any:
+        """Wait until a background response leaves the queued/in_progress state.
+
+        Args:
+            response_id: ID returned by ``responses.create``
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The retrieved response, in its final status
+
+        Raises:
+            asyncio.TimeoutError: If the response is still running after timeout
+        """
+        entry = self._register(response_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry.future), timeout)
+        finally:
+            self._unregister(entry)
+
+    def _register(self, response_id: str) -> _Pending:
+        entry = self._pending.get(response_id)
+        if entry is not None:
+            entry.waiters += 1
+            return entry
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        client = self._client_ref()
+        if client is None:
+            raise RuntimeError("OpenAI client was garbage collected")
+        entry = _Pending(
+            client=client,
+            response_id=response_id,
+            future=loop.create_future(),
+            started_at=now,
+            next_poll_at=now + INITIAL_POLL_DELAY_SEC,
+        )
+        self._pending[response_id] = entry
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return entry
+
+    def _unregister(self, entry: _Pending) -> None:
+        entry.waiters -= 1
+        if entry.waiters <= 0 and self._pending.get(entry.response_id) is entry:
+            del self._pending[entry.response_id]
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            now = loop.time()
+            due = [e for e in self._pending.values() if e.next_poll_at <= now]
+            if not due:
+                next_at = min(e.next_poll_at for e in self._pending.values())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), next_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            logger.debug(
+                f"[POLLER] Polling {len(due)} of {len(self._pending)} background responses"
+            )
+            await asyncio.gather(*(self._poll(entry) for entry in due))
+
+    async def _poll(self, entry: _Pending) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            job = await entry.client.responses.retrieve(entry.response_id)
+        except Exception as e:
+            self._resolve(entry, exception=e)
+            return
+
+        entry.polls += 1
+        status = getattr(job, "status", None)
+        if status in PENDING_STATUSES:
+            now = loop.time()
+            entry.next_poll_at = now + next_poll_interval(
+                now - entry.started_at, status
+            )
+            return
+
+        logger.debug(
+            f"[POLLER] Response {entry.response_id} finished with status {status} "
+            f"after {entry.polls} polls"
+        )
+        self._resolve(entry, result=job)
+
+    def _resolve(
+        self,
+        entry: _Pending,
+        result: Any = None,
+        exception: Optional[BaseException] = None,
+    ) -> None:
+        if self._pending.get(entry.response_id) is not entry:
+            # Every waiter gave up while the poll was in flight
+            return
+        del self._pending[entry.response_id]
+        if exception is not None:
+            entry.future.set_exception(exception)
+        else:
+            entry.future.set_result(result)
+
+
+_pollers: "weakref.WeakKeyDictionary[Any, BackgroundResponsePoller]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_background_poller(client: Any) -> BackgroundResponsePoller:
+    """Return the shared poller for an AsyncOpenAI client.
+
+    Clients are created per event loop by OpenAIClientFactory, so each loop
+    gets its own poller; it is dropped together with its client.
+    """
+    poller = _pollers.get(client)
+    if poller is None:
+        poller = BackgroundResponsePoller(client)
+        _pollers[client] = poller
+    return poller
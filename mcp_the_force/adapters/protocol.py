@@ -42,16 +42,20 @@ class ToolDispatcher(Protocol):
         ...
 
     async def execute_batch(
-        self, tool_calls: List[ToolCall], context: CallContext
+        self,
+        tool_calls: List[ToolCall],
+        context: CallContext,
+        limit: Optional[int] = None,
     ) -> List[str]:
         """Execute multiple tools in parallel and return their results.
 
         Args:
             tool_calls: List of tool calls to execute
             context: Call context
+            limit: Most tool calls running at once (default: all of them)
 
         Returns:
-            List of string results, one per tool call
+            List of string results, one per tool call and in the same order
         """
         ...
 
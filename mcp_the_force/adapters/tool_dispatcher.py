@@ -3,13 +3,59 @@
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
 from .tool_handler import ToolHandler
 from .protocol import CallContext, ToolCall
 from .capabilities import AdapterCapabilities
+from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Used when the provider's settings have no max_parallel_tool_exec
+DEFAULT_MAX_PARALLEL_TOOL_EXEC = 8
+
+# Capability provider names whose settings section is named differently
+_PROVIDER_SETTINGS = {"google": "gemini"}
+
+
+def max_parallel_tool_exec(provider: str) -> int:
+    """Return how many tool calls of one model turn may run at once.
+
+    Args:
+        provider: Adapter capability provider name (e.g. "xai", "google")
+    """
+    section = _PROVIDER_SETTINGS.get(provider, provider)
+    try:
+        value: int = getattr(getattr(get_settings(), section), "max_parallel_tool_exec")
+    except AttributeError:
+        return DEFAULT_MAX_PARALLEL_TOOL_EXEC
+    return max(value, 1)
+
+
+async def gather_bounded(
+    items: Sequence[T], run: Callable[[T], Awaitable[R]], limit: int
+) -> List[R]:
+    """Run ``run`` on every item concurrently, at most ``limit`` at a time.
+
+    This is the one place tool calls of a model turn are fanned out: the
+    native tool loops and ``ToolDispatcher.execute_batch`` all go through it.
+    Results are returned in the order of ``items``. ``run`` is expected to
+    handle its own errors so one failing call does not affect the others.
+    """
+    if len(items) <= 1:
+        return [await run(item) for item in items]
+
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def bounded(item: T) -> R:
+        async with semaphore:
+            return await run(item)
+
+    return list(await asyncio.gather(*(bounded(item) for item in items)))
+
 
 class ToolDispatcher:
     """Concrete implementation of the ToolDispatcher protocol.
@@ -78,16 +124,21 @@ class ToolDispatcher:
             return f"Error executing {tool_name}: {str(e)}"
 
     async def execute_batch(
-        self, tool_calls: List[ToolCall], context: CallContext
+        self,
+        tool_calls: List[ToolCall],
+        context: CallContext,
+        limit: Optional[int] = None,
     ) -> List[str]:
         """Execute multiple tools in parallel and return their results.
 
         Args:
             tool_calls: List of tool calls to execute
             context: Call context
+            limit: Most tool calls running at once (default: all of them)
 
         Returns:
-            List of string results, one per tool call
+            List of string results, one per tool call and in the same order.
+            A failing call returns its error message as its result.
         """
 
         async def execute_single(tool_call: ToolCall) -> str:
@@ -118,8 +169,6 @@ class ToolDispatcher:
                 logger.error(f"Tool execution failed for {tool_call.tool_name}: {e}")
                 return f"Error executing {tool_call.tool_name}: {str(e)}"
 
-        # Execute all tools in parallel
-        tasks = [execute_single(tool_call) for tool_call in tool_calls]
-        results = await asyncio.gather(*tasks)
-
-        return results
+        return await gather_bounded(
+            tool_calls, execute_single, limit or len(tool_calls)
+        )
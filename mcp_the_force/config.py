@@ -35,6 +35,21 @@ class LoggingConfig(BaseModel):
         default="http://localhost:9428", description="Victoria Logs URL"
     )
     victoria_logs_enabled: bool = Field(True, description="Enable Victoria Logs")
+    victoria_logs_batch_size: int = Field(
+        500, description="Log records per VictoriaLogs push request", ge=1
+    )
+    victoria_logs_flush_interval: float = Field(
+        2.0, description="Maximum seconds a log record waits before shipping", gt=0
+    )
+    victoria_logs_queue_size: int = Field(
+        10000,
+        description="Log records buffered before the oldest are dropped",
+        ge=1,
+    )
+    debug_conversation_items: bool = Field(
+        False,
+        description="Log every conversation item sent by LiteLLM adapters (slow)",
+    )
     loki_app_tag: str = Field("mcp-the-force", description="Loki app tag")
     project_path: Optional[str] = Field(None, description="Project path for logging")
 
@@ -70,7 +85,7 @@ class ProviderConfig(BaseModel):
     )
     max_parallel_tool_exec: int = Field(
         default=8,
-        description="Maximum parallel tool executions for OpenAI",
+        description="Maximum tool calls from one model turn executed in parallel",
     )
     enable_upload_compression: bool = Field(
         False, description="Enable gzip compression for large file uploads"
@@ -151,6 +166,12 @@ class MCPConfig(BaseModel):
     thread_pool_workers: int = Field(
         10, description="Max workers for shared thread pool", ge=1, le=100
     )
+    job_workers: int = Field(
+        4, description="Max async jobs executed concurrently", ge=1, le=64
+    )
+    job_workers_per_tool: int = Field(
+        2, description="Max concurrent async jobs per tool", ge=1, le=64
+    )
     default_vector_store_provider: str = Field(
         "openai", description="Default provider for vector stores"
     )
@@ -212,6 +233,9 @@ class VectorStoreConfig(BaseModel):
     cleanup_probability: float = Field(
         0.02, description="Cleanup probability on operations", ge=0.0, le=1.0
     )
+    persist_embeddings: bool = Field(
+        True, description="Cache HNSW embeddings in the session database"
+    )
 
 
 class HistoryStorageConfig(BaseModel):
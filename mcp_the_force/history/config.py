@@ -256,9 +256,28 @@ class HistoryStorageConfig:
                     results.extend(
                         [(row["store_type"], row["store_id"]) for row in unified_rows]
                     )
+
+                    # Sessions written since the message log keep history there
+                    log_query = """
+                        SELECT 'session' as store_type,
+                               (u.project || '||' || u.tool || '||' || u.session_id) as store_id
+                        FROM unified_sessions u
+                        WHERE u.history IS NULL
+                          AND u.tool LIKE 'chat_with_%'
+                          AND EXISTS (
+                              SELECT 1 FROM session_messages m
+                              WHERE m.project = u.project
+                                AND m.tool = u.tool
+                                AND m.session_id = u.session_id
+                          )
+                    """
+                    log_rows = self._db.execute(log_query).fetchall()
+                    results.extend(
+                        [(row["store_type"], row["store_id"]) for row in log_rows]
+                    )
                 except sqlite3.OperationalError as e:
-                    # unified_sessions table doesn't exist yet - this is OK for older databases
-                    if "no such table: unified_sessions" not in str(e):
+                    # Session tables don't exist yet - this is OK for older databases
+                    if "no such table" not in str(e):
                         raise  # Re-raise if it's a different error
 
             logger.debug(
@@ -1,9 +1,11 @@
 """SQLite-backed job queue for long-running async tasks."""
 
+import asyncio
 import json
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Collection, Dict, Optional, Set, Tuple
 from pathlib import Path
 
 from ..sqlite_base_cache import BaseSQLiteCache
@@ -39,6 +41,19 @@ class JobQueue(BaseSQLiteCache):
             table_name="jobs",
             create_table_sql=create_sql,
         )
+        if self._conn is None:
+            raise RuntimeError("Database connection is not initialized")
+        with self._conn:
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status_started "
+                "ON jobs(status, started_at)"
+            )
+
+        # Workers waiting for a job, woken by enqueue or a finished job
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._waiters_lock = threading.Lock()
+        # Incremented by every notify(), so waiters can detect missed wake-ups
+        self.generation = 0
 
     async def enqueue(
         self,
@@ -70,26 +85,81 @@ class JobQueue(BaseSQLiteCache):
             ),
             fetch=False,
         )
+        self.notify()
 
     async def claim_next_pending(
-        self,
+        self, exclude_tools: Collection[str] = ()
     ) -> Optional[Tuple[str, str, Dict[str, Any], int]]:
-        """Atomically claim the next pending job for execution."""
+        """Atomically claim the oldest pending job for execution.
+
+        The job is selected and marked running in one statement, so two
+        workers can never claim the same job.
+
+        Args:
+            exclude_tools: Tool IDs whose jobs should be left pending
+        """
         now = int(time.time())
+        exclude = list(exclude_tools)
+        tool_filter = ""
+        if exclude:
+            tool_filter = f"AND tool_id NOT IN ({','.join('?' for _ in exclude)}) "
         rows = await self._execute_async(
-            "SELECT job_id, tool_id, payload, max_runtime_s FROM jobs WHERE status='pending' ORDER BY started_at LIMIT 1"
+            "UPDATE jobs SET status='running', started_at=?, updated_at=? "
+            "WHERE status='pending' AND job_id = ("
+            "SELECT job_id FROM jobs WHERE status='pending' "
+            f"{tool_filter}ORDER BY started_at LIMIT 1) "
+            "RETURNING job_id, tool_id, payload, max_runtime_s",
+            (now, now, *exclude),
         )
         if not rows:
             return None
         job_id, tool_id, payload_json, max_runtime = rows[0]
-        # mark running
-        await self._execute_async(
-            "UPDATE jobs SET status='running', started_at=?, updated_at=? WHERE job_id=?",
+        return job_id, tool_id, json.loads(payload_json), max_runtime
+
+    async def claim(
+        self, job_id: str
+    ) -> Optional[Tuple[str, str, Dict[str, Any], int]]:
+        """Atomically claim a specific job if it is still pending."""
+        now = int(time.time())
+        rows = await self._execute_async(
+            "UPDATE jobs SET status='running', started_at=?, updated_at=? "
+            "WHERE job_id=? AND status='pending' "
+            "RETURNING job_id, tool_id, payload, max_runtime_s",
             (now, now, job_id),
-            fetch=False,
         )
+        if not rows:
+            return None
+        job_id, tool_id, payload_json, max_runtime = rows[0]
         return job_id, tool_id, json.loads(payload_json), max_runtime
 
+    def notify(self) -> None:
+        """Wake every worker waiting in wait_for_job."""
+        with self._waiters_lock:
+            self.generation += 1
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait_for_job(self, timeout: float, generation: int) -> None:
+        """Wait until a job is enqueued or a worker slot frees up.
+
+        Returns immediately if notify() was called since ``generation`` was
+        read, and after ``timeout`` seconds regardless, so jobs enqueued by
+        another process are still picked up.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._waiters_lock:
+            if self.generation != generation:
+                return
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._waiters_lock:
+                self._waiters.discard(waiter)
+
     async def complete(self, job_id: str, result: Any) -> None:
         now = int(time.time())
         await self._execute_async(
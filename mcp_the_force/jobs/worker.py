@@ -2,7 +2,10 @@
 
 import asyncio
 import logging
+from collections import Counter
+from typing import Any, Dict, Optional
 
+from ..config import get_settings
 from ..tools.registry import get_tool
 from ..tools.executor import executor
 from ..tools.integration import scope_manager  # reuse scope manager for isolation
@@ -11,6 +14,27 @@ from .queue import get_job_queue
 logger = logging.getLogger(__name__)
 
 
+async def _execute_claimed(
+    job_id: str, tool_id: str, payload: Dict[str, Any], max_runtime_s: int
+) -> None:
+    """Run a job that has already been marked running and record its outcome."""
+    queue = get_job_queue()
+    meta = get_tool(tool_id)
+    if meta is None:
+        await queue.fail(job_id, f"Unknown tool_id {tool_id}")
+        return
+
+    try:
+        # Execute tool via executor with routed args
+        # Pass max_runtime_s as timeout override so async jobs aren't limited by tool's default timeout
+        async with scope_manager.scope(f"job_{job_id}"):
+            result = await executor.execute(meta, timeout=max_runtime_s, **payload)
+        await queue.complete(job_id, result)
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.error(f"[JOB] job {job_id} failed: {exc}")
+        await queue.fail(job_id, str(exc))
+
+
 async def run_job_once(job_id: str) -> None:
     """Execute a single job by id."""
     queue = get_job_queue()
@@ -22,8 +46,8 @@ async def run_job_once(job_id: str) -> None:
 
     if job["status"] == "pending":
         # claim it
-        claimed = await queue.claim_next_pending()
-        if not claimed or claimed[0] != job_id:
+        claimed = await queue.claim(job_id)
+        if not claimed:
             return
         _, tool_id, payload, claimed_max_runtime = claimed
         max_runtime_s = claimed_max_runtime or max_runtime_s
@@ -31,31 +55,63 @@ async def run_job_once(job_id: str) -> None:
         tool_id = job["tool_id"]
         payload = job["payload"]
 
-    meta = get_tool(tool_id)
-    if meta is None:
-        await queue.fail(job_id, f"Unknown tool_id {tool_id}")
-        return
+    await _execute_claimed(job_id, tool_id, payload, max_runtime_s)
 
-    try:
-        # Execute tool via executor with routed args
-        # Pass max_runtime_s as timeout override so async jobs aren't limited by tool's default timeout
-        async with scope_manager.scope(f"job_{job_id}"):
-            result = await executor.execute(meta, timeout=max_runtime_s, **payload)
-        await queue.complete(job_id, result)
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"[JOB] job {job_id} failed: {exc}")
-        await queue.fail(job_id, str(exc))
 
+async def worker_loop(
+    interval: float = 5.0,
+    stop_event: asyncio.Event | None = None,
+    max_workers: Optional[int] = None,
+    max_per_tool: Optional[int] = None,
+):
+    """Continuously run pending jobs on a bounded pool of concurrent tasks.
+
+    Args:
+        interval: Seconds between queue checks when no wake-up arrives; only
+            matters for jobs enqueued by another process
+        stop_event: Stops the loop when set
+        max_workers: Jobs run at once (default: ``mcp.job_workers``)
+        max_per_tool: Jobs of one tool_id run at once
+            (default: ``mcp.job_workers_per_tool``)
+    """
+    settings = get_settings()
+    max_workers = max_workers or settings.mcp.job_workers
+    max_per_tool = max_per_tool or settings.mcp.job_workers_per_tool
 
-async def worker_loop(interval: float = 1.0, stop_event: asyncio.Event | None = None):
-    """Continuously run pending jobs."""
     queue = get_job_queue()
-    while True:
-        if stop_event and stop_event.is_set():
-            break
-        claimed = await queue.claim_next_pending()
-        if claimed:
-            job_id, _, _, _ = claimed
-            await run_job_once(job_id)
-            continue
-        await asyncio.sleep(interval)
+    running: Dict["asyncio.Task[None]", str] = {}
+    per_tool: Counter = Counter()
+
+    def _finished(task: "asyncio.Task[None]") -> None:
+        tool_id = running.pop(task)
+        per_tool[tool_id] -= 1
+        # A slot is free; let the loop claim the next job
+        queue.notify()
+
+    try:
+        while True:
+            if stop_event and stop_event.is_set():
+                break
+            generation = queue.generation
+            claimed = None
+            if len(running) < max_workers:
+                busy_tools = {
+                    tool_id
+                    for tool_id, count in per_tool.items()
+                    if count >= max_per_tool
+                }
+                claimed = await queue.claim_next_pending(exclude_tools=busy_tools)
+            if claimed:
+                job_id, tool_id, payload, max_runtime_s = claimed
+                task = asyncio.create_task(
+                    _execute_claimed(job_id, tool_id, payload, max_runtime_s)
+                )
+                running[task] = tool_id
+                per_tool[tool_id] += 1
+                task.add_done_callback(_finished)
+                continue
+            await queue.wait_for_job(interval, generation)
+    finally:
+        for task in list(running):
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,124 @@
+"""Local service for dry-running the context optimizer."""
+
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+from ..utils.pipeline_stats import pipeline_stats, stats_since
+from ..utils.token_cache import token_cache_stats
+
+# Context window assumed when no model is given
+DEFAULT_MODEL_LIMIT = 128_000
+
+
+def _hit_rate(stats: Dict[str, int]) -> Optional[float]:
+    lookups = stats["hits"] + stats["hash_hits"] + stats["misses"]
+    if lookups == 0:
+        return None
+    return round((stats["hits"] + stats["hash_hits"]) / lookups, 4)
+
+
+class PlanContextService:
+    """Run TokenBudgetOptimizer without calling a model and report its cost."""
+
+    async def execute(self, **kwargs: Any) -> Dict[str, Any]:
+        """Plan context for a model call and measure where the time goes.
+
+        Args:
+            context: File or directory paths, as for a chat tool's ``context``
+            priority_context: Paths that must be inline
+            model: Chat tool name (e.g. ``chat_with_gpt52``) whose context
+                window, developer prompt and session history are used
+            session_id: Existing session to plan a follow-up call for; a
+                throwaway ID is used when omitted
+            instructions: Instructions to size the prompt with
+
+        Returns:
+            Dictionary containing the plan (inline/overflow files and
+            predicted tokens), per-stage wall time in milliseconds, files and
+            bytes read, tokens counted and token cache hit rates. Nothing is
+            recorded for the session.
+        """
+        context: List[str] = kwargs.get("context") or []
+        priority_context: List[str] = kwargs.get("priority_context") or []
+        model: Optional[str] = kwargs.get("model")
+        session_id: str = kwargs.get("session_id") or f"plan-{uuid.uuid4().hex[:12]}"
+
+        if not context and not priority_context:
+            raise ValueError(
+                "At least one context or priority_context path is required"
+            )
+
+        model_limit = DEFAULT_MODEL_LIMIT
+        developer_prompt = ""
+        tool_name = ""
+        if model:
+            # Import here to avoid circular dependency
+            from ..prompts import get_developer_prompt
+            from ..tools.registry import get_tool
+
+            metadata = get_tool(model)
+            if metadata is None or metadata.model_config.get("service_cls"):
+                raise ValueError(f"Unknown chat model '{model}'")
+            model_limit = metadata.model_config.get("context_window", model_limit)
+            developer_prompt = get_developer_prompt(metadata.model_config["model_name"])
+            tool_name = metadata.id
+
+        project_path = get_settings().logging.project_path
+        project_name = os.path.basename(project_path or os.getcwd())
+
+        from ..optimization.token_budget_optimizer import (
+            FIXED_TOKEN_RESERVE,
+            TokenBudgetOptimizer,
+        )
+
+        optimizer = TokenBudgetOptimizer(
+            model_limit=model_limit,
+            fixed_reserve=FIXED_TOKEN_RESERVE,
+            session_id=session_id,
+            context_paths=context,
+            priority_paths=priority_context,
+            developer_prompt=developer_prompt,
+            instructions=kwargs.get("instructions") or "",
+            project_name=project_name,
+            tool_name=tool_name,
+            persist_decisions=False,
+        )
+
+        io_before = pipeline_stats()
+        cache_before = token_cache_stats()
+        start = time.perf_counter()
+        plan = await optimizer.optimize()
+        total_ms = (time.perf_counter() - start) * 1000
+        io = stats_since(io_before)
+        cache_after = token_cache_stats()
+        token_cache = {
+            key: cache_after[key] - cache_before.get(key, 0) for key in cache_after
+        }
+
+        return {
+            "session_id": session_id,
+            "model_limit": model_limit,
+            "plan": {
+                "total_prompt_tokens": plan.total_prompt_tokens,
+                "inline_files": [
+                    {"path": f.path, "tokens": f.tokens} for f in plan.inline_files
+                ],
+                "overflow_files": plan.get_overflow_paths(),
+                "file_tree_included": bool(plan.file_tree),
+            },
+            "timings_ms": {
+                **{
+                    stage: round(seconds * 1000, 2)
+                    for stage, seconds in optimizer.stage_timings.items()
+                },
+                "total": round(total_ms, 2),
+            },
+            "files_read": io["files_read"],
+            "bytes_read": io["bytes_read"],
+            "texts_tokenized": io["texts_tokenized"],
+            "tokens_counted": io["tokens_counted"],
+            "token_cache": {**token_cache, "hit_rate": _hit_rate(token_cache)},
+        }
@@ -1,6 +1,6 @@
 """Search history service for searching project history stores."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import logging
 import asyncio
 from datetime import datetime, timezone
@@ -10,6 +10,7 @@ from ..history.async_config import get_async_history_config
 from ..vectorstores.manager import VectorStoreManager
 from ..utils.redaction import redact_secrets
 from ..tools.search_dedup_sqlite import SQLiteSearchDeduplicator
+from ..unified_session_cache import UnifiedSessionCache
 from ..utils.scope_manager import scope_manager
 
 logger = logging.getLogger(__name__)
@@ -237,15 +238,35 @@ class HistorySearchService:
                 "metadata": {"total_results": 0, "stores_searched": 0},
             }
 
+        # Session stores share one full-text index, so they are searched with
+        # a single query each instead of one task per session
+        session_store_ids = {
+            store_id
+            for store_type, store_id in stores_to_search
+            if store_type == "session"
+        }
+
         # Search each store concurrently
         async with search_semaphore:
             tasks = []
+            task_store_types = []
             for store_type, store_id in stores_to_search:
+                if store_type == "session":
+                    continue
                 for query in queries:
                     task = self._search_single_store(
                         store_type, store_id, query, max_results
                     )
                     tasks.append(task)
+                    task_store_types.append(store_type)
+            if session_store_ids:
+                for query in queries:
+                    tasks.append(
+                        self._search_unified_sessions(
+                            session_store_ids, query, max_results
+                        )
+                    )
+                    task_store_types.append("session")
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -258,7 +279,7 @@ class HistorySearchService:
                 logger.error(f"Search task {i} failed: {result}")
                 continue
 
-            store_type = stores_to_search[i // len(queries)][0]
+            store_type = task_store_types[i]
             if not isinstance(result, Exception):
                 logger.debug(
                     f"Processing result type: {type(result)}, length: {len(result) if hasattr(result, '__len__') else 'N/A'}"
@@ -311,13 +332,14 @@ class HistorySearchService:
         # Apply session-based deduplication if session_id is provided
         if session_id and HistorySearchService._deduplicator:
             # Call deduplicate_results with proper parameters
-            deduplicated, duplicate_count = (
-                HistorySearchService._deduplicator.deduplicate_results(
-                    all_results=formatted_results,
-                    max_results=max_results,
-                    session_id=session_id,
-                    query=" AND ".join(queries) if queries else "",
-                )
+            (
+                deduplicated,
+                duplicate_count,
+            ) = await HistorySearchService._deduplicator.deduplicate_results(
+                all_results=formatted_results,
+                max_results=max_results,
+                session_id=session_id,
+                query=" AND ".join(queries) if queries else "",
             )
             formatted_results = deduplicated
             if duplicate_count > 0:
@@ -366,8 +388,8 @@ class HistorySearchService:
 
             # Handle raw session stores (virtual stores from unified_sessions) only when explicitly requested
             if store_type == "session":
-                return await self._search_unified_session_store(
-                    store_id, query, max_results
+                return await self._search_unified_sessions(
+                    {store_id}, query, max_results
                 )
 
             # Get the store using vector store manager
@@ -432,93 +454,59 @@ class HistorySearchService:
             logger.error(f"Failed to search store {store_id}: {e}")
             raise
 
-    async def _search_unified_session_store(
-        self, store_id: str, query: str, max_results: int
+    async def _search_unified_sessions(
+        self, store_ids: Set[str], query: str, max_results: int
     ) -> List[Dict[str, Any]]:
-        """Search within a unified session store (Force conversation)."""
-        try:
-            # Parse virtual store_id: "project||tool||session_id"
-            parts = store_id.split("||")
-            if len(parts) != 3:
-                logger.error(f"Invalid unified session store_id format: {store_id}")
-                return []
-
-            project, tool, session_id = parts
-            logger.debug(
-                f"[SEARCH_HISTORY] Searching unified session: project={project}, tool={tool}, session_id={session_id}"
-            )
-
-            # Get session history from unified_sessions table
-            async def _get_session_history():
-                loop = asyncio.get_running_loop()
-
-                def _fetch_history():
-                    if hasattr(self, "memory_config") and self.memory_config:
-                        db = self.memory_config._sync_config._db
-                        query_sql = "SELECT history FROM unified_sessions WHERE project=? AND tool=? AND session_id=?"
-                        row = db.execute(
-                            query_sql, (project, tool, session_id)
-                        ).fetchone()
-                        return row["history"] if row else None
-                    return None
-
-                return await loop.run_in_executor(None, _fetch_history)
-
-            history = await _get_session_history()
-            if not history:
-                logger.debug(f"No history found for session {session_id}")
-                return []
-
-            # Simple text search within the conversation history
-            import json
+        """Search Force conversations through the session full-text index.
 
-            try:
-                history_data = json.loads(history)
-                results = []
-
-                # Search through conversation messages
-                for i, message in enumerate(history_data):
-                    if isinstance(message, dict):
-                        content = message.get("content", "")
-                        if isinstance(content, list):
-                            # Handle content arrays
-                            text_content = " ".join(
-                                item.get("text", "")
-                                for item in content
-                                if isinstance(item, dict) and item.get("type") == "text"
-                            )
-                        else:
-                            text_content = str(content)
-
-                        # Simple case-insensitive search
-                        if query.lower() in text_content.lower():
-                            result = {
-                                "content": text_content[:1000],  # Limit content length
-                                "store_id": store_id,
-                                "score": 0.8,  # Fixed score for text matches
-                                "metadata": {
-                                    "project": project,
-                                    "tool": tool,
-                                    "session_id": session_id,
-                                    "message_index": i,
-                                    "role": message.get("role", "unknown"),
-                                    "source": "unified_session",
-                                },
-                            }
-                            results.append(result)
+        Args:
+            store_ids: Virtual session store IDs ("project||tool||session_id")
+            query: Free-text query; every word must match
+            max_results: Maximum number of messages to return
 
-                            if len(results) >= max_results:
-                                break
+        Returns:
+            Matching messages ranked by BM25, with a snippet as content
+        """
+        try:
+            filters: Dict[str, Any] = {"tool_prefix": "chat_with_"}
+            if len(store_ids) == 1:
+                parts = next(iter(store_ids)).split("||")
+                if len(parts) != 3:
+                    logger.error(f"Invalid unified session store_id format: {parts}")
+                    return []
+                filters = dict(zip(("project", "tool", "session_id"), parts))
+
+            hits = await UnifiedSessionCache.search_messages(
+                query, max_results, **filters
+            )
 
-                logger.debug(
-                    f"[SEARCH_HISTORY] Unified session {session_id} returned {len(results)} results"
+            results = []
+            for hit in hits:
+                store_id = f"{hit['project']}||{hit['tool']}||{hit['session_id']}"
+                if store_id not in store_ids:
+                    continue
+                results.append(
+                    {
+                        "content": hit["snippet"],
+                        "store_id": store_id,
+                        "score": hit["score"],
+                        "metadata": {
+                            "project": hit["project"],
+                            "tool": hit["tool"],
+                            "session_id": hit["session_id"],
+                            "message_index": hit["message_index"],
+                            "role": hit["role"],
+                            "timestamp": hit["updated_at"],
+                            "source": "unified_session",
+                        },
+                    }
                 )
-                return results
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse session history JSON: {e}")
-                return []
+            logger.debug(
+                f"[SEARCH_HISTORY] Session index returned {len(results)} results for query '{query}'"
+            )
+            return results
 
         except Exception as e:
-            logger.error(f"Failed to search unified session store {store_id}: {e}")
+            logger.error(f"Failed to search unified sessions: {e}")
             return []
@@ -1,35 +1,196 @@
-"""Custom logging handlers with timeout support."""
+"""Custom logging handlers with timeout support and batched shipping."""
+
+import gzip
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 from logging_loki import LokiHandler
 import requests
+from urllib3.util.retry import Retry
+
+
+class DropOldestQueue(queue.Queue):
+    """
+    Bounded queue that discards its oldest item instead of rejecting a new one.
+
+    Keeps memory bounded when the shipping thread falls behind, while the
+    most recent records (usually the interesting ones) are kept. The number
+    of discarded items is counted in ``dropped``.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        """Put an item, discarding the oldest one if the queue is full."""
+        with self.not_full:
+            if 0 < self.maxsize <= self._qsize():
+                self._get()
+                self.dropped += 1
+                # The discarded item will never be marked done
+                self.unfinished_tasks -= 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers when the queue goes idle.
+
+    Batching handlers only send when a batch fills up or a record arrives
+    after the batch's maximum age; waking up every ``flush_interval``
+    seconds ships whatever is buffered even if no further records arrive.
+    Records discarded by a ``DropOldestQueue`` are reported as a warning in
+    the next batch, and ``stop()`` flushes everything still buffered.
+    """
+
+    _sentinel = None
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        flush_interval: float = 2.0,
+        respect_handler_level: bool = False,
+    ):
+        super().__init__(
+            log_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self.log_queue: queue.Queue = log_queue
+        self.flush_interval = flush_interval
+        self._reported_drops = 0
+
+    def dequeue(self, block: bool) -> Any:
+        """Wait for the next record, flushing handlers while the queue is idle."""
+        while True:
+            try:
+                return self.log_queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                if not block:
+                    raise
+                self.flush()
+
+    def enqueue_sentinel(self) -> None:
+        """Enqueue the stop sentinel even if the queue is full."""
+        self.log_queue.put(self._sentinel)
+
+    def flush(self) -> None:
+        """Report dropped records and flush every handler."""
+        self._report_drops()
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        """Stop the listener thread and ship everything still buffered."""
+        if self._thread is not None:
+            super().stop()
+            self.flush()
+
+    def _report_drops(self) -> None:
+        dropped = getattr(self.log_queue, "dropped", 0)
+        if dropped > self._reported_drops:
+            record = logging.LogRecord(
+                "mcp_the_force.logging",
+                logging.WARNING,
+                __file__,
+                0,
+                "Log queue full: dropped %d oldest records (%d total)",
+                (dropped - self._reported_drops, dropped),
+                None,
+            )
+            self._reported_drops = dropped
+            self.handle(record)
 
 
 class TimeoutLokiHandler(LokiHandler):
     """
-    Custom LokiHandler that enforces a network timeout on all requests.
-    This prevents the logging thread from hanging indefinitely on stale connections.
+    LokiHandler that ships records in batches with a network timeout.
+
+    Records are buffered and sent as one gzip-compressed push request when
+    ``batch_size`` records are waiting or the oldest is ``max_batch_age``
+    seconds old; ``flush()`` sends the rest. A batch that fails to send is
+    discarded and counted in ``dropped`` rather than retried, so a stale
+    VictoriaLogs connection can neither hang the logging thread nor make
+    the buffer grow.
     """
 
-    def __init__(self, *args, timeout: float = 10.0, **kwargs):
+    def __init__(
+        self,
+        *args,
+        timeout: float = 10.0,
+        batch_size: int = 500,
+        max_batch_age: float = 2.0,
+        **kwargs,
+    ):
         """
-        Initialize handler with configurable timeout.
+        Initialize handler with configurable timeout and batching.
 
         Args:
             timeout: Request timeout in seconds (default: 10.0)
+            batch_size: Records per push request (default: 500)
+            max_batch_age: Seconds a record may wait in the buffer (default: 2.0)
             *args, **kwargs: Passed to parent LokiHandler
         """
         # Store the URL for later checking
         self.handler_url = args[0] if args else kwargs.get("url", "")
         super().__init__(*args, **kwargs)
         self.timeout = timeout
+        self.batch_size = max(batch_size, 1)
+        self.max_batch_age = max_batch_age
+        self.dropped = 0
 
-        # Override the emitter's session to use our timeout
-        if hasattr(self, "emitter") and hasattr(self.emitter, "_session"):
-            # Force session recreation with our timeout adapter
-            self.emitter._session = None
+        # Tags of each stream -> [timestamp_ns, line] values
+        self._streams: Dict[Tuple[Tuple[str, str], ...], List[List[str]]] = {}
+        self._buffered = 0
+        self._oldest: Optional[float] = None
 
     def emit(self, record):
-        """Emit a record with timeout protection."""
+        """Buffer a record and send the batch once it is full or old enough."""
+        try:
+            line = self.format(record)
+            tags = self.emitter.build_tags(record)
+            key = tuple(sorted((str(k), str(v)) for k, v in tags.items()))
+            self._streams.setdefault(key, []).append(
+                [str(int(record.created * 1e9)), line]
+            )
+            self._buffered += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+        except Exception:
+            self.handleError(record)
+            return
+
+        if (
+            self._buffered >= self.batch_size
+            or time.monotonic() - self._oldest >= self.max_batch_age
+        ):
+            self._send_batch()
+
+    def flush(self):
+        """Send all buffered records."""
+        with self.lock:
+            self._send_batch()
+
+    def close(self):
+        """Flush buffered records before closing."""
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    def _send_batch(self) -> None:
+        if not self._buffered:
+            return
+        streams, count = self._streams, self._buffered
+        self._streams, self._buffered, self._oldest = {}, 0, None
+
         # In E2E mode, check if we should skip localhost connections
         from ..config import get_settings
 
@@ -42,55 +203,41 @@ class TimeoutLokiHandler(LokiHandler):
                 # This happens when the server starts before env vars are fully propagated
                 return
 
-        try:
-            # Get the formatted log entry
-            if hasattr(self, "build_msg"):
-                self.build_msg(record)
-            else:
-                self.format(record)
-
-            # Get the emitter's session and set timeout
-            session = self.emitter.session
-
-            # Create adapter with timeout for all requests
-            if not hasattr(session, "_timeout_adapter_installed"):
-                adapter = requests.adapters.HTTPAdapter()
-                adapter.max_retries = 0  # No retries to fail fast
-                session.mount("http://", adapter)
-                session.mount("https://", adapter)
-                session._timeout_adapter_installed = True
-
-            # Make the actual call with timeout
-            # We need to monkey-patch the session.post temporarily
-            original_post = session.post
-
-            def post_with_timeout(*args, **kwargs):
-                kwargs["timeout"] = self.timeout
-                return original_post(*args, **kwargs)
-
-            session.post = post_with_timeout
-
-            # Call parent's emit which will use our patched session
-            super().emit(record)
+        payload = {
+            "streams": [
+                {"stream": dict(key), "values": values}
+                for key, values in streams.items()
+            ]
+        }
+        body = gzip.compress(json.dumps(payload).encode("utf-8"), compresslevel=5)
 
+        try:
+            resp = self._session().post(
+                self.emitter.url,
+                data=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": "gzip",
+                },
+                timeout=self.timeout,
+            )
+            if resp.status_code != self.emitter.success_response_code:
+                raise requests.exceptions.RequestException(
+                    f"Unexpected Loki API response status code: {resp.status_code}"
+                )
         except requests.exceptions.Timeout:
+            self.dropped += count
             # Log timeout to stderr so we can see it
-            import sys
-
             print(
-                f"LokiHandler timeout after {self.timeout}s - connection may be stale",
+                f"LokiHandler timeout after {self.timeout}s - connection may be stale; "
+                f"dropped {count} records",
                 file=sys.stderr,
             )
             # Close the session to force reconnection
-            if hasattr(self.emitter, "close"):
-                self.emitter.close()
+            self.emitter.close()
         except requests.exceptions.RequestException as e:
+            self.dropped += count
             # Suppress localhost connection errors in E2E tests
-            import sys
-            from ..config import get_settings
-
-            settings = get_settings()
-
             error_str = str(e)
             is_localhost_error = "localhost" in error_str and "9428" in error_str
             is_e2e_test = settings.dev.ci_e2e
@@ -104,30 +251,33 @@ class TimeoutLokiHandler(LokiHandler):
                 # - Not a localhost error, OR
                 # - Not in E2E test mode, OR
                 # - No proper VictoriaLogs URL configured
-                print(f"LokiHandler network error: {e}", file=sys.stderr)
+                print(
+                    f"LokiHandler network error: {e}; dropped {count} records",
+                    file=sys.stderr,
+                )
 
             # Close the session to force reconnection
-            if hasattr(self.emitter, "close"):
-                self.emitter.close()
+            self.emitter.close()
         except Exception as e:
-            # Suppress localhost connection errors in E2E tests
-            import os
+            self.dropped += count
+            # Don't let other logging errors crash the application
+            print(f"LokiHandler error: {e}; dropped {count} records", file=sys.stderr)
+            self.emitter.close()
 
-            error_str = str(e)
-            is_localhost_error = "localhost" in error_str and "9428" in error_str
-            is_e2e_test = os.getenv("CI_E2E") == "1"
-
-            if is_localhost_error and is_e2e_test:
-                # Silently ignore localhost errors in E2E tests
-                pass
-            else:
-                # Don't let other logging errors crash the application
-                self.handleError(record)
+    def _session(self) -> requests.Session:
+        """Return the emitter's session, configured to fail fast."""
+        session = self.emitter.session
+        if not getattr(session, "_timeout_adapter_installed", False):
+            no_retries = Retry(total=0, read=False)  # No retries to fail fast
+            adapter = requests.adapters.HTTPAdapter(max_retries=no_retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session._timeout_adapter_installed = True
+        return cast(requests.Session, session)
 
     def handleError(self, record):
         """Override to suppress localhost connection errors in E2E tests."""
         import os
-        import sys
         import traceback
 
         # Get the current exception info
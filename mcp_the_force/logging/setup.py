@@ -4,12 +4,11 @@ import logging
 import os
 import sys
 import uuid
-import queue
 import logging.handlers
 import atexit
 from pathlib import Path
 from ..config import get_settings
-from .handlers import TimeoutLokiHandler
+from .handlers import BatchingQueueListener, DropOldestQueue, TimeoutLokiHandler
 
 # Global instance ID - set once during logging setup
 _INSTANCE_ID: str | None = None
@@ -65,8 +64,9 @@ def setup_logging():
 
     # Set up non-blocking VictoriaLogs handler using queue with timeout protection
     try:
-        # Create a queue for non-blocking logging
-        log_queue = queue.Queue(-1)  # -1 means unlimited size
+        # Create a bounded queue for non-blocking logging; when the shipping
+        # thread falls behind, the oldest records are dropped
+        log_queue = DropOldestQueue(settings.logging.victoria_logs_queue_size)
 
         # Create our custom handler with timeout
         victoria_logs_url = settings.logging.victoria_logs_url
@@ -87,6 +87,8 @@ def setup_logging():
             },
             version="1",
             timeout=10.0,  # 10 second timeout to prevent stale connection hangs
+            batch_size=settings.logging.victoria_logs_batch_size,
+            max_batch_age=settings.logging.victoria_logs_flush_interval,
         )
         loki_handler.setLevel(settings.logging.level)
 
@@ -94,20 +96,24 @@ def setup_logging():
         queue_handler = logging.handlers.QueueHandler(log_queue)
 
         # Create and start the queue listener
-        queue_listener = logging.handlers.QueueListener(
-            log_queue, loki_handler, respect_handler_level=True
+        queue_listener = BatchingQueueListener(
+            log_queue,
+            loki_handler,
+            flush_interval=settings.logging.victoria_logs_flush_interval,
+            respect_handler_level=True,
         )
         queue_listener.start()
 
         # Store listener for cleanup
         app_logger._queue_listener = queue_listener
 
-        # Register cleanup on exit
+        # Register cleanup on exit; stopping flushes buffered records
         atexit.register(queue_listener.stop)
 
         app_logger.addHandler(queue_handler)
         app_logger.info(
-            f"Non-blocking VictoriaLogs handler configured for instance {instance_id} with 10s timeout"
+            f"Non-blocking VictoriaLogs handler configured for instance {instance_id} with 10s timeout, "
+            f"batches of {settings.logging.victoria_logs_batch_size}"
         )
     except Exception as e:
         # Don't block server startup if VictoriaLogs is unavailable
@@ -133,7 +139,7 @@ def setup_logging():
 
 
 def shutdown_logging():
-    """Stop the queue listener if it exists."""
+    """Stop the queue listener if it exists, flushing buffered records."""
     app_logger = logging.getLogger("mcp_the_force")
     if hasattr(app_logger, "_queue_listener"):
         app_logger._queue_listener.stop()
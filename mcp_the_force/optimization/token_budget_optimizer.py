@@ -1,36 +1,21 @@
 """Token budget optimization with proper architectural separation."""
 
+import time
 import logging
-import json
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from ..utils.token_counter import count_tokens
+from ..utils.token_cache import count_file_tokens, token_cache_stats
 from ..utils.token_utils import file_wrapper_tokens
 from .models import Plan, FileInfo
 from .prompt_builder import PromptBuilder
 from ..utils.stable_list_cache import StableListCache
+from ..utils.thread_pool import run_in_thread_pool
 
 logger = logging.getLogger(__name__)
 
-
-def _extract_message_text(msg_content) -> str:
-    """Extract text from message content, handling both string and list formats.
-
-    OpenAI format: content is a string
-    LiteLLM format: content is a list like [{"type": "text", "text": "..."}]
-    """
-    if isinstance(msg_content, str):
-        return msg_content
-    elif isinstance(msg_content, list):
-        # Extract text from LiteLLM format
-        text_parts = []
-        for item in msg_content:
-            if isinstance(item, dict) and item.get("type") == "text":
-                text_parts.append(item.get("text", ""))
-        return "".join(text_parts)
-    else:
-        # Fallback for unknown formats
-        return str(msg_content) if msg_content else ""
+# Tokens held back from the model limit for the response and tool overhead
+FIXED_TOKEN_RESERVE = 30_000
 
 
 class TokenBudgetOptimizer:
@@ -53,19 +38,26 @@ class TokenBudgetOptimizer:
         output_format: str = "",
         project_name: str = "",
         tool_name: str = "",
+        persist_decisions: bool = True,
     ):
         self.model_limit = model_limit
         self.fixed_reserve = fixed_reserve
         self.session_id = session_id
         self.context_paths = context_paths
         self.priority_paths = priority_paths or []
+        self._priority_set = set(self.priority_paths)
         self.developer_prompt = developer_prompt
         self.instructions = instructions
         self.output_format = output_format
         self.project_name = project_name
         self.tool_name = tool_name
+        # When False (dry runs), the inline decision is not saved for the session
+        self.persist_decisions = persist_decisions
 
         self.prompt_builder = PromptBuilder()
+        # Wall time in seconds per optimization stage of the last optimize() call
+        self.stage_timings: Dict[str, float] = {}
+        self._stage_start = 0.0
 
     async def optimize(self) -> Plan:
         """
@@ -76,16 +68,23 @@ class TokenBudgetOptimizer:
             Plan with optimized file distribution and final prompt
         """
         logger.info(f"[OPTIMIZER] Starting optimization for session {self.session_id}")
+        self.stage_timings = {}
+        self._stage_start = time.perf_counter()
 
         # Load session history and calculate its token cost
         session_history_tokens = 0
+        session_history_text_tokens = 0
         session_messages = []
 
         if self.project_name and self.tool_name:
             try:
                 from ..unified_session_cache import unified_session_cache
 
-                history = await unified_session_cache.get_history(
+                (
+                    history,
+                    history_tokens,
+                    history_text_tokens,
+                ) = await unified_session_cache.get_history_with_tokens(
                     self.project_name, self.tool_name, self.session_id
                 )
 
@@ -99,34 +98,38 @@ class TokenBudgetOptimizer:
 
                     cache_instance = _get_instance()
                     rows = await cache_instance._execute_async(
-                        "SELECT project, tool, history FROM unified_sessions WHERE session_id = ? AND tool = ? LIMIT 1",
+                        "SELECT project FROM unified_sessions WHERE session_id = ? AND tool = ? LIMIT 1",
                         (self.session_id, self.tool_name),
                     )
                     if rows:
-                        actual_project, actual_tool, history_json = rows[0]
+                        actual_project = rows[0][0]
                         logger.debug(
                             f"[OPTIMIZER] Found temp session under project={actual_project}"
                         )
-                        if history_json:
-                            import orjson
-
-                            history = orjson.loads(history_json)
-                        else:
-                            history = []
+                        (
+                            history,
+                            history_tokens,
+                            history_text_tokens,
+                        ) = await cache_instance.get_messages_with_tokens(
+                            actual_project, self.tool_name, self.session_id
+                        )
 
                 if history:
                     session_messages = history
-                    # Count exact tokens in session history using tiktoken
-                    history_text = " ".join([json.dumps(msg) for msg in history])
-                    session_history_tokens = count_tokens([history_text])
+                    # Per-message counts are cached when messages are stored
+                    session_history_tokens = sum(history_tokens)
+                    session_history_text_tokens = sum(history_text_tokens)
                     logger.info(
                         f"[OPTIMIZER] Session history: {len(history)} messages, {session_history_tokens:,} tokens"
                     )
             except Exception as e:
                 logger.warning(f"[OPTIMIZER] Failed to load session history: {e}")
                 session_history_tokens = 0
+                session_history_text_tokens = 0
                 session_messages = []
 
+        self._end_stage("session_history")
+
         # Initialize history tracker (no decision making)
         cache = StableListCache()
 
@@ -149,6 +152,7 @@ class TokenBudgetOptimizer:
             all_paths_to_gather, skip_safety_check=True
         )
         logger.info(f"[OPTIMIZER] Found {len(all_file_paths)} total files")
+        self._end_stage("gather_files")
 
         # STEP 2: Get history information (no decisions)
         previous_inline = await cache.get_previous_inline_list(self.session_id)
@@ -164,6 +168,9 @@ class TokenBudgetOptimizer:
         logger.info(
             f"[OPTIMIZER] Changed files: {len(changed_files)}, Unchanged: {len(unchanged_files)}"
         )
+        all_file_set = set(all_file_paths)
+        changed_set = set(changed_files)
+        self._end_stage("change_detection")
 
         # STEP 3: Make inline/overflow decisions (optimizer's job)
 
@@ -186,8 +193,9 @@ class TokenBudgetOptimizer:
 
         # Convert to list and filter to files that actually exist
         candidate_inline_list = [
-            path for path in candidate_inline if path in all_file_paths
+            path for path in candidate_inline if path in all_file_set
         ]
+        candidate_set = set(candidate_inline_list)
 
         logger.info(f"[OPTIMIZER] Candidate inline files: {len(candidate_inline_list)}")
 
@@ -199,6 +207,7 @@ class TokenBudgetOptimizer:
 
         # Load all candidate files for decision-making
         inline_file_data = await load_specific_files_async(candidate_inline_list)
+        self._end_stage("load_candidates")
 
         # CRITICAL FIX: Only count tokens for files we'll SEND (delta), not all candidates
         files_to_send_this_turn = []
@@ -210,7 +219,7 @@ class TokenBudgetOptimizer:
             files_to_send_this_turn = [
                 file_data
                 for file_data in inline_file_data
-                if file_data[0] in changed_files  # Changed files must be re-sent
+                if file_data[0] in changed_set  # Changed files must be re-sent
                 # Note: newly promoted files will be handled later in optimization
             ]
 
@@ -232,7 +241,7 @@ class TokenBudgetOptimizer:
         if is_first_call:
             # Only include file tree on first session message
             overflow_paths = [
-                path for path in all_file_paths if path not in candidate_inline_list
+                path for path in all_file_paths if path not in candidate_set
             ]
             file_tree = build_file_tree_from_paths(all_file_paths, overflow_paths)
             file_tree_tokens = count_tokens([file_tree])
@@ -240,6 +249,7 @@ class TokenBudgetOptimizer:
         else:
             # Subsequent calls: no tree, AI already has context
             logger.info("[OPTIMIZER] Skipping file tree - not first call")
+        self._end_stage("file_tree")
 
         # Calculate total prompt tokens needed (NO double-counting!)
         base_prompt_tokens = count_tokens(
@@ -265,9 +275,7 @@ class TokenBudgetOptimizer:
 
         # Start with all candidates as potential inline
         potential_inline = inline_file_data[:]
-        overflow_files = [
-            path for path in all_file_paths if path not in candidate_inline_list
-        ]
+        overflow_files = [path for path in all_file_paths if path not in candidate_set]
 
         # Check if we need to make adjustments
         if is_first_call:
@@ -322,36 +330,29 @@ class TokenBudgetOptimizer:
                 f"[OPTIMIZER] Under budget - {remaining_budget:,} tokens available for promotion"
             )
 
-            # Load potential promotion candidates (smallest first for efficiency)
             promotable_paths = [
-                path for path in overflow_files if path not in self.priority_paths
+                path for path in overflow_files if path not in self._priority_set
             ]
-            if promotable_paths:
-                # Sample some files to check (don't load all for performance)
-                sample_size = min(50, len(promotable_paths))
-                sample_paths = promotable_paths[:sample_size]
-                sample_data = await load_specific_files_async(sample_paths)
-
-                # Sort by token count (smallest first - more files fit)
-                sample_data.sort(key=lambda x: x[2])
-
-                promoted_tokens = 0
-                for file_data in sample_data:
-                    if promoted_tokens + file_data[2] <= remaining_budget:
-                        final_inline_files.append(file_data)
-                        promoted_tokens += file_data[2]
-                        overflow_files.remove(file_data[0])
-                    else:
-                        break
-
-                if promoted_tokens > 0:
-                    logger.info(
-                        f"[OPTIMIZER] Promoted {promoted_tokens:,} tokens worth of files"
-                    )
+            promoted = await self._promote_files_to_fill_budget(
+                promotable_paths, remaining_budget
+            )
+            if promoted:
+                final_inline_files.extend(promoted)
+                promoted_paths = {path for path, _, _ in promoted}
+                overflow_files = [
+                    path for path in overflow_files if path not in promoted_paths
+                ]
+                logger.info(
+                    f"[OPTIMIZER] Promoted {len(promoted)} files "
+                    f"({sum(tokens for _, _, tokens in promoted):,} tokens)"
+                )
+
+        self._end_stage("budget_and_promotion")
 
         # STEP 6: Save the new inline decision to cache
         final_inline_paths = [file_data[0] for file_data in final_inline_files]
-        await cache.save_stable_list(self.session_id, final_inline_paths)
+        if self.persist_decisions:
+            await cache.save_stable_list(self.session_id, final_inline_paths)
 
         # Determine which files we're sending
         files_to_send = []
@@ -363,7 +364,7 @@ class TokenBudgetOptimizer:
             files_to_send = [
                 file_data
                 for file_data in final_inline_files
-                if file_data[0] in changed_files
+                if file_data[0] in changed_set
             ]
 
         # Prepare sent file info for deferred cache update (after successful API call)
@@ -382,6 +383,8 @@ class TokenBudgetOptimizer:
         # NOTE: We do NOT update the cache here anymore!
         # The cache will be updated in executor.py after successful API call
 
+        self._end_stage("record_decisions")
+
         # STEP 7: Build the optimized prompt
         prompt = self.prompt_builder.build_prompt(
             instructions=self.instructions,
@@ -391,20 +394,11 @@ class TokenBudgetOptimizer:
             overflow_files=overflow_files,
         )
 
-        # Calculate tokens for complete message list (dev + session history + user)
-        # Build the complete message list to get accurate token count
-        temp_complete_messages = []
-        if self.developer_prompt:
-            temp_complete_messages.append(
-                {"role": "developer", "content": self.developer_prompt}
-            )
-        temp_complete_messages.extend(session_messages)
-        if prompt:
-            temp_complete_messages.append({"role": "user", "content": prompt})
-
-        # Count tokens for all messages that will be sent to API
-        final_tokens = count_tokens(
-            [_extract_message_text(msg["content"]) for msg in temp_complete_messages]
+        # Tokens for the complete message list (dev + session history + user),
+        # counting message text only; the history's text was counted when it
+        # was stored, so only the new messages are tokenized
+        final_tokens = (
+            self._count_new_message_tokens(prompt) + session_history_text_tokens
         )
 
         # CRITICAL: Check if final result exceeds available budget and demote if needed
@@ -420,35 +414,37 @@ class TokenBudgetOptimizer:
             # Demote files until we fit (no arbitrary retry limit)
             retry_count = 0
 
-            while final_tokens > available_budget and files_to_send:
-                retry_count += 1
-
-                # Remove largest files first, but skip priority files
-                files_to_send.sort(
-                    key=lambda x: x[2], reverse=True
-                )  # Sort by tokens desc
-
-                # Find the first non-priority file to demote
-                demoted_file = None
-                for i, file_data in enumerate(files_to_send):
-                    if file_data[0] not in self.priority_paths:
-                        demoted_file = files_to_send.pop(i)
-                        break
-
-                if demoted_file is None:
-                    # All remaining files are priority files - cannot demote further
-                    # This is a failure condition if we're still over budget
-                    break
+            # Largest files are demoted first; priority files never are
+            demotion_order = sorted(
+                (fd for fd in files_to_send if fd[0] not in self._priority_set),
+                key=lambda x: x[2],
+            )
+            overflow_set = set(overflow_files)
 
-                overflow_files.append(demoted_file[0])  # Add to overflow
+            while final_tokens > available_budget and demotion_order:
+                retry_count += 1
 
-                # Deduplicate overflow_files to prevent any duplicate issues
-                overflow_files = list(dict.fromkeys(overflow_files))
+                # Demote enough files to cover the excess in one round, so the
+                # prompt is rebuilt once per round rather than once per file
+                excess_tokens = final_tokens - available_budget
+                demoted_paths = set()
+                saved_tokens = 0
+                while demotion_order and saved_tokens < excess_tokens:
+                    demoted_file = demotion_order.pop()
+                    demoted_paths.add(demoted_file[0])
+                    saved_tokens += demoted_file[2] + file_wrapper_tokens(
+                        demoted_file[0]
+                    )
+                    if demoted_file[0] not in overflow_set:
+                        overflow_set.add(demoted_file[0])
+                        overflow_files.append(demoted_file[0])
 
-                # Log with total tokens saved (content + wrapper)
-                total_saved = demoted_file[2] + file_wrapper_tokens(demoted_file[0])
+                files_to_send = [
+                    fd for fd in files_to_send if fd[0] not in demoted_paths
+                ]
                 logger.info(
-                    f"[OPTIMIZER] Demoted {demoted_file[0]} (saved {total_saved} tokens) - retry {retry_count}"
+                    f"[OPTIMIZER] Demoted {len(demoted_paths)} files "
+                    f"(saved ~{saved_tokens} tokens) - retry {retry_count}"
                 )
 
                 # Rebuild prompt and recalculate
@@ -462,21 +458,8 @@ class TokenBudgetOptimizer:
                     overflow_files=overflow_files,
                 )
 
-                # Calculate tokens for complete message list (dev + session history + user)
-                temp_complete_messages = []
-                if self.developer_prompt:
-                    temp_complete_messages.append(
-                        {"role": "developer", "content": self.developer_prompt}
-                    )
-                temp_complete_messages.extend(session_messages)
-                if prompt:
-                    temp_complete_messages.append({"role": "user", "content": prompt})
-
-                final_tokens = count_tokens(
-                    [
-                        _extract_message_text(msg["content"])
-                        for msg in temp_complete_messages
-                    ]
+                final_tokens = (
+                    self._count_new_message_tokens(prompt) + session_history_text_tokens
                 )
 
                 logger.info(f"[OPTIMIZER] After demotion: {final_tokens:,} tokens")
@@ -489,6 +472,9 @@ class TokenBudgetOptimizer:
                 logger.error(f"[OPTIMIZER] {error_msg}")
                 raise RuntimeError(error_msg)
 
+        self._end_stage("prompt_build")
+
+        logger.debug(f"[TOKEN_CACHE] optimizer: {token_cache_stats()}")
         logger.info(
             f"[PREDICTED_USAGE] Session {self.session_id}: {final_tokens:,} tokens predicted"
         )
@@ -566,6 +552,12 @@ class TokenBudgetOptimizer:
                 }
             )
 
+        self._end_stage("assemble_plan")
+        logger.debug(
+            "[OPTIMIZER] Stage timings: "
+            + ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in self.stage_timings.items())
+        )
+
         # Return the optimization plan
         return Plan(
             inline_files=inline_file_infos,
@@ -581,6 +573,60 @@ class TokenBudgetOptimizer:
             sent_files_info=files_to_update,  # Deferred cache update info
         )
 
+    def _end_stage(self, stage: str) -> None:
+        """Attribute the time since the previous stage boundary to ``stage``."""
+        now = time.perf_counter()
+        self.stage_timings[stage] = now - self._stage_start
+        self._stage_start = now
+
+    def _count_new_message_tokens(self, prompt: str) -> int:
+        """Count the developer and user messages added on top of the history."""
+        texts = [text for text in (self.developer_prompt, prompt) if text]
+        return count_tokens(texts) if texts else 0
+
+    async def _promote_files_to_fill_budget(
+        self, candidate_paths: List[str], budget: int
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Select overflow files to promote inline within a token budget.
+
+        Every candidate is sized from the token cache (a stat per unchanged
+        file), then files are taken greedily from smallest total cost up,
+        which maximizes the number of files that fit. Only the selected files
+        are loaded.
+
+        Args:
+            candidate_paths: Overflow paths eligible for promotion
+            budget: Tokens available for promoted files
+
+        Returns:
+            (path, content, tokens) tuples of the promoted files
+        """
+        if not candidate_paths or budget <= 0:
+            return []
+
+        token_counts = await run_in_thread_pool(count_file_tokens, candidate_paths)
+        sized = sorted(
+            (tokens + file_wrapper_tokens(path), path)
+            for path, tokens in token_counts.items()
+        )
+
+        selected = []
+        used = 0
+        for cost, path in sized:
+            if used + cost > budget:
+                # Costs are ascending, so nothing after this fits either
+                break
+            selected.append(path)
+            used += cost
+
+        if not selected:
+            return []
+
+        from ..utils.context_loader import load_specific_files_async
+
+        return await load_specific_files_async(selected)
+
     def _demote_files_to_fit_budget(
         self, file_data_list: List[Tuple[str, str, int]], budget: int
     ) -> Tuple[List[Tuple[str, str, int]], List[str]]:
@@ -609,7 +655,7 @@ class TokenBudgetOptimizer:
 
         for file_data in file_data_list:
             file_path = file_data[0]
-            if file_path in self.priority_paths:
+            if file_path in self._priority_set:
                 priority_files.append(file_data)
             else:
                 demotable_files.append(file_data)
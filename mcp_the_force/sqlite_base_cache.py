@@ -1,19 +1,50 @@
 """Base class for SQLite-backed caches with common functionality."""
 
+import asyncio
+import queue
 import sqlite3
 import time
 import random
 import threading
 import logging
-from typing import Optional, Any, List
+from concurrent.futures import Future
+from typing import Optional, Any, List, Callable, Generic, Tuple, TypeVar
 from pathlib import Path
 from .utils.thread_pool import run_in_thread_pool
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# A queued write: the function to run on the writer connection and its result
+_WriteRequest = Tuple[Callable[[sqlite3.Connection], Any], Future]
+
+# Statements that never write and can run on a pooled read connection
+_READ_ONLY_PREFIXES = ("SELECT", "EXPLAIN")
+
+
+def _is_read_only(query: str) -> bool:
+    """Return True if query is a plain read that a query_only connection can run."""
+    words = query.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in _READ_ONLY_PREFIXES
+
 
 class BaseSQLiteCache:
-    """Base class for SQLite caches with async-safe database operations."""
+    """Base class for SQLite caches with async-safe database operations.
+
+    Reads run on a small pool of query-only connections so they proceed in
+    parallel under WAL. Writes submitted through ``_execute_async`` and
+    ``_transaction_async`` are queued to one writer thread, which commits
+    whatever has accumulated as a single transaction with a savepoint per
+    request. ``_read`` and ``_transaction`` are the blocking forms for caches
+    used from worker threads. ``self._conn`` is that writer connection;
+    subclasses that use it directly must hold ``self._lock``.
+    """
+
+    # Upper bound on pooled read connections per cache
+    max_readers = 4
+    # Upper bound on queued writes committed in one transaction
+    max_write_batch = 64
 
     def __init__(
         self,
@@ -22,6 +53,7 @@ class BaseSQLiteCache:
         table_name: str,
         create_table_sql: str,
         purge_probability: float = 0.01,
+        timestamp_column: str = "updated_at",
     ):
         """Initialize the cache with common SQLite setup.
 
@@ -31,13 +63,28 @@ class BaseSQLiteCache:
             table_name: Name of the table for this cache
             create_table_sql: SQL statement to create the table
             purge_probability: Probability of running cleanup on write operations
+            timestamp_column: Column holding each row's last update time,
+                used for the index and TTL cleanup
         """
         self.db_path = db_path
         self.ttl = ttl
         self.table_name = table_name
         self.purge_probability = purge_probability
+        self.timestamp_column = timestamp_column
         self._lock = threading.RLock()
 
+        # Read pool; an in-memory database is private to one connection
+        self._pooled_reads = db_path != ":memory:"
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._readers_closed = False
+
+        # Writer thread, started on the first queued write
+        self._write_queue: "queue.Queue[Optional[_WriteRequest]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
         self._conn: Optional[sqlite3.Connection] = None
         try:
             # Ensure parent directory exists
@@ -70,7 +117,7 @@ class BaseSQLiteCache:
             # Create the index
             self._conn.execute(
                 f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_updated "
-                f"ON {self.table_name}(updated_at)"
+                f"ON {self.table_name}({self.timestamp_column})"
             )
 
     async def _execute_async(
@@ -78,6 +125,9 @@ class BaseSQLiteCache:
     ) -> Optional[List[Any]]:
         """Execute a query asynchronously without blocking the event loop.
 
+        SELECT queries run on a pooled read connection; anything else is
+        queued to the writer thread.
+
         Args:
             query: SQL query to execute
             params: Query parameters
@@ -87,26 +137,195 @@ class BaseSQLiteCache:
             Query results if fetch=True, None otherwise
         """
 
-        def _sync_execute() -> Optional[List[Any]]:
-            if self._conn is None:
-                raise RuntimeError("Database connection is closed")
+        def _run(conn: sqlite3.Connection) -> Optional[List[Any]]:
+            cursor = conn.execute(query, params)
+            if fetch:
+                return cursor.fetchall()
+            return None
+
+        if fetch and _is_read_only(query):
+            return await self._read_async(_run)
+        return await self._transaction_async(_run)
+
+    async def _transaction_async(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run several statements atomically on the writer thread.
+
+        Args:
+            func: Callable receiving the connection; everything it executes
+                is committed together or rolled back on error. It may share
+                the commit with other queued writes but never their failures.
+
+        Returns:
+            Whatever func returns
+        """
+        return await asyncio.wrap_future(self._submit_write(func))
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Blocking form of ``_transaction_async`` for use off the event loop.
+
+        Must not be called from the writer thread or while holding
+        ``self._lock``.
+        """
+        return self._submit_write(func).result()
+
+    def _submit_write(self, func: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """Queue func for the writer thread and return its future."""
+        if self._conn is None:
+            raise RuntimeError("Database connection is closed")
+
+        future: "Future[T]" = Future()
+        self._ensure_writer()
+        self._write_queue.put((func, future))
+        return future
 
+    async def _read_async(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run read-only statements on a pooled connection.
+
+        Args:
+            func: Callable receiving a query_only connection; all of its
+                statements see the same snapshot of the database
+
+        Returns:
+            Whatever func returns
+        """
+        return await run_in_thread_pool(self._read, func)
+
+    def _read(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Blocking form of ``_read_async`` for use off the event loop."""
+        if self._conn is None:
+            raise RuntimeError("Database connection is closed")
+        if not self._pooled_reads:
             with self._lock, self._conn:
-                cursor = self._conn.execute(query, params)
-                if fetch:
-                    return cursor.fetchall()
-                return None
+                return func(self._conn)
+
+        conn = self._acquire_reader()
+        try:
+            conn.execute("BEGIN")
+            try:
+                return func(conn)
+            finally:
+                conn.execute("COMMIT")
+        finally:
+            self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take an idle read connection, opening one if the pool has room."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if self._readers_closed:
+                raise RuntimeError("Database connection is closed")
+            if len(self._all_readers) < self.max_readers:
+                conn = sqlite3.connect(
+                    self.db_path,
+                    detect_types=sqlite3.PARSE_DECLTYPES,
+                    check_same_thread=False,
+                    isolation_level=None,
+                )
+                conn.execute("PRAGMA busy_timeout=5000")
+                conn.execute("PRAGMA query_only=ON")
+                self._all_readers.append(conn)
+                return conn
+
+        # Wait for a connection to be returned, unless close() takes them all
+        while True:
+            try:
+                return self._readers.get(timeout=1.0)
+            except queue.Empty:
+                if self._readers_closed:
+                    raise RuntimeError("Database connection is closed")
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread if it is not running."""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"sqlite-writer-{self.table_name}",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """Commit queued writes in batches until a None sentinel arrives."""
+        while True:
+            request = self._write_queue.get()
+            if request is None:
+                return
+            batch = [request]
+            stop = False
+            while len(batch) < self.max_write_batch:
+                try:
+                    request = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[_WriteRequest]) -> None:
+        """Run queued writes in one transaction and resolve their futures."""
+        with self._lock:
+            conn = self._conn
+            if conn is None:
+                for _, future in batch:
+                    future.set_exception(RuntimeError("Database connection is closed"))
+                return
+
+            if len(batch) == 1:
+                func, future = batch[0]
+                try:
+                    with conn:
+                        result = func(conn)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                return
+
+            outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for func, future in batch:
+                        conn.execute("SAVEPOINT queued_write")
+                        try:
+                            result = func(conn)
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO queued_write")
+                            conn.execute("RELEASE queued_write")
+                            outcomes.append((future, None, e))
+                        else:
+                            conn.execute("RELEASE queued_write")
+                            outcomes.append((future, result, None))
+            except BaseException as e:
+                # The shared transaction failed, so none of the writes landed
+                for _, future in batch:
+                    future.set_exception(e)
+                return
 
-        # Run in shared thread pool to avoid blocking event loop
-        result = await run_in_thread_pool(_sync_execute)
-        return result
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
 
     async def _probabilistic_cleanup(self):
         """Run cleanup with configured probability."""
         if random.random() < self.purge_probability:
             cutoff = int(time.time()) - self.ttl
             await self._execute_async(
-                f"DELETE FROM {self.table_name} WHERE updated_at < ?",
+                f"DELETE FROM {self.table_name} WHERE {self.timestamp_column} < ?",
                 (cutoff,),
                 fetch=False,
             )
@@ -119,6 +338,20 @@ class BaseSQLiteCache:
 
     def close(self) -> None:
         """Close the database connection safely."""
+        # Let queued writes finish before the writer connection goes away
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._write_queue.put(None)
+            writer.join()
+
+        # Read connections in use are closed once they are returned
+        with self._readers_lock:
+            readers, self._all_readers = self._all_readers, []
+            self._readers_closed = True
+        for _ in readers:
+            self._readers.get().close()
+
         # Acquire the lock to ensure no other threads are using the connection.
         with self._lock:
             try:
@@ -130,3 +363,52 @@ class BaseSQLiteCache:
             except sqlite3.Error as e:
                 # Log the specific error instead of silently passing.
                 logger.error(f"Error closing SQLite connection for {self.db_path}: {e}")
+
+
+C = TypeVar("C", bound=BaseSQLiteCache)
+
+
+class SharedCache(Generic[C]):
+    """Lazily opened process-wide instance of an optional cache.
+
+    For caches that only speed things up: if the cache cannot be opened the
+    error is logged once and ``get`` returns None, so callers fall back to
+    doing the work directly. The instance is reopened when the configured
+    db_path changes.
+    """
+
+    def __init__(self, factory: Callable[..., C], name: str):
+        """Set up the cache holder without opening anything.
+
+        Args:
+            factory: Called as ``factory(db_path=...)`` to open the cache
+            name: Used in the log message when opening fails
+        """
+        self._factory = factory
+        self._name = name
+        self._instance: Optional[C] = None
+        self._failed_path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, db_path: str) -> Optional[C]:
+        """Return the cache for db_path, or None if it cannot be opened."""
+        with self._lock:
+            if self._instance is not None and self._instance.db_path != db_path:
+                self._instance.close()
+                self._instance = None
+            if self._instance is None and self._failed_path != db_path:
+                try:
+                    self._instance = self._factory(db_path=db_path)
+                    self._failed_path = None
+                except Exception as e:
+                    logger.warning(f"{self._name} disabled: {e}")
+                    self._failed_path = db_path
+            return self._instance
+
+    def close(self) -> None:
+        """Close the open instance; the next ``get`` opens a new one."""
+        with self._lock:
+            if self._instance is not None:
+                self._instance.close()
+                self._instance = None
+            self._failed_path = None
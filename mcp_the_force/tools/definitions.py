@@ -9,6 +9,7 @@ from __future__ import annotations
 # Import tools to ensure registration
 from . import search_history  # noqa: F401
 from . import count_project_tokens  # noqa: F401
+from . import plan_context  # noqa: F401
 from . import list_sessions  # noqa: F401
 from . import describe_session  # noqa: F401
 from . import group_think  # noqa: F401
@@ -241,9 +241,11 @@ class ToolExecutor:
             # Helper function to run optimization with given model limit
             async def run_optimization(limit: int):
                 """Run token budget optimization with the given context limit."""
-                from ..optimization.token_budget_optimizer import TokenBudgetOptimizer
+                from ..optimization.token_budget_optimizer import (
+                    FIXED_TOKEN_RESERVE,
+                    TokenBudgetOptimizer,
+                )
 
-                FIXED_TOKEN_RESERVE = 30_000
                 # session_id is guaranteed to be set when this function is called
                 assert isinstance(session_id, str), "session_id must be a string"
 
@@ -737,6 +739,11 @@ class ToolExecutor:
                     # OpenAI and Grok models use messages with developer role
                     # Pass a copy to prevent mutations from affecting history storage
                     generate_kwargs["messages"] = messages.copy()
+                if adapter_class_name == "openai" and "plan" in locals():
+                    # Lets the OpenAI flow log request size without re-tokenizing
+                    generate_kwargs["estimated_prompt_tokens"] = (
+                        plan.total_prompt_tokens
+                    )
 
                 # DEBUG: Log exact messages sent to API for token analysis
                 debug_data = {
@@ -0,0 +1,79 @@
+"""Plan context tool."""
+
+from typing import List, Optional
+from .base import ToolSpec
+from .registry import tool
+from .descriptors import Route
+from ..local_services.plan_context import PlanContextService
+
+
+@tool
+class PlanContext(ToolSpec):
+    """
+    Dry-run the context optimizer and report a timing and I/O breakdown.
+    """
+
+    model_name = "plan_context"
+    description = (
+        "Plan how context files would be split between the inline prompt and "
+        "the vector store for a chat tool, without calling any model. Returns "
+        "the plan plus per-stage wall time, files and bytes read, tokens "
+        "counted and token cache hit rates. Use it to tune context settings "
+        "and to measure planning latency."
+    )
+
+    # This is a local service, not an AI model
+    service_cls = PlanContextService
+    adapter_class = None
+    timeout = 300
+
+    context: List[str] = Route.adapter(  # type: ignore[assignment]
+        description=(
+            "(Required) File and/or directory paths to plan, exactly as they would be "
+            "passed to a chat tool's context parameter. "
+            "Syntax: An array of strings (not a JSON string). "
+            "Each string must be an absolute path. "
+            'Example: ["/path/to/project/src/", "/path/to/project/README.md"]'
+        )
+    )
+
+    priority_context: Optional[List[str]] = Route.adapter(  # type: ignore[assignment]
+        default_factory=list,
+        description=(
+            "(Optional) Paths that must be inline, as for a chat tool's priority_context. "
+            "Syntax: An array of strings. "
+            "Default: []. "
+            'Example: ["/path/to/project/docs/spec.md"]'
+        ),
+    )
+
+    model: Optional[str] = Route.adapter(  # type: ignore[assignment]
+        default=None,
+        description=(
+            "(Optional) Chat tool to plan for; its context window, developer prompt and "
+            "session history are used. Without it a 128k context window is assumed. "
+            "Syntax: A tool name string. "
+            "Default: None. "
+            "Example: model='chat_with_gpt52'"
+        ),
+    )
+
+    session_id: Optional[str] = Route.adapter(  # type: ignore[assignment]
+        default=None,
+        description=(
+            "(Optional) Existing session to plan a follow-up call for. The session is "
+            "only read; the plan is not recorded. "
+            "Syntax: A string. "
+            "Default: None (plan a first call). "
+            "Example: session_id='refactor-auth'"
+        ),
+    )
+
+    instructions: Optional[str] = Route.adapter(  # type: ignore[assignment]
+        default=None,
+        description=(
+            "(Optional) Instructions to include when sizing the prompt. "
+            "Syntax: A string. "
+            "Default: None."
+        ),
+    )
@@ -77,6 +77,7 @@ def _ensure_populated() -> None:
         sys.modules.pop("mcp_the_force.tools.definitions", None)
         sys.modules.pop("mcp_the_force.tools.search_history", None)
         sys.modules.pop("mcp_the_force.tools.count_project_tokens", None)
+        sys.modules.pop("mcp_the_force.tools.plan_context", None)
         sys.modules.pop("mcp_the_force.tools.list_sessions", None)
         sys.modules.pop("mcp_the_force.tools.describe_session", None)
 
@@ -1,5 +1,6 @@
 """SQLite-based deduplication for search results that persists across sessions."""
 
+import json
 import sqlite3
 import time
 from typing import Dict, Any, List, Tuple
@@ -7,11 +8,12 @@ from pathlib import Path
 import logging
 
 from ..dedup.hashing import compute_content_hash
+from ..sqlite_base_cache import BaseSQLiteCache
 
 logger = logging.getLogger(__name__)
 
 
-class SQLiteSearchDeduplicator:
+class SQLiteSearchDeduplicator(BaseSQLiteCache):
     """Manages deduplication for search results using SQLite for persistence."""
 
     def __init__(self, db_path: Path, ttl_hours: int = 24):
@@ -21,27 +23,23 @@ class SQLiteSearchDeduplicator:
             db_path: Path to SQLite database
             ttl_hours: Time-to-live for cache entries in hours (default: 24)
         """
-        self.db_path = db_path
         self.ttl_seconds = ttl_hours * 3600
-        self._init_database()
-
-    def _init_database(self):
-        """Initialize the deduplication tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS search_dedup_cache (
-                    session_id TEXT NOT NULL,
-                    content_hash TEXT NOT NULL,
-                    timestamp INTEGER NOT NULL,
-                    query TEXT,
-                    PRIMARY KEY (session_id, content_hash)
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_dedup_timestamp 
-                ON search_dedup_cache(timestamp)
-            """)
-            conn.commit()
+        create_table_sql = """CREATE TABLE IF NOT EXISTS search_dedup_cache (
+            session_id TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            query TEXT,
+            PRIMARY KEY (session_id, content_hash)
+        )"""
+
+        super().__init__(
+            db_path=str(db_path),
+            ttl=self.ttl_seconds,
+            table_name="search_dedup_cache",
+            create_table_sql=create_table_sql,
+            purge_probability=0.05,
+            timestamp_column="timestamp",
+        )
 
     @staticmethod
     def compute_content_hash_for_dedup(content: str, file_id: str = "") -> str:
@@ -55,23 +53,16 @@ class SQLiteSearchDeduplicator:
         # Use the centralized hashing function that normalizes line endings
         return compute_content_hash(combined)[:16]
 
-    def _cleanup_expired(self, conn: sqlite3.Connection):
-        """Remove expired cache entries."""
-        expiry_time = int(time.time()) - self.ttl_seconds
-        conn.execute(
-            "DELETE FROM search_dedup_cache WHERE timestamp < ?", (expiry_time,)
-        )
-
-    def clear_session_cache(self, session_id: str):
+    async def clear_session(self, session_id: str):
         """Clear the deduplication cache for a specific session."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "DELETE FROM search_dedup_cache WHERE session_id = ?", (session_id,)
-            )
-            conn.commit()
+        await self._execute_async(
+            "DELETE FROM search_dedup_cache WHERE session_id = ?",
+            (session_id,),
+            fetch=False,
+        )
         logger.info(f"[DEDUP] Cleared cache for session {session_id}")
 
-    def deduplicate_results(
+    async def deduplicate_results(
         self,
         all_results: List[Dict[str, Any]],
         max_results: int,
@@ -81,6 +72,10 @@ class SQLiteSearchDeduplicator:
         """
         Deduplicate search results based on content hash.
 
+        The session's existing hashes are looked up and the new ones inserted
+        in one transaction on the writer thread, so concurrent searches of the
+        same session cannot both return a result.
+
         Args:
             all_results: List of search results to deduplicate
             max_results: Maximum number of results to return
@@ -90,39 +85,43 @@ class SQLiteSearchDeduplicator:
         Returns:
             Tuple of (deduplicated_results, duplicate_count)
         """
-        deduplicated_results = []
-        duplicate_count = 0
         current_time = int(time.time())
+        cutoff = current_time - self.ttl_seconds
+
+        hashes = []
+        for search_result in all_results:
+            # Compute hash for this result
+            content = search_result.get("content", "")
+
+            # Try to extract file_id from the result
+            file_id = ""
+            if "file_id" in search_result:
+                file_id = search_result["file_id"]
+            elif "metadata" in search_result and "file_id" in search_result.get(
+                "metadata", {}
+            ):
+                file_id = search_result["metadata"]["file_id"]
+
+            hashes.append(self.compute_content_hash_for_dedup(content, file_id))
+
+        def _dedup(conn: sqlite3.Connection) -> Tuple[List[Dict[str, Any]], int]:
+            # Get the hashes this session has already seen
+            existing_hashes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT content_hash FROM search_dedup_cache "
+                    "WHERE session_id = ? AND timestamp >= ? "
+                    "AND content_hash IN (SELECT value FROM json_each(?))",
+                    (session_id, cutoff, json.dumps(list(set(hashes)))),
+                )
+            }
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Clean up expired entries first
-            self._cleanup_expired(conn)
-
-            # Get existing hashes for this session
-            cursor = conn.execute(
-                "SELECT content_hash FROM search_dedup_cache WHERE session_id = ?",
-                (session_id,),
-            )
-            existing_hashes = {row[0] for row in cursor.fetchall()}
-
+            deduplicated_results = []
+            duplicate_count = 0
             # Track new hashes to add
             new_hashes = []
 
-            for search_result in all_results:
-                # Compute hash for this result
-                content = search_result.get("content", "")
-
-                # Try to extract file_id from the result
-                file_id = ""
-                if "file_id" in search_result:
-                    file_id = search_result["file_id"]
-                elif "metadata" in search_result and "file_id" in search_result.get(
-                    "metadata", {}
-                ):
-                    file_id = search_result["metadata"]["file_id"]
-
-                content_hash = self.compute_content_hash_for_dedup(content, file_id)
-
+            for search_result, content_hash in zip(all_results, hashes):
                 # Check if we've seen this content before in this session
                 if content_hash not in existing_hashes:
                     existing_hashes.add(content_hash)
@@ -136,13 +135,15 @@ class SQLiteSearchDeduplicator:
                     duplicate_count += 1
 
             # Insert new hashes into database
-            if new_hashes:
-                conn.executemany(
-                    "INSERT OR REPLACE INTO search_dedup_cache "
-                    "(session_id, content_hash, timestamp, query) VALUES (?, ?, ?, ?)",
-                    new_hashes,
-                )
-                conn.commit()
+            conn.executemany(
+                "INSERT OR REPLACE INTO search_dedup_cache "
+                "(session_id, content_hash, timestamp, query) VALUES (?, ?, ?, ?)",
+                new_hashes,
+            )
+            return deduplicated_results, duplicate_count
+
+        deduplicated_results, duplicate_count = await self._transaction_async(_dedup)
+        await self._probabilistic_cleanup()
 
         logger.debug(
             f"[DEDUP] Session {session_id}: {len(deduplicated_results)} unique, "
@@ -151,23 +152,22 @@ class SQLiteSearchDeduplicator:
 
         return deduplicated_results, duplicate_count
 
-    def get_session_stats(self, session_id: str) -> Dict[str, Any]:
+    async def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """Get statistics for a session's deduplication cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT COUNT(*), MIN(timestamp), MAX(timestamp)
-                FROM search_dedup_cache 
-                WHERE session_id = ?
-                """,
-                (session_id,),
-            )
-            count, min_ts, max_ts = cursor.fetchone()
-
-            return {
-                "session_id": session_id,
-                "unique_results_cached": count or 0,
-                "oldest_entry": min_ts,
-                "newest_entry": max_ts,
-                "cache_age_seconds": (max_ts - min_ts) if min_ts and max_ts else 0,
-            }
+        rows = await self._execute_async(
+            """
+            SELECT COUNT(*), MIN(timestamp), MAX(timestamp)
+            FROM search_dedup_cache
+            WHERE session_id = ?
+            """,
+            (session_id,),
+        )
+        count, min_ts, max_ts = rows[0] if rows else (0, None, None)
+
+        return {
+            "session_id": session_id,
+            "unique_results_cached": count or 0,
+            "oldest_entry": min_ts,
+            "newest_entry": max_ts,
+            "cache_age_seconds": (max_ts - min_ts) if min_ts and max_ts else 0,
+        }
@@ -3,11 +3,16 @@ Token counting tool for project files.
 """
 
 import os
+import logging
 from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Any, Optional, DefaultDict, cast
 
-from ..utils.context_loader import load_text_files
+from ..utils.fs import gather_file_paths
+from ..utils.thread_pool import run_in_thread_pool
+from ..utils.token_cache import count_file_tokens, token_cache_stats
+
+logger = logging.getLogger(__name__)
 
 
 class CountProjectTokens:
@@ -35,11 +40,13 @@ class CountProjectTokens:
         if not self.items:
             raise ValueError("At least one file or directory path must be provided")
 
-        # Load files and get their content + token counts
-        # Call sync function directly - it's fast enough for reasonable file counts
-        file_data = load_text_files(self.items)
+        # Only token counts are needed: files whose stat key is cached are not
+        # read at all, and the misses are stored in one batch
+        paths = await run_in_thread_pool(gather_file_paths, self.items)
+        counts = await run_in_thread_pool(count_file_tokens, paths)
+        logger.debug(f"[TOKEN_CACHE] count_project_tokens: {token_cache_stats()}")
 
-        if not file_data:
+        if not counts:
             return {
                 "total_tokens": 0,
                 "total_files": 0,
@@ -56,13 +63,13 @@ class CountProjectTokens:
 
         # Determine the common base path for relative path calculation
         try:
-            common_base_path = Path(os.path.commonpath([item[0] for item in file_data]))
+            common_base_path = Path(os.path.commonpath(list(counts)))
         except ValueError:
             # If no common path, use the current directory
             common_base_path = Path.cwd()
 
         # Process each file for individual and directory stats
-        for file_path_str, content, token_count in file_data:
+        for file_path_str, token_count in counts.items():
             total_tokens += token_count
             file_path = Path(file_path_str)
             all_files.append({"path": file_path_str, "tokens": token_count})
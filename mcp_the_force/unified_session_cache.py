@@ -1,17 +1,24 @@
 """Unified session cache for all providers using LiteLLM's message format."""
 
+import re
 import time
+import random
+import hashlib
+import sqlite3
 import orjson
 import logging
 import threading
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple, TypeVar
 
 from mcp_the_force.config import get_settings
 from mcp_the_force.sqlite_base_cache import BaseSQLiteCache
+from mcp_the_force.utils.token_counter import count_tokens_batch
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 @dataclass
 class UnifiedSession:
@@ -60,8 +67,12 @@ class _SQLiteUnifiedSessionCache(BaseSQLiteCache):
             purge_probability=get_settings().session_cleanup_probability,
         )
 
-        # Create the session_summaries table
+        # Create the session_summaries and session_messages tables
         self._create_summaries_table()
+        self._create_messages_table()
+        self._create_lookup_indexes()
+        self._migrate_legacy_histories()
+        self._fts_enabled = self._create_fts_index()
 
     def _migrate_if_needed(self, db_path: str):
         """Check if old schema exists and migrate to new schema if needed."""
@@ -129,6 +140,346 @@ class _SQLiteUnifiedSessionCache(BaseSQLiteCache):
                 )
             """)
 
+    def _create_messages_table(self):
+        """Create the append-only session_messages log.
+
+        Each history item is stored as its own row keyed by a per-session
+        sequence number, so a new turn only inserts the new suffix instead of
+        rewriting the whole conversation. The digest lets set_session find
+        the first diverging message without reading payloads back, and the
+        token count of each payload is computed once when the row is written.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database connection is not initialized")
+
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_messages (
+                    project TEXT NOT NULL,
+                    tool TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT,
+                    payload BLOB NOT NULL,
+                    digest BLOB NOT NULL,
+                    tokens INTEGER,
+                    text_tokens INTEGER,
+                    PRIMARY KEY (project, tool, session_id, seq)
+                ) WITHOUT ROWID
+            """)
+            columns = {
+                row[1]
+                for row in self._conn.execute("PRAGMA table_info(session_messages)")
+            }
+            if "tokens" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE session_messages ADD COLUMN tokens INTEGER"
+                )
+            if "text_tokens" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE session_messages ADD COLUMN text_tokens INTEGER"
+                )
+            if "fts_rowid" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE session_messages ADD COLUMN fts_rowid INTEGER"
+                )
+
+    def _create_lookup_indexes(self):
+        """Create covering indexes for session lookup and listing.
+
+        list_sessions filters by project and orders by updated_at, while
+        describe_session and the optimizer look sessions up by session_id
+        alone. Both indexes carry the remaining key columns so these queries
+        never touch the table rows.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database connection is not initialized")
+
+        with self._conn:
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_unified_sessions_session_id
+                ON unified_sessions(session_id, tool, project)
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_unified_sessions_project_updated
+                ON unified_sessions(project, updated_at, tool, session_id)
+            """)
+
+    def _migrate_legacy_histories(self):
+        """Move history blobs left in unified_sessions into the message log.
+
+        Keeps unified_sessions rows down to their metadata. Each session is
+        migrated in its own transaction so a large database is never loaded
+        at once; token counts are left NULL and backfilled on first read.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database connection is not initialized")
+
+        keys = self._conn.execute(
+            "SELECT project, tool, session_id FROM unified_sessions "
+            "WHERE history IS NOT NULL"
+        ).fetchall()
+        for key in keys:
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT history FROM unified_sessions "
+                    "WHERE project = ? AND tool = ? AND session_id = ?",
+                    key,
+                ).fetchone()
+                try:
+                    legacy = orjson.loads(row[0]) if row[0].strip() else []
+                except orjson.JSONDecodeError:
+                    logger.warning(f"Leaving unreadable history for session {key[2]}")
+                    continue
+                payloads = [orjson.dumps(message) for message in legacy]
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO session_messages(project, tool, session_id, seq, role, payload, digest) "
+                    "VALUES(?,?,?,?,?,?,?)",
+                    [
+                        (*key, seq, _message_role(message), payload, _digest(payload))
+                        for seq, (message, payload) in enumerate(zip(legacy, payloads))
+                    ],
+                )
+                self._conn.execute(
+                    "UPDATE unified_sessions SET history = NULL "
+                    "WHERE project = ? AND tool = ? AND session_id = ?",
+                    key,
+                )
+        if keys:
+            logger.info(
+                f"Moved {len(keys)} legacy session histories into the message log"
+            )
+
+    def _create_fts_index(self) -> bool:
+        """Create the FTS5 full-text index over message text.
+
+        Each message with text gets one row; session_messages.fts_rowid
+        points at it so rewrites and deletes touch only that session's rows.
+        When the index is first created, every existing message is indexed.
+        Returns False if this SQLite build lacks FTS5, in which case search
+        falls back to a substring scan.
+        """
+        if self._conn is None:
+            raise RuntimeError("Database connection is not initialized")
+
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'session_messages_fts'"
+        ).fetchone()
+        if exists:
+            return True
+
+        try:
+            with self._conn:
+                self._conn.execute("""
+                    CREATE VIRTUAL TABLE session_messages_fts USING fts5(
+                        text,
+                        project UNINDEXED,
+                        tool UNINDEXED,
+                        session_id UNINDEXED,
+                        message_index UNINDEXED,
+                        role UNINDEXED,
+                        tokenize = 'porter unicode61'
+                    )
+                """)
+                self._backfill_fts_index(self._conn)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, session search will scan history: {e}")
+            return False
+        return True
+
+    def _backfill_fts_index(self, conn: sqlite3.Connection) -> None:
+        """Index every message already in the log."""
+        rowid = 0
+        updates = []
+        for project, tool, session_id, seq, payload in conn.execute(
+            "SELECT project, tool, session_id, seq, payload FROM session_messages"
+        ):
+            message = orjson.loads(payload)
+            text = _message_text(message)
+            if not text:
+                continue
+            rowid += 1
+            conn.execute(
+                "INSERT INTO session_messages_fts(rowid, text, project, tool, session_id, message_index, role) "
+                "VALUES(?,?,?,?,?,?,?)",
+                (rowid, text, project, tool, session_id, seq, _message_role(message)),
+            )
+            updates.append((rowid, project, tool, session_id, seq))
+        conn.executemany(
+            "UPDATE session_messages SET fts_rowid = ? "
+            "WHERE project = ? AND tool = ? AND session_id = ? AND seq = ?",
+            updates,
+        )
+        logger.info(f"Indexed {len(updates)} session messages for full-text search")
+
+    def _index_messages(
+        self,
+        conn: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        first_seq: int,
+        messages: List[Dict[str, Any]],
+    ) -> List[Optional[int]]:
+        """Add messages to the full-text index and return their FTS rowids."""
+        rowids: List[Optional[int]] = [None] * len(messages)
+        if not self._fts_enabled:
+            return rowids
+
+        last = conn.execute(
+            "SELECT rowid FROM session_messages_fts ORDER BY rowid DESC LIMIT 1"
+        ).fetchone()
+        next_rowid = (last[0] if last else 0) + 1
+        rows = []
+        for i, message in enumerate(messages):
+            text = _message_text(message)
+            if not text:
+                continue
+            rowids[i] = next_rowid
+            rows.append((next_rowid, text, *key, first_seq + i, _message_role(message)))
+            next_rowid += 1
+        conn.executemany(
+            "INSERT INTO session_messages_fts(rowid, text, project, tool, session_id, message_index, role) "
+            "VALUES(?,?,?,?,?,?,?)",
+            rows,
+        )
+        return rowids
+
+    def _unindex_messages(
+        self, conn: sqlite3.Connection, key: Tuple[str, str, str], from_seq: int = 0
+    ) -> None:
+        """Remove a session's messages from seq ``from_seq`` on from the index."""
+        if not self._fts_enabled:
+            return
+        conn.execute(
+            "DELETE FROM session_messages_fts WHERE rowid IN ("
+            "SELECT fts_rowid FROM session_messages "
+            "WHERE project = ? AND tool = ? AND session_id = ? AND seq >= ? "
+            "AND fts_rowid IS NOT NULL)",
+            (*key, from_seq),
+        )
+
+    def _message_rows(
+        self,
+        conn: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        first_seq: int,
+        messages: List[Dict[str, Any]],
+        payloads: List[bytes],
+    ) -> List[Tuple[Any, ...]]:
+        """Build session_messages rows, counting each message's tokens once.
+
+        The messages are added to the full-text index as a side effect.
+        """
+        tokens = _count_payload_tokens(payloads)
+        text_tokens = _count_text_tokens(messages)
+        fts_rowids = self._index_messages(conn, key, first_seq, messages)
+        return [
+            (
+                *key,
+                first_seq + i,
+                _message_role(message),
+                payload,
+                _digest(payload),
+                tokens[i],
+                text_tokens[i],
+                fts_rowids[i],
+            )
+            for i, (message, payload) in enumerate(zip(messages, payloads))
+        ]
+
+    @staticmethod
+    def _read_messages(
+        conn: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        legacy_history: Optional[str],
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Read history[start:end] for a session inside an open transaction.
+
+        Sessions written before the message log existed keep their history in
+        the unified_sessions.history column until their next write.
+        """
+        if legacy_history:
+            history: List[Dict[str, Any]] = orjson.loads(legacy_history)
+            return history[start:end]
+
+        count = conn.execute(
+            "SELECT COALESCE(MAX(seq) + 1, 0) FROM session_messages "
+            "WHERE project = ? AND tool = ? AND session_id = ?",
+            key,
+        ).fetchone()[0]
+        lo, hi, _ = slice(start, end).indices(count)
+        if lo >= hi:
+            return []
+
+        rows = conn.execute(
+            "SELECT payload FROM session_messages "
+            "WHERE project = ? AND tool = ? AND session_id = ? AND seq >= ? AND seq < ? "
+            "ORDER BY seq",
+            (*key, lo, hi),
+        ).fetchall()
+        return [orjson.loads(row[0]) for row in rows]
+
+    def _fetch_live_row(
+        self, conn: sqlite3.Connection, key: Tuple[str, str, str], now: int
+    ) -> Optional[tuple]:
+        """Fetch (history, provider_metadata, updated_at), dropping expired sessions."""
+        row = conn.execute(
+            "SELECT history, provider_metadata, updated_at FROM unified_sessions "
+            "WHERE project = ? AND tool = ? AND session_id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[2] >= self.ttl:
+            self._delete_session_sync(conn, key)
+            logger.debug(f"Session {key[2]} expired")
+            return None
+        return tuple(row)
+
+    def _delete_session_sync(self, conn: sqlite3.Connection, key: Tuple[str, str, str]):
+        """Delete a session row, its message log and its index entries."""
+        self._unindex_messages(conn, key)
+        conn.execute(
+            "DELETE FROM unified_sessions WHERE project = ? AND tool = ? AND session_id = ?",
+            key,
+        )
+        conn.execute(
+            "DELETE FROM session_messages WHERE project = ? AND tool = ? AND session_id = ?",
+            key,
+        )
+
+    async def _read_live_session(
+        self,
+        key: Tuple[str, str, str],
+        now: int,
+        func: Callable[[sqlite3.Connection, tuple], T],
+    ) -> Optional[T]:
+        """Apply func to a live session row on a pooled read connection.
+
+        func receives (history, provider_metadata, updated_at). Returns None
+        for missing sessions; expired ones are deleted on the writer thread.
+        """
+
+        def _load(conn: sqlite3.Connection) -> Tuple[Optional[T], bool]:
+            row = conn.execute(
+                "SELECT history, provider_metadata, updated_at FROM unified_sessions "
+                "WHERE project = ? AND tool = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None, False
+            if now - row[2] >= self.ttl:
+                return None, True
+            return func(conn, tuple(row)), False
+
+        result, expired = await self._read_async(_load)
+        if expired:
+            await self._transaction_async(
+                lambda conn: self._fetch_live_row(conn, key, now)
+            )
+        return result
+
     async def get_session(
         self, project: str, tool: str, session_id: str
     ) -> Optional[UnifiedSession]:
@@ -138,85 +489,274 @@ class _SQLiteUnifiedSessionCache(BaseSQLiteCache):
         """
         self._validate_session_id(session_id)
         now = int(time.time())
+        key = (project, tool, session_id)
 
-        rows = await self._execute_async(
-            "SELECT history, provider_metadata, updated_at FROM unified_sessions WHERE project = ? AND tool = ? AND session_id = ?",
-            (project, tool, session_id),
-        )
+        def _load(conn: sqlite3.Connection, row: tuple) -> UnifiedSession:
+            history_json, metadata_json, updated_at = row
+            return UnifiedSession(
+                project=project,
+                tool=tool,
+                session_id=session_id,
+                updated_at=updated_at,
+                history=self._read_messages(conn, key, history_json),
+                provider_metadata=orjson.loads(metadata_json) if metadata_json else {},
+            )
 
-        if not rows:
+        session = await self._read_live_session(key, now, _load)
+        if session is None:
             logger.debug(f"No session found for {session_id}")
-            return None
+        return session
 
-        history_json, metadata_json, updated_at = rows[0]
+    async def get_messages(
+        self,
+        project: str,
+        tool: str,
+        session_id: str,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return history[start:end] without loading the rest of the session.
 
-        # Check if expired
-        if now - updated_at >= self.ttl:
-            await self.delete_session(project, tool, session_id)
-            logger.debug(f"Session {session_id} expired")
-            return None
+        Uses Python slice semantics, so ``start=-10`` returns the last ten
+        messages. Returns an empty list for missing or expired sessions.
+        """
+        self._validate_session_id(session_id)
+        now = int(time.time())
+        key = (project, tool, session_id)
 
-        # Parse JSON data
-        history = orjson.loads(history_json) if history_json else []
-        metadata = orjson.loads(metadata_json) if metadata_json else {}
-
-        return UnifiedSession(
-            project=project,
-            tool=tool,
-            session_id=session_id,
-            updated_at=updated_at,
-            history=history,
-            provider_metadata=metadata,
+        messages = await self._read_live_session(
+            key,
+            now,
+            lambda conn, row: self._read_messages(conn, key, row[0], start, end),
         )
+        return messages if messages is not None else []
+
+    async def get_messages_with_tokens(
+        self, project: str, tool: str, session_id: str
+    ) -> Tuple[List[Dict[str, Any]], List[int], List[int]]:
+        """Return the full history with the stored token counts of each message.
+
+        Two counts are kept per message: the serialized message, which is
+        what the history costs against the model limit, and its text content
+        alone, which the optimizer uses when checking the final prompt. Rows
+        written before counts were stored are counted once and backfilled.
+        Returns empty lists for missing or expired sessions.
+        """
+        self._validate_session_id(session_id)
+        now = int(time.time())
+        key = (project, tool, session_id)
+        backfill: List[Tuple[Any, ...]] = []
+
+        def _load(
+            conn: sqlite3.Connection, row: tuple
+        ) -> Tuple[List[Dict[str, Any]], List[int], List[int]]:
+            if row[0]:
+                legacy: List[Dict[str, Any]] = orjson.loads(row[0])
+                return (
+                    legacy,
+                    _count_payload_tokens([orjson.dumps(m) for m in legacy]),
+                    _count_text_tokens(legacy),
+                )
+
+            rows = conn.execute(
+                "SELECT seq, payload, tokens, text_tokens FROM session_messages "
+                "WHERE project = ? AND tool = ? AND session_id = ? ORDER BY seq",
+                key,
+            ).fetchall()
+            messages = [orjson.loads(row[1]) for row in rows]
+            tokens: List[int] = [row[2] for row in rows]
+            text_tokens: List[int] = [row[3] for row in rows]
+            missing = [
+                i
+                for i in range(len(rows))
+                if tokens[i] is None or text_tokens[i] is None
+            ]
+            if missing:
+                counted = _count_payload_tokens([rows[i][1] for i in missing])
+                counted_text = _count_text_tokens([messages[i] for i in missing])
+                for i, count, text_count in zip(missing, counted, counted_text):
+                    tokens[i] = count
+                    text_tokens[i] = text_count
+                backfill.extend(
+                    (tokens[i], text_tokens[i], *key, rows[i][0]) for i in missing
+                )
+            return messages, tokens, text_tokens
+
+        result = await self._read_live_session(key, now, _load)
+        if result is None:
+            return [], [], []
+        if backfill:
+            await self._transaction_async(
+                lambda conn: conn.executemany(
+                    "UPDATE session_messages SET tokens = ?, text_tokens = ? "
+                    "WHERE project = ? AND tool = ? AND session_id = ? AND seq = ?",
+                    backfill,
+                )
+            )
+        return result
 
     async def set_session(self, session: UnifiedSession):
         """
         Saves a UnifiedSession object to the database, overwriting any
         existing entry with the same session_id.
+
+        Only messages after the longest prefix already stored in the
+        message log are written.
         """
         self._validate_session_id(session.session_id)
         now = int(time.time())
+        key = (session.project, session.tool, session.session_id)
 
-        # Invalidate any cached summary when session is updated
-        await self._execute_async(
-            "DELETE FROM session_summaries WHERE project = ? AND tool = ? AND session_id = ?",
-            (session.project, session.tool, session.session_id),
-            fetch=False,
-        )
-
-        # Serialize to JSON
-        history_json = (
-            orjson.dumps(session.history).decode("utf-8") if session.history else None
-        )
+        payloads = [orjson.dumps(message) for message in session.history]
         metadata_json = (
             orjson.dumps(session.provider_metadata).decode("utf-8")
             if session.provider_metadata
             else None
         )
 
-        await self._execute_async(
-            "REPLACE INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) VALUES(?,?,?,?,?,?)",
-            (
-                session.project,
-                session.tool,
-                session.session_id,
-                history_json,
-                metadata_json,
-                now,
-            ),
-            fetch=False,
+        def _write(conn: sqlite3.Connection) -> int:
+            # Invalidate any cached summary when session is updated
+            conn.execute(
+                "DELETE FROM session_summaries WHERE project = ? AND tool = ? AND session_id = ?",
+                key,
+            )
+
+            stored = conn.execute(
+                "SELECT digest FROM session_messages "
+                "WHERE project = ? AND tool = ? AND session_id = ? ORDER BY seq",
+                key,
+            ).fetchall()
+            common = 0
+            for (stored_digest,), payload in zip(stored, payloads):
+                if stored_digest != _digest(payload):
+                    break
+                common += 1
+
+            if common < len(stored):
+                self._unindex_messages(conn, key, common)
+                conn.execute(
+                    "DELETE FROM session_messages "
+                    "WHERE project = ? AND tool = ? AND session_id = ? AND seq >= ?",
+                    (*key, common),
+                )
+            conn.executemany(
+                "INSERT INTO session_messages(project, tool, session_id, seq, role, payload, digest, tokens, text_tokens, fts_rowid) "
+                "VALUES(?,?,?,?,?,?,?,?,?,?)",
+                self._message_rows(
+                    conn, key, common, session.history[common:], payloads[common:]
+                ),
+            )
+            conn.execute(
+                "INSERT INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) "
+                "VALUES(?,?,?,NULL,?,?) "
+                "ON CONFLICT(project, tool, session_id) DO UPDATE SET "
+                "history = NULL, provider_metadata = excluded.provider_metadata, "
+                "updated_at = excluded.updated_at",
+                (*key, metadata_json, now),
+            )
+            return len(payloads) - common
+
+        written = await self._transaction_async(_write)
+
+        logger.debug(
+            f"Saved session {session.session_id} ({written}/{len(payloads)} messages written)"
         )
+        await self._probabilistic_cleanup()
 
-        logger.debug(f"Saved session {session.session_id}")
+    async def append_messages(
+        self,
+        project: str,
+        tool: str,
+        session_id: str,
+        messages: List[Dict[str, Any]],
+    ) -> None:
+        """Append messages to a session's log, creating the session if needed.
+
+        Provider metadata is preserved. An expired session is replaced by a
+        fresh one, matching get_session followed by set_session.
+        """
+        self._validate_session_id(session_id)
+        now = int(time.time())
+        key = (project, tool, session_id)
+        payloads = [orjson.dumps(message) for message in messages]
+
+        def _append(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "DELETE FROM session_summaries WHERE project = ? AND tool = ? AND session_id = ?",
+                key,
+            )
+
+            row = self._fetch_live_row(conn, key, now)
+            rows: List[Tuple[Any, ...]] = []
+            if row is not None and row[0]:
+                # Move a legacy history blob into the log before appending
+                legacy = orjson.loads(row[0])
+                rows = self._message_rows(
+                    conn, key, 0, legacy, [orjson.dumps(message) for message in legacy]
+                )
+                next_seq = len(rows)
+            else:
+                next_seq = conn.execute(
+                    "SELECT COALESCE(MAX(seq) + 1, 0) FROM session_messages "
+                    "WHERE project = ? AND tool = ? AND session_id = ?",
+                    key,
+                ).fetchone()[0]
+
+            rows.extend(self._message_rows(conn, key, next_seq, messages, payloads))
+
+            conn.executemany(
+                "INSERT INTO session_messages(project, tool, session_id, seq, role, payload, digest, tokens, text_tokens, fts_rowid) "
+                "VALUES(?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) "
+                "VALUES(?,?,?,NULL,NULL,?) "
+                "ON CONFLICT(project, tool, session_id) DO UPDATE SET "
+                "history = NULL, updated_at = excluded.updated_at",
+                (*key, now),
+            )
+
+        await self._transaction_async(_append)
         await self._probabilistic_cleanup()
 
     async def delete_session(self, project: str, tool: str, session_id: str):
         """Explicitly deletes a session from the cache."""
-        await self._execute_async(
-            "DELETE FROM unified_sessions WHERE project = ? AND tool = ? AND session_id = ?",
-            (project, tool, session_id),
-            fetch=False,
-        )
+        key = (project, tool, session_id)
+        await self._transaction_async(lambda conn: self._delete_session_sync(conn, key))
+
+    async def _probabilistic_cleanup(self):
+        """Purge expired sessions together with their message logs."""
+        if random.random() < self.purge_probability:
+            cutoff = int(time.time()) - self.ttl
+
+            def _purge(conn: sqlite3.Connection) -> None:
+                conn.execute(
+                    "DELETE FROM unified_sessions WHERE updated_at < ?", (cutoff,)
+                )
+                if self._fts_enabled:
+                    conn.execute("""
+                        DELETE FROM session_messages_fts WHERE rowid IN (
+                            SELECT m.fts_rowid FROM session_messages m
+                            WHERE m.fts_rowid IS NOT NULL AND NOT EXISTS (
+                                SELECT 1 FROM unified_sessions u
+                                WHERE u.project = m.project
+                                  AND u.tool = m.tool
+                                  AND u.session_id = m.session_id
+                            )
+                        )
+                    """)
+                conn.execute("""
+                    DELETE FROM session_messages WHERE NOT EXISTS (
+                        SELECT 1 FROM unified_sessions u
+                        WHERE u.project = session_messages.project
+                          AND u.tool = session_messages.tool
+                          AND u.session_id = session_messages.session_id
+                    )
+                """)
+
+            await self._transaction_async(_purge)
+            logger.debug(f"Performed probabilistic cleanup on {self.table_name}")
 
     async def get_summary(
         self, project: str, tool: str, session_id: str
@@ -241,6 +781,169 @@ class _SQLiteUnifiedSessionCache(BaseSQLiteCache):
             fetch=False,
         )
 
+    async def search_messages(
+        self,
+        query: str,
+        limit: int = 40,
+        project: Optional[str] = None,
+        tool: Optional[str] = None,
+        session_id: Optional[str] = None,
+        tool_prefix: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Full-text search over message text across live sessions.
+
+        Every word in ``query`` must appear in a matching message. Results
+        are ordered by BM25 relevance; ``score`` maps it into (0, 1) so that
+        higher is better, and ``snippet`` holds the matching excerpt.
+        """
+        terms = _fts_terms(query)
+        if not terms:
+            return []
+
+        filters = ["u.updated_at >= ?"]
+        params: List[Any] = [int(time.time()) - self.ttl]
+        if project is not None:
+            filters.append("f.project = ?")
+            params.append(project)
+        if tool is not None:
+            filters.append("f.tool = ?")
+            params.append(tool)
+        if tool_prefix is not None:
+            filters.append("substr(f.tool, 1, ?) = ?")
+            params.extend([len(tool_prefix), tool_prefix])
+        if session_id is not None:
+            filters.append("f.session_id = ?")
+            params.append(session_id)
+
+        def _search(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            if self._fts_enabled:
+                rows = conn.execute(
+                    "SELECT f.project, f.tool, f.session_id, f.message_index, f.role, "
+                    "u.updated_at, bm25(session_messages_fts), "
+                    "snippet(session_messages_fts, 0, '', '', '...', 64) "
+                    "FROM session_messages_fts f JOIN unified_sessions u "
+                    "ON u.project = f.project AND u.tool = f.tool AND u.session_id = f.session_id "
+                    f"WHERE session_messages_fts MATCH ? AND {' AND '.join(filters)} "
+                    "ORDER BY bm25(session_messages_fts) LIMIT ?",
+                    (" ".join(f'"{term}"' for term in terms), *params, limit),
+                ).fetchall()
+                return [_search_hit(*row) for row in rows]
+
+            # Without FTS5, scan payloads and match the text in Python
+            rows = conn.execute(
+                "SELECT f.project, f.tool, f.session_id, f.seq, f.payload, u.updated_at "
+                "FROM session_messages f JOIN unified_sessions u "
+                "ON u.project = f.project AND u.tool = f.tool AND u.session_id = f.session_id "
+                f"WHERE {' AND '.join(filters)} ORDER BY u.updated_at DESC, f.seq",
+                params,
+            ).fetchall()
+            hits = []
+            for project_, tool_, session_id_, seq, payload, updated_at in rows:
+                message = orjson.loads(payload)
+                text = _message_text(message)
+                if all(term in text.lower() for term in terms):
+                    hits.append(
+                        _search_hit(
+                            project_,
+                            tool_,
+                            session_id_,
+                            seq,
+                            _message_role(message),
+                            updated_at,
+                            None,
+                            text[:1000],
+                        )
+                    )
+                    if len(hits) >= limit:
+                        break
+            return hits
+
+        return await self._read_async(_search)
+
+
+def _message_role(message: Dict[str, Any]) -> Optional[str]:
+    """Role of a Chat Completions message, or the type of a Responses item."""
+    return message.get("role") or message.get("type")
+
+
+# Content parts carrying text: Chat Completions/LiteLLM use "text", the
+# Responses API "input_text" (user) and "output_text" (assistant)
+_TEXT_PART_TYPES = frozenset({"text", "input_text", "output_text"})
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    """Text of a message: its content, or a tool call's output.
+
+    Used both for the search index and for the text token counts, so both
+    see the same text in Chat Completions and Responses API histories.
+    """
+    content = message.get("content")
+    if content is None:
+        content = message.get("output", "")
+    if isinstance(content, list):
+        return " ".join(
+            item["text"]
+            for item in content
+            if isinstance(item, dict)
+            and item.get("type", "text") in _TEXT_PART_TYPES
+            and isinstance(item.get("text"), str)
+        )
+    return content if isinstance(content, str) else ""
+
+
+def _fts_terms(query: str) -> List[str]:
+    """Split a free-text query into lowercase words for an FTS5 AND query."""
+    return re.findall(r"\w+", query.lower())
+
+
+def _search_hit(
+    project: str,
+    tool: str,
+    session_id: str,
+    message_index: int,
+    role: Optional[str],
+    updated_at: int,
+    bm25: Optional[float],
+    snippet: str,
+) -> Dict[str, Any]:
+    """Shape one search result; BM25 (lower is better) becomes a (0, 1) score."""
+    if bm25 is None:
+        score = 0.8  # Substring fallback has no relevance ranking
+    else:
+        relevance = max(-bm25, 0.0)
+        score = relevance / (1.0 + relevance)
+    return {
+        "project": project,
+        "tool": tool,
+        "session_id": session_id,
+        "message_index": message_index,
+        "role": role or "unknown",
+        "updated_at": updated_at,
+        "score": score,
+        "snippet": snippet,
+    }
+
+
+def _digest(payload: bytes) -> bytes:
+    """Short content digest used to detect rewritten history prefixes."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _count_payload_tokens(payloads: List[bytes]) -> List[int]:
+    """Token cost of serialized messages as the optimizer budgets them."""
+    if not payloads:
+        return []
+    return count_tokens_batch(
+        [payload.decode("utf-8", errors="ignore") for payload in payloads]
+    )
+
+
+def _count_text_tokens(messages: List[Dict[str, Any]]) -> List[int]:
+    """Token count of each message's text content alone."""
+    if not messages:
+        return []
+    return count_tokens_batch([_message_text(m) for m in messages])
+
 
 # Singleton pattern
 _instance: Optional[_SQLiteUnifiedSessionCache] = None
@@ -298,14 +1001,42 @@ class UnifiedSessionCache:
         """Set cached summary for a session."""
         await _get_instance().set_summary(project, tool, session_id, summary)
 
+    @staticmethod
+    async def search_messages(
+        query: str,
+        limit: int = 40,
+        project: Optional[str] = None,
+        tool: Optional[str] = None,
+        session_id: Optional[str] = None,
+        tool_prefix: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Full-text search over session messages, best matches first."""
+        return await _get_instance().search_messages(
+            query, limit, project, tool, session_id, tool_prefix
+        )
+
     # Convenience methods for history
     @staticmethod
     async def get_history(
-        project: str, tool: str, session_id: str
+        project: str,
+        tool: str,
+        session_id: str,
+        start: int = 0,
+        end: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Get conversation history in LiteLLM format."""
-        session = await _get_instance().get_session(project, tool, session_id)
-        return session.history if session else []
+        """Get conversation history in LiteLLM format.
+
+        ``start``/``end`` select a range with slice semantics, e.g.
+        ``start=-20`` for the last 20 messages.
+        """
+        return await _get_instance().get_messages(project, tool, session_id, start, end)
+
+    @staticmethod
+    async def get_history_with_tokens(
+        project: str, tool: str, session_id: str
+    ) -> Tuple[List[Dict[str, Any]], List[int], List[int]]:
+        """Get conversation history with the cached token counts of each message."""
+        return await _get_instance().get_messages_with_tokens(project, tool, session_id)
 
     @staticmethod
     async def set_history(
@@ -336,17 +1067,7 @@ class UnifiedSessionCache:
         For Responses API:
             {"type": "message", "role": "user", "content": [{"type": "input_text", "text": "Hello"}]}
         """
-        session = await _get_instance().get_session(project, tool, session_id)
-        if not session:
-            session = UnifiedSession(
-                project=project,
-                tool=tool,
-                session_id=session_id,
-                updated_at=int(time.time()),
-            )
-
-        session.history.append(message)
-        await _get_instance().set_session(session)
+        await _get_instance().append_messages(project, tool, session_id, [message])
 
     @staticmethod
     async def append_chat_message(
@@ -3,11 +3,15 @@
 import os
 import logging
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from ..utils.fs import gather_file_paths_async
-from ..utils.context_loader import load_specific_files_async
-from ..utils.token_counter import count_tokens
+from ..utils.context_loader import (
+    load_counted_files_async,
+    load_specific_files_async,
+    read_and_count_async,
+)
+from .token_cache import count_file_tokens, token_cache_stats
 from .stable_list_cache import StableListCache
 from .file_tree import build_file_tree_from_paths
 from .token_utils import file_wrapper_tokens
@@ -33,8 +37,9 @@ def estimate_tokens_from_size(size_bytes: int) -> int:
 def count_tokens_from_file(file_path: str) -> int:
     """Count actual tokens in a file using tiktoken.
 
-    Reads the file content and uses tiktoken for accurate token counting.
-    Falls back to size estimation if file cannot be read.
+    Counts are served from the persistent token cache when the file's size
+    and mtime are unchanged. Falls back to size estimation if the file
+    cannot be read.
 
     Args:
         file_path: Path to file to count tokens for
@@ -42,18 +47,36 @@ def count_tokens_from_file(file_path: str) -> int:
     Returns:
         Actual token count
     """
+    counts = count_file_tokens([file_path])
+    if file_path in counts:
+        return counts[file_path]
+
+    # Fallback to size estimation
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-        return count_tokens([content])
-    except (OSError, IOError, UnicodeDecodeError) as e:
-        logger.warning(f"Could not read file {file_path} for token counting: {e}")
-        # Fallback to size estimation
+        size = os.path.getsize(file_path)
+        return estimate_tokens_from_size(size)
+    except (OSError, IOError):
+        return 1
+
+
+def _count_files_tokens(file_paths: List[str]) -> Dict[str, int]:
+    """Count tokens once per file, skipping files that fail."""
+    token_counts: Dict[str, int] = {}
+    for path in file_paths:
+        if path in token_counts:
+            continue
         try:
-            size = os.path.getsize(file_path)
-            return estimate_tokens_from_size(size)
-        except (OSError, IOError):
-            return 1
+            token_counts[path] = count_tokens_from_file(path)
+        except Exception as e:
+            logger.warning(f"Skipping file {path}: {e}")
+    return token_counts
+
+
+def _sort_by_tokens(token_counts: Dict[str, int], file_paths: List[str]) -> List[str]:
+    """Sort counted files by token count (ascending) then path."""
+    counted = [path for path in dict.fromkeys(file_paths) if path in token_counts]
+    counted.sort(key=lambda path: (token_counts[path], path))
+    return counted
 
 
 def sort_files_for_stable_list(file_paths: List[str]) -> List[str]:
@@ -63,8 +86,8 @@ def sort_files_for_stable_list(file_paths: List[str]) -> List[str]:
     This puts more small files inline, maximizing the number
     of complete files available to the model.
 
-    Uses tiktoken for accurate token counting, which adds 100-300ms
-    but provides precise context management.
+    Uses tiktoken for accurate token counting (cached per file), which
+    provides precise context management.
 
     Args:
         file_paths: List of file paths to sort
@@ -72,21 +95,7 @@ def sort_files_for_stable_list(file_paths: List[str]) -> List[str]:
     Returns:
         Sorted list of file paths
     """
-    file_info = []
-
-    for path in file_paths:
-        try:
-            tokens = count_tokens_from_file(path)
-            file_info.append((path, tokens))
-        except Exception as e:
-            logger.warning(f"Skipping file {path}: {e}")
-            continue
-
-    # Sort by token count (ascending) then path
-    # This puts smaller files first
-    file_info.sort(key=lambda x: (x[1], x[0]))
-
-    return [path for path, _ in file_info]
+    return _sort_by_tokens(_count_files_tokens(file_paths), file_paths)
 
 
 async def build_context_with_stable_list(
@@ -198,10 +207,18 @@ async def build_context_with_stable_list(
         # First call or expired - establish the stable list
         logger.info(f"No stable list for session {session_id}, creating one")
 
+        # Stat, count and (on token cache misses) read every file once;
+        # sorting, budgeting and loading all share the result. Files larger
+        # than the whole budget cannot go inline, so their content is not kept.
+        loaded = await read_and_count_async(
+            priority_files + all_files, max_tokens_kept=token_budget
+        )
+        token_counts = {path: f.tokens for path, f in loaded.items()}
+
         # Sort files deterministically
-        sorted_regular_files = sort_files_for_stable_list(all_files)
+        sorted_regular_files = _sort_by_tokens(token_counts, all_files)
         sorted_priority_files = (
-            sort_files_for_stable_list(priority_files) if priority_files else []
+            _sort_by_tokens(token_counts, priority_files) if priority_files else []
         )
 
         # Combine with priority files first
@@ -221,7 +238,7 @@ async def build_context_with_stable_list(
         )
         for file_path in sorted_files:
             try:
-                content_tokens = count_tokens_from_file(file_path)
+                content_tokens = token_counts[file_path]
                 wrapper_tokens = file_wrapper_tokens(file_path)
                 actual_tokens = content_tokens + wrapper_tokens
 
@@ -243,11 +260,19 @@ async def build_context_with_stable_list(
                 else:
                     overflow_paths.append(file_path)
 
-        # Load file contents for inline files (we already have accurate token counts)
+        # Load file contents for inline files (we already have accurate token
+        # counts); files read during counting are not read again
         logger.debug(
             f"Loading {len(inline_paths)} inline files (tiktoken-validated), {len(overflow_paths)} overflow files"
         )
-        file_data = await load_specific_files_async(inline_paths)
+        inline_loaded = await load_counted_files_async(
+            [loaded[path] for path in inline_paths if path in loaded]
+        )
+        file_data = [
+            (f.path, f.content, f.tokens)
+            for f in inline_loaded
+            if f.content is not None
+        ]
 
         # No safety check needed - we used accurate tiktoken counts for selection
         # The file_data should exactly match our token budget calculations
@@ -256,9 +281,7 @@ async def build_context_with_stable_list(
         if file_data:
             total_tiktoken = sum(tokens for _, _, tokens in file_data)
             total_size_estimate = sum(
-                estimate_tokens_from_size(os.path.getsize(path))
-                for path, _, _ in file_data
-                if os.path.exists(path)
+                estimate_tokens_from_size(f.size) for f in inline_loaded
             )
             old_vs_new_ratio = (
                 total_size_estimate / total_tiktoken if total_tiktoken > 0 else 0
@@ -277,16 +300,9 @@ async def build_context_with_stable_list(
         # On first call, send all inline files
         files_to_send = file_data
 
-        # Batch update the mtime/size info for all sent files for future change detection
-        files_to_update = []
-        for file_path, _, _ in files_to_send:
-            try:
-                stat = os.stat(file_path)
-                files_to_update.append(
-                    (file_path, int(stat.st_size), int(stat.st_mtime_ns))
-                )
-            except OSError as e:
-                logger.warning(f"Could not stat file {file_path} for cache update: {e}")
+        # Batch update the mtime/size info for all sent files for future change
+        # detection, using the stat taken before each file was read
+        files_to_update = [(f.path, f.size, f.mtime_ns) for f in inline_loaded]
 
         if files_to_update:
             await cache.batch_update_sent_files(session_id, files_to_update)
@@ -299,36 +315,40 @@ async def build_context_with_stable_list(
 
         # Combine all files (priority + regular)
         all_combined_files = list(set(priority_files + all_files))
+        # Priority files ALWAYS go inline, even if not in stable list
+        inline_set = set(stable_list) | set(priority_files)
 
-        # Check each file in context
+        # Stat every file once and compare against what was last sent in a
+        # single query
+        current_info: Dict[str, Tuple[int, int]] = {}
         for file_path in all_combined_files:
-            # Priority files ALWAYS go inline, even if not in stable list
-            if file_path in priority_files or file_path in stable_list:
-                # This file should go inline
-                if await cache.file_changed_since_last_send(session_id, file_path):
-                    # File has changed, need to resend it
-                    file_data = await load_specific_files_async([file_path])
-                    if file_data:
-                        files_to_send.append(file_data[0])
-                        # Update sent info
-                        try:
-                            stat = os.stat(file_path)
-                            await cache.update_sent_file_info(
-                                session_id,
-                                file_path,
-                                int(stat.st_size),
-                                int(stat.st_mtime_ns),
-                            )
-                        except OSError:
-                            pass
-                # else: file hasn't changed, skip it
-            else:
-                # This file wasn't in the stable list originally
-                # Only add to overflow if it's a new file that wasn't tracked before
-                if await cache.file_changed_since_last_send(session_id, file_path):
-                    # New file that wasn't in the original stable list
-                    overflow_paths.append(file_path)
-                # else: file exists but hasn't changed, skip it entirely
+            try:
+                stat = os.stat(file_path)
+                current_info[file_path] = (int(stat.st_size), int(stat.st_mtime_ns))
+            except OSError:
+                # Files that can't be accessed are treated as changed
+                logger.warning(f"Cannot stat file {file_path}")
+
+        _, unchanged = await cache.get_changed_files(
+            session_id, [(path, *info) for path, info in current_info.items()]
+        )
+        changed_files = [f for f in all_combined_files if f not in unchanged]
+
+        # Changed inline files are resent; files that weren't in the stable
+        # list only overflow if they are new or changed
+        changed_inline = [f for f in changed_files if f in inline_set]
+        overflow_paths = [f for f in changed_files if f not in inline_set]
+
+        if changed_inline:
+            files_to_send = list(await load_specific_files_async(changed_inline))
+            # Record the stat taken before reading as the sent state
+            sent_info = [
+                (path, *current_info[path])
+                for path, _, _ in files_to_send
+                if path in current_info
+            ]
+            if sent_info:
+                await cache.batch_update_sent_files(session_id, sent_info)
 
         logger.info(f"Sending {len(files_to_send)} changed files inline")
 
@@ -360,6 +380,7 @@ async def build_context_with_stable_list(
         root_path=None,  # Will find common root automatically
     )
 
+    logger.debug(f"[TOKEN_CACHE] context builder: {token_cache_stats()}")
     logger.info(
         f"[CONTEXT_BUILDER] Completed: returning {len(files_to_send)} inline files, {len(overflow_paths)} overflow files, file tree with {len(attachment_paths)} attached markers"
     )
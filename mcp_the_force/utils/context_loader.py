@@ -2,13 +2,38 @@
 Shared context loading functionality for file gathering and token counting.
 """
 
-from pathlib import Path
-from typing import List, Tuple
+import os
+import asyncio
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from .fs import gather_file_paths
-from .token_counter import count_tokens
+from .token_cache import (
+    count_loaded_file_tokens,
+    read_and_count_files,
+    read_text_for_tokens,
+)
 from .thread_pool import run_in_thread_pool
 
+logger = logging.getLogger(__name__)
+
+# Files handled per shared-thread-pool task by the read-and-count stage
+_LOAD_BATCH = 64
+
+
+class LoadedFile(NamedTuple):
+    """A file as seen by the read-and-count stage.
+
+    ``content`` is None when the token count came from the token cache and
+    the file has not been read yet.
+    """
+
+    path: str
+    content: Optional[str]
+    tokens: int
+    size: int
+    mtime_ns: int
+
 
 def load_specific_files(file_paths: List[str]) -> List[Tuple[str, str, int]]:
     """
@@ -20,21 +45,19 @@ def load_specific_files(file_paths: List[str]) -> List[Tuple[str, str, int]]:
     Returns:
         List of tuples containing (file_path, content, token_count)
     """
-    import logging
-
-    logger = logging.getLogger(__name__)
     result: List[Tuple[str, str, int]] = []
 
     for path in file_paths:
         try:
-            # Read file content with UTF-8 encoding, ignoring errors
-            content = Path(path).read_text(encoding="utf-8", errors="ignore")
+            # Stat before reading so the token cache key matches the content
+            st = os.stat(path)
 
-            # Remove null bytes which can cause issues
-            content = content.replace("\x00", "")
+            # Read file content with UTF-8 encoding, ignoring errors and
+            # removing null bytes which can cause issues
+            content = read_text_for_tokens(path)
 
-            # Count tokens for this content
-            token_count = count_tokens([content])
+            # Count tokens for this content (cached by size/mtime)
+            token_count = count_loaded_file_tokens(path, content, st)
 
             result.append((path, content, token_count))
 
@@ -46,6 +69,84 @@ def load_specific_files(file_paths: List[str]) -> List[Tuple[str, str, int]]:
     return result
 
 
+def read_and_count(
+    file_paths: List[str], max_tokens_kept: Optional[int] = None
+) -> List[LoadedFile]:
+    """Stat, read and count files in one pass for budgeting and loading.
+
+    Each file is read at most once: unchanged files are counted from the
+    token cache without being read, and the content of files that had to be
+    read is handed back so the loading step can reuse it.
+
+    Args:
+        file_paths: Files to count
+        max_tokens_kept: Do not keep content of files with more tokens, as
+            they cannot go inline anyway
+
+    Returns:
+        One LoadedFile per readable path, in input order
+    """
+    counted = read_and_count_files(file_paths, max_tokens_kept=max_tokens_kept)
+    return [
+        LoadedFile(path, content, tokens, int(st.st_size), int(st.st_mtime_ns))
+        for path, (st, tokens, content) in counted.items()
+    ]
+
+
+def load_counted_files(files: List[LoadedFile]) -> List[LoadedFile]:
+    """Fill in content for files from the read-and-count stage.
+
+    Files that were already read are passed through untouched. Others are
+    read now; their cached token count is kept unless the file changed since
+    it was counted.
+    """
+    result: List[LoadedFile] = []
+    for f in files:
+        if f.content is not None:
+            result.append(f)
+            continue
+        try:
+            st = os.stat(f.path)
+            content = read_text_for_tokens(f.path)
+            tokens = f.tokens
+            if (st.st_size, st.st_mtime_ns) != (f.size, f.mtime_ns):
+                tokens = count_loaded_file_tokens(f.path, content, st)
+            result.append(
+                LoadedFile(
+                    f.path, content, tokens, int(st.st_size), int(st.st_mtime_ns)
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read file {f.path}: {type(e).__name__}: {e}")
+    return result
+
+
+async def _run_batched(func, items: list, *args) -> list:
+    """Run func over batches of items concurrently on the shared thread pool."""
+    if len(items) <= _LOAD_BATCH:
+        return list(await run_in_thread_pool(func, items, *args))
+    batches = [items[i : i + _LOAD_BATCH] for i in range(0, len(items), _LOAD_BATCH)]
+    results = await asyncio.gather(
+        *(run_in_thread_pool(func, batch, *args) for batch in batches)
+    )
+    return [item for batch_result in results for item in batch_result]
+
+
+async def read_and_count_async(
+    file_paths: List[str], max_tokens_kept: Optional[int] = None
+) -> Dict[str, LoadedFile]:
+    """Run the read-and-count stage concurrently, keyed by path."""
+    unique = list(dict.fromkeys(file_paths))
+    loaded = await _run_batched(read_and_count, unique, max_tokens_kept)
+    return {f.path: f for f in loaded}
+
+
+async def load_counted_files_async(files: List[LoadedFile]) -> List[LoadedFile]:
+    """Fill in file content concurrently, preserving order."""
+    result: List[LoadedFile] = await _run_batched(load_counted_files, files)
+    return result
+
+
 def load_text_files(items: List[str]) -> List[Tuple[str, str, int]]:
     """
     Load text files and return their paths, contents, and token counts.
@@ -61,10 +162,6 @@ def load_text_files(items: List[str]) -> List[Tuple[str, str, int]]:
         Binary files, oversized files, and gitignored files are automatically
         filtered out by gather_file_paths.
     """
-    import os
-    import logging
-
-    logger = logging.getLogger(__name__)
 
     # Debug: Log current working directory and user
     logger.debug(
@@ -121,18 +218,18 @@ def load_text_files(items: List[str]) -> List[Tuple[str, str, int]]:
                         )
                 continue
 
-            # Read file content with UTF-8 encoding, ignoring errors
-            content = Path(path).read_text(encoding="utf-8", errors="ignore")
+            st = os.stat(abs_path)
+
+            # Read file content with UTF-8 encoding, ignoring errors and
+            # removing null bytes which can cause issues
+            content = read_text_for_tokens(path)
             # logger.info(
             #     f"[CONTEXT_LOADER] Successfully read {len(content)} chars from {path}"
             # )
 
-            # Remove null bytes which can cause issues
-            content = content.replace("\x00", "")
-
-            # Count tokens for this content
+            # Count tokens for this content (cached by size/mtime)
             # logger.info(f"[CONTEXT_LOADER] Counting tokens for {path}")
-            token_count = count_tokens([content])
+            token_count = count_loaded_file_tokens(path, content, st)
             # logger.info(f"[CONTEXT_LOADER] File {path} has {token_count} tokens")
 
             result.append((path, content, token_count))
@@ -0,0 +1,181 @@
+"""Persistent per-directory file index for gather_file_paths.
+
+Each scanned directory is stored with its mtime, the fingerprint of the
+ignore rules in effect for it, its own .gitignore patterns and the (name,
+size, mtime, is_text, ignored) facts for its files. A directory whose mtime
+and ignore rules are unchanged has had no entries added, removed or renamed,
+so a later scan can skip listing it, re-matching gitignore patterns and
+sniffing file contents.
+"""
+
+import time
+import random
+import sqlite3
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from ..config import get_settings
+from ..sqlite_base_cache import BaseSQLiteCache, SharedCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileEntry:
+    """A file as last seen in its directory."""
+
+    name: str
+    size: int
+    mtime_ns: int
+    is_text: bool
+    ignored: bool
+
+
+@dataclass
+class DirRecord:
+    """Listing of a directory as of its recorded mtime."""
+
+    mtime_ns: int
+    ignore_key: str = ""
+    subdirs: List[str] = field(default_factory=list)
+    files: List[FileEntry] = field(default_factory=list)
+    # (size, mtime_ns) of the directory's own .gitignore and its patterns
+    gitignore_sig: Optional[List[int]] = None
+    gitignore: List[str] = field(default_factory=list)
+
+    def to_blob(self) -> bytes:
+        return orjson.dumps(
+            {
+                "gitignore_sig": self.gitignore_sig,
+                "gitignore": self.gitignore,
+                "subdirs": self.subdirs,
+                "files": [
+                    [f.name, f.size, f.mtime_ns, f.is_text, f.ignored]
+                    for f in self.files
+                ],
+            }
+        )
+
+    @classmethod
+    def from_blob(cls, mtime_ns: int, ignore_key: str, blob: bytes) -> "DirRecord":
+        data = orjson.loads(blob)
+        return cls(
+            mtime_ns=mtime_ns,
+            ignore_key=ignore_key,
+            subdirs=data["subdirs"],
+            files=[FileEntry(*f) for f in data["files"]],
+            gitignore_sig=data.get("gitignore_sig"),
+            gitignore=data.get("gitignore", []),
+        )
+
+
+class FileIndexCache(BaseSQLiteCache):
+    """SQLite-backed directory listings keyed by scan root.
+
+    Records are only valid for the ignore rules they were built with, so
+    each row carries the ``ignore_key`` the scanner compares before reusing
+    it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[int] = None):
+        settings = get_settings()
+        if db_path is None:
+            db_path = settings.session.db_path
+        if ttl is None:
+            ttl = settings.session.ttl_seconds
+
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS file_index (
+            root TEXT NOT NULL,
+            dir_path TEXT NOT NULL,
+            ignore_key TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            entries BLOB NOT NULL,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (root, dir_path)
+        ) WITHOUT ROWID
+        """
+
+        super().__init__(
+            db_path=db_path,
+            ttl=ttl,
+            table_name="file_index",
+            create_table_sql=create_table_sql,
+            purge_probability=settings.session.cleanup_probability,
+        )
+
+    def load(self, root: str) -> Dict[str, DirRecord]:
+        """Return the stored directory records for a scan root."""
+        if self._conn is None:
+            return {}
+
+        def _select(conn: sqlite3.Connection) -> List[Tuple[str, int, str, bytes]]:
+            return conn.execute(
+                "SELECT dir_path, mtime_ns, ignore_key, entries FROM file_index "
+                "WHERE root = ?",
+                (root,),
+            ).fetchall()
+
+        try:
+            rows = self._read(_select)
+        except sqlite3.Error as e:
+            # Without records every directory is listed and sniffed again
+            logger.warning(f"[FILE_INDEX] Could not load {root}: {e}")
+            return {}
+
+        records: Dict[str, DirRecord] = {}
+        for dir_path, mtime_ns, ignore_key, blob in rows:
+            try:
+                records[dir_path] = DirRecord.from_blob(mtime_ns, ignore_key, blob)
+            except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+                logger.debug(f"[FILE_INDEX] Dropping unreadable record {dir_path}: {e}")
+        return records
+
+    def save(
+        self,
+        root: str,
+        records: Dict[str, DirRecord],
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Upsert changed directory records and drop vanished directories."""
+        removed = list(removed)
+        if self._conn is None or (not records and not removed):
+            return
+        now = int(time.time())
+        rows = [
+            (root, dir_path, rec.ignore_key, rec.mtime_ns, rec.to_blob(), now)
+            for dir_path, rec in records.items()
+        ]
+
+        def _write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "REPLACE INTO file_index(root, dir_path, ignore_key, mtime_ns, entries, updated_at) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "DELETE FROM file_index WHERE root = ? AND dir_path = ?",
+                [(root, dir_path) for dir_path in removed],
+            )
+            if random.random() < self.purge_probability:
+                conn.execute(
+                    "DELETE FROM file_index WHERE updated_at < ?",
+                    (now - self.ttl,),
+                )
+
+        try:
+            self._transaction(_write)
+        except sqlite3.Error as e:
+            # The walk result stands; the next walk rescans these directories
+            logger.warning(f"[FILE_INDEX] Could not save {root}: {e}")
+
+
+_shared = SharedCache(FileIndexCache, "File index")
+
+
+def get_file_index() -> Optional[FileIndexCache]:
+    """Get the shared file index, or None if it cannot be opened."""
+    return _shared.get(get_settings().session.db_path)
@@ -1,11 +1,15 @@
 import mimetypes
 import os
-import fnmatch
+import re
+import hashlib
+import functools
+from contextlib import closing
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, Generator, List, Optional, Sequence, Set, Tuple
 import logging
 import time
 from .thread_pool import run_in_thread_pool
+from .file_index import DirRecord, FileEntry, get_file_index
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -127,6 +131,10 @@ SKIP_DIRS = {
 # File size limits are now configured in settings
 # Get them when needed via get_settings().mcp.max_file_size
 
+# Entries modified this recently may still change within the same mtime tick,
+# so they are indexed with an mtime that never matches and get rechecked
+_RACY_WINDOW_NS = 2_000_000_000
+
 
 def _parse_gitignore(gitignore_path: Path) -> List[str]:
     """Parse .gitignore file and return list of patterns."""
@@ -145,37 +153,140 @@ def _parse_gitignore(gitignore_path: Path) -> List[str]:
     return patterns
 
 
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex over '/'-separated paths.
+
+    ``*``, ``?`` and character classes never match '/'. ``**`` as a whole
+    path component matches any number of directories.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            j = i
+            while j < n and pattern[j] == "*":
+                j += 1
+            whole_component = (i == 0 or pattern[i - 1] == "/") and (
+                j == n or pattern[j] == "/"
+            )
+            if j - i >= 2 and whole_component:
+                if j == n:
+                    out.append(".*")
+                else:
+                    out.append("(?:.*/)?")
+                    j += 1  # the "/" is part of the optional group
+            else:
+                out.append("[^/]*")
+            i = j
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class _GitignoreRules:
+    """Patterns of one .gitignore compiled for matching relative paths.
+
+    All rules are combined into one regex per kind (files, directories) so
+    the common no-match case costs a single regex call. Individual rules are
+    only consulted when negations make the last matching rule significant.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.rules: List[Tuple["re.Pattern[str]", bool, bool]] = []
+        file_regexes: List[str] = []
+        dir_regexes: List[str] = []
+
+        for pattern in patterns:
+            negate = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            # A slash at the start or in the middle anchors the pattern to
+            # the directory of the .gitignore; otherwise it matches at any level
+            anchored = "/" in pattern
+            regex = _glob_to_regex(pattern.lstrip("/"))
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+
+            self.rules.append((re.compile(regex), negate, dir_only))
+            dir_regexes.append(f"(?:{regex})")
+            if not dir_only:
+                file_regexes.append(f"(?:{regex})")
+
+        self.has_negation = any(negate for _, negate, _ in self.rules)
+        self._any_file = re.compile("|".join(file_regexes)) if file_regexes else None
+        self._any_dir = re.compile("|".join(dir_regexes)) if dir_regexes else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Match a '/'-separated path relative to the .gitignore directory.
+
+        Returns:
+            True if ignored, False if re-included by a negation, None if no
+            rule matches
+        """
+        combined = self._any_dir if is_dir else self._any_file
+        if combined is None or combined.fullmatch(rel_path) is None:
+            return None
+        if not self.has_negation:
+            return True
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(rel_path):
+                return not negate
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_gitignore(patterns: Tuple[str, ...]) -> _GitignoreRules:
+    return _GitignoreRules(patterns)
+
+
 def _is_ignored(
     file_path: Path, gitignore_patterns: List[str], root_path: Path
 ) -> bool:
-    """Check if file matches any gitignore pattern."""
+    """Check if file matches gitignore patterns relative to root_path."""
     try:
-        # Get relative path from root
-        rel_path = file_path.relative_to(root_path)
-        rel_path_str = rel_path.as_posix()
-
-        for pattern in gitignore_patterns:
-            # Handle negation patterns (starting with !)
-            if pattern.startswith("!"):
-                continue  # Skip negation for now (complex to implement correctly)
-
-            # Handle directory patterns (ending with /)
-            if pattern.endswith("/"):
-                if any(part == pattern[:-1] for part in rel_path.parts):
-                    return True
-            else:
-                # Use fnmatch for glob-style patterns
-                if fnmatch.fnmatch(rel_path_str, pattern):
-                    return True
-                if fnmatch.fnmatch(file_path.name, pattern):
-                    return True
-                # Check if any parent directory matches
-                if any(fnmatch.fnmatch(part, pattern) for part in rel_path.parts):
-                    return True
-    except (ValueError, OSError):
-        pass
+        rel_parts = file_path.relative_to(root_path).parts
+    except ValueError:
+        return False
+    if not rel_parts:
+        return False
 
-    return False
+    rules = _compile_gitignore(tuple(gitignore_patterns))
+    # Nothing inside an ignored directory can be re-included
+    for depth in range(1, len(rel_parts)):
+        if rules.match("/".join(rel_parts[:depth]), is_dir=True):
+            return True
+    return rules.match("/".join(rel_parts), is_dir=False) is True
 
 
 def _is_safe_path(base: Path, target: Path) -> bool:
@@ -282,6 +393,233 @@ def _is_text_file(file_path: Path) -> bool:
     return False
 
 
+# A compiled .gitignore together with the directory prefix it applies to
+_IgnoreLevel = Tuple[str, _GitignoreRules]
+
+
+def _ignore_key(parent_key: str, base: str, patterns: Sequence[str]) -> str:
+    """Fingerprint of the ignore rules in effect for a directory."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (parent_key, base, *patterns):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _is_ignored_by(levels: Sequence[_IgnoreLevel], path_str: str, is_dir: bool) -> bool:
+    """Check a path against nested .gitignore levels, deepest first."""
+    for base, rules in reversed(levels):
+        rel_path = path_str[len(base) :]
+        if os.sep != "/":
+            rel_path = rel_path.replace(os.sep, "/")
+        verdict = rules.match(rel_path, is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+def _inherited_gitignore(top: Path) -> Tuple[List[_IgnoreLevel], str]:
+    """Rules from the first .gitignore above top, plus their fingerprint."""
+    current = top.parent
+    while current != current.parent:
+        gitignore = current / ".gitignore"
+        if gitignore.exists():
+            patterns = _parse_gitignore(gitignore)
+            base = str(current) + os.sep
+            return (
+                [(base, _compile_gitignore(tuple(patterns)))],
+                _ignore_key("", base, patterns),
+            )
+        current = current.parent
+    return [], _ignore_key("", "", [])
+
+
+def _own_gitignore(
+    dir_path: Path, previous: Optional[DirRecord], now_ns: int
+) -> Tuple[List[str], Optional[List[int]]]:
+    """Patterns of dir_path/.gitignore and the (size, mtime_ns) they came from.
+
+    The file is only parsed again when its stat signature changed.
+    """
+    gitignore = dir_path / ".gitignore"
+    try:
+        st = gitignore.stat()
+    except OSError:
+        return [], None
+
+    signature = [st.st_size, st.st_mtime_ns]
+    if previous is not None and previous.gitignore_sig == signature:
+        return previous.gitignore, signature
+    if now_ns - st.st_mtime_ns <= _RACY_WINDOW_NS:
+        signature = [st.st_size, -1]
+    return _parse_gitignore(gitignore), signature
+
+
+def _list_dir(
+    dir_path: Path,
+    levels: Sequence[_IgnoreLevel],
+    previous: Optional[DirRecord],
+) -> DirRecord:
+    """List one directory the way os.walk does, applying .gitignore rules.
+
+    Ignored subdirectories are pruned so they are never descended into.
+    Facts about files that were already indexed are carried over so that
+    unchanged files are not sniffed again.
+    """
+    known = {f.name: f for f in previous.files} if previous else {}
+    record = DirRecord(mtime_ns=-1)
+    prefix = str(dir_path) + os.sep
+
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # Like os.walk(followlinks=False), never descend into symlinks
+                if entry.is_symlink() or _should_skip_dir(dir_path / entry.name):
+                    continue
+                if levels and _is_ignored_by(levels, prefix + entry.name, True):
+                    continue
+                record.subdirs.append(entry.name)
+                continue
+
+            ignored = bool(levels) and _is_ignored_by(
+                levels, prefix + entry.name, False
+            )
+            old = known.get(entry.name)
+            if old is not None and not ignored and not old.ignored:
+                record.files.append(old)
+            else:
+                record.files.append(FileEntry(entry.name, -1, -1, False, ignored))
+
+    return record
+
+
+def _refresh_entry(file_path: Path, entry: FileEntry, now_ns: int) -> bool:
+    """Re-stat an indexed file and re-sniff it only if it changed.
+
+    Returns:
+        True if the entry was updated and its record needs saving
+    """
+    try:
+        st = file_path.stat()
+    except OSError:
+        changed = entry.size != -1
+        entry.size, entry.mtime_ns, entry.is_text = -1, -1, False
+        return changed
+
+    if st.st_size == entry.size and st.st_mtime_ns == entry.mtime_ns:
+        return False
+
+    entry.size = st.st_size
+    entry.mtime_ns = st.st_mtime_ns if now_ns - st.st_mtime_ns > _RACY_WINDOW_NS else -1
+    entry.is_text = _is_text_file(file_path)
+    return True
+
+
+def _walk_text_files(top: Path) -> Generator[Tuple[str, int], None, None]:
+    """Yield (path, size) of text files under top that are not ignored.
+
+    The first .gitignore above top applies, as does every .gitignore found
+    inside it; deeper files take precedence and ignored directories are
+    pruned. Files come in os.walk order.
+
+    Directory listings are kept in the persistent file index. A directory
+    whose mtime and effective ignore rules are unchanged is not listed or
+    matched again, and its files are only stat()ed.
+
+    The walk is lazy, so a caller that stops early (e.g. at the total-size
+    limit) leaves the rest of the tree unvisited. Closing the generator saves
+    the directories visited so far; only a complete walk drops directories
+    that vanished from the index.
+    """
+    index = get_file_index()
+    root_key = str(top)
+    known = index.load(root_key) if index is not None else {}
+
+    changed: Dict[str, DirRecord] = {}
+    visited: Set[str] = set()
+    found = 0
+    now_ns = time.time_ns()
+    rescanned = 0
+    complete = False
+
+    inherited, inherited_key = _inherited_gitignore(top)
+    stack: List[Tuple[Path, List[_IgnoreLevel], str]] = [
+        (top, inherited, inherited_key)
+    ]
+    try:
+        while stack:
+            dir_path, levels, ignore_key = stack.pop()
+            dir_key = str(dir_path)
+            try:
+                mtime_ns = os.stat(dir_key).st_mtime_ns
+            except OSError:
+                continue
+
+            record = known.get(dir_key)
+            own_patterns, own_sig = _own_gitignore(dir_path, record, now_ns)
+            if own_patterns:
+                base = dir_key + os.sep
+                levels = levels + [(base, _compile_gitignore(tuple(own_patterns)))]
+                ignore_key = _ignore_key(ignore_key, base, own_patterns)
+
+            dirty = False
+            if (
+                record is None
+                or record.mtime_ns != mtime_ns
+                or record.ignore_key != ignore_key
+            ):
+                try:
+                    record = _list_dir(dir_path, levels, record)
+                except OSError:
+                    # Skip directories we can't read
+                    continue
+                if now_ns - mtime_ns > _RACY_WINDOW_NS:
+                    record.mtime_ns = mtime_ns
+                record.ignore_key = ignore_key
+                dirty = True
+                rescanned += 1
+            if record.gitignore_sig != own_sig:
+                record.gitignore_sig, record.gitignore = own_sig, own_patterns
+                dirty = True
+            visited.add(dir_key)
+
+            for entry in record.files:
+                if entry.ignored:
+                    continue
+                file_path = dir_path / entry.name
+                if _refresh_entry(file_path, entry, now_ns):
+                    dirty = True
+                if entry.is_text and entry.size >= 0:
+                    found += 1
+                    yield str(file_path), entry.size
+
+            if dirty:
+                changed[dir_key] = record
+            # Reversed so the stack pops subdirectories in listing order
+            stack.extend(
+                (dir_path / name, levels, ignore_key)
+                for name in reversed(record.subdirs)
+            )
+        complete = True
+    finally:
+        if index is not None:
+            removed = [d for d in known if d not in visited] if complete else []
+            try:
+                index.save(root_key, changed, removed)
+            except Exception as e:
+                logger.warning(f"[FS] Could not update file index for {top}: {e}")
+
+        logger.debug(
+            f"[FS] Walked {top}: {len(visited)} dirs, {rescanned} rescanned, "
+            f"{found} text files{'' if complete else ' (stopped early)'}"
+        )
+
+
 def gather_file_paths(items: List[str], skip_safety_check: bool = False) -> List[str]:
     """
     Gather text file paths from given items, respecting .gitignore and common patterns.
@@ -407,69 +745,21 @@ def gather_file_paths(items: List[str], skip_safety_check: bool = False) -> List
                 continue
 
         elif path.is_dir():
-            # Directory - find .gitignore files
-            gitignore_patterns = []
-
-            # Look for .gitignore in current and parent directories
-            current = path
-            while current != current.parent:
-                gitignore = current / ".gitignore"
-                if gitignore.exists():
-                    gitignore_patterns.extend(_parse_gitignore(gitignore))
-                    break  # Use the first .gitignore found going up
-                current = current.parent
-
-            # Walk directory tree
-            try:
-                for root, dirs, files in os.walk(path):
+            # Directory - walk it, honoring .gitignore files above and inside it
+            # The walk is lazy: stopping at the size limit stops the walk
+            with closing(_walk_text_files(path)) as walk:
+                for file_path_str, file_size in walk:
                     if total_size >= max_total_size:
                         break
-
-                    root_path = Path(root)
-
-                    # Filter directories in-place to skip unwanted ones
-                    dirs[:] = [d for d in dirs if not _should_skip_dir(root_path / d)]
-
-                    # Process files
-                    for file_name in files:
-                        if total_size >= max_total_size:
-                            break
-
-                        file_path = root_path / file_name
-
-                        # Skip if ignored by gitignore
-                        if gitignore_patterns and _is_ignored(
-                            file_path, gitignore_patterns, path
-                        ):
-                            continue
-
-                        # Check if it's a text file we want
-                        try:
-                            # Check file size first
-                            try:
-                                file_size = file_path.stat().st_size
-                                if file_size > max_file_size:
-                                    logger.debug(
-                                        f"[FS] Skipping file {file_path} - too large ({file_size/1024/1024:.1f}MB)"
-                                    )
-                                    continue
-                            except OSError:
-                                continue
-
-                            if _is_text_file(file_path):
-                                file_path_str = str(file_path)
-                                if file_path_str not in seen:
-                                    seen.add(file_path_str)
-                                    out.append(file_path_str)
-                                    total_size += file_size
-                        except (OSError, PermissionError) as e:
-                            logger.warning(
-                                f"Skipping {file_path} due to permission error: {e}"
-                            )
-
-            except (OSError, PermissionError):
-                # Skip directories we can't read
-                continue
+                    if file_size > max_file_size:
+                        logger.debug(
+                            f"[FS] Skipping file {file_path_str} - too large ({file_size/1024/1024:.1f}MB)"
+                        )
+                        continue
+                    if file_path_str not in seen:
+                        seen.add(file_path_str)
+                        out.append(file_path_str)
+                        total_size += file_size
 
     result = sorted(out)  # Return sorted for consistent ordering
     logger.info(
@@ -0,0 +1,44 @@
+"""Process-wide counters for the pre-model context pipeline.
+
+File reads and tokenization happen on shared thread-pool workers, so the
+counters are plain locked integers rather than context-local state. Callers
+measuring a single operation take a snapshot before and after and report the
+difference; concurrent requests in the same process are included as well.
+"""
+
+import threading
+from typing import Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = {
+    "files_read": 0,
+    "bytes_read": 0,
+    "texts_tokenized": 0,
+    "tokens_counted": 0,
+}
+
+
+def record_file_read(num_bytes: int) -> None:
+    """Record that a file's content was read for context or token counting."""
+    with _lock:
+        _counters["files_read"] += 1
+        _counters["bytes_read"] += num_bytes
+
+
+def record_tokenized(num_texts: int, num_tokens: int) -> None:
+    """Record a tokenization pass over num_texts texts."""
+    with _lock:
+        _counters["texts_tokenized"] += num_texts
+        _counters["tokens_counted"] += num_tokens
+
+
+def pipeline_stats() -> Dict[str, int]:
+    """Return a snapshot of the counters since process start."""
+    with _lock:
+        return dict(_counters)
+
+
+def stats_since(snapshot: Dict[str, int]) -> Dict[str, int]:
+    """Return how much each counter grew since ``snapshot``."""
+    current = pipeline_stats()
+    return {key: current[key] - snapshot.get(key, 0) for key in current}
@@ -5,7 +5,7 @@ import time
 import json
 import logging
 import asyncio
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Set, Tuple
 
 from mcp_the_force.config import get_settings
 from mcp_the_force.sqlite_base_cache import BaseSQLiteCache
@@ -140,6 +140,23 @@ class StableListCache(BaseSQLiteCache):
 
         return {"size": rows[0][0], "mtime": rows[0][1]}
 
+    async def get_sent_files_info(
+        self, session_id: str, file_paths: List[str]
+    ) -> Dict[str, Tuple[int, int]]:
+        """Get the last sent (size, mtime) for many files in one query."""
+        self._validate_session_id(session_id)
+        if not file_paths:
+            return {}
+
+        # json_each keeps this a single statement regardless of the number
+        # of paths (no bound-parameter limit)
+        rows = await self._execute_async(
+            "SELECT file_path, last_size, last_mtime FROM sent_files "
+            "WHERE session_id = ? AND file_path IN (SELECT value FROM json_each(?))",
+            (session_id, json.dumps(file_paths)),
+        )
+        return {path: (size, mtime) for path, size, mtime in rows or []}
+
     async def update_sent_file_info(
         self, session_id: str, file_path: str, size: int, mtime: int
     ):
@@ -201,6 +218,33 @@ class StableListCache(BaseSQLiteCache):
             logger.warning(f"Cannot stat file {file_path}")
             return True
 
+    async def get_changed_files(
+        self, session_id: str, files_info: List[Tuple[str, int, int]]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Split files into changed and unchanged sets with a single query.
+
+        Args:
+            session_id: Session identifier
+            files_info: Current (path, size, mtime_ns) of each file, the same
+                shape batch_update_sent_files takes
+
+        Returns:
+            (changed, unchanged) path sets; files never sent before count as
+            changed
+        """
+        sent = await self.get_sent_files_info(
+            session_id, [path for path, _, _ in files_info]
+        )
+
+        changed: Set[str] = set()
+        unchanged: Set[str] = set()
+        for path, size, mtime in files_info:
+            if sent.get(path) == (size, mtime):
+                unchanged.add(path)
+            else:
+                changed.add(path)
+        return changed, unchanged
+
     async def get_file_change_status(
         self, session_id: str, file_paths: List[str]
     ) -> Tuple[List[str], List[str]]:
@@ -214,15 +258,18 @@ class StableListCache(BaseSQLiteCache):
         """
         self._validate_session_id(session_id)
 
-        changed_files = []
-        unchanged_files = []
-
+        files_info = []
         for file_path in file_paths:
-            if await self.file_changed_since_last_send(session_id, file_path):
-                changed_files.append(file_path)
-            else:
-                unchanged_files.append(file_path)
-
+            try:
+                stat = os.stat(file_path)
+                files_info.append((file_path, int(stat.st_size), int(stat.st_mtime_ns)))
+            except OSError:
+                # Files that can't be accessed are reported as changed
+                logger.warning(f"Cannot stat file {file_path}")
+
+        _, unchanged = await self.get_changed_files(session_id, files_info)
+        changed_files = [p for p in file_paths if p not in unchanged]
+        unchanged_files = [p for p in file_paths if p in unchanged]
         return changed_files, unchanged_files
 
     async def get_previous_inline_list(self, session_id: str) -> List[str]:
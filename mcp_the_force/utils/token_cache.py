@@ -0,0 +1,388 @@
+"""Persistent token-count cache for context files.
+
+Token counts are keyed by (path, size, mtime_ns) so an unchanged file costs a
+single stat() instead of a read and a full tiktoken pass. When the stat key
+misses (e.g. a file was touched or checked out again) the content hash is
+tried before tokenizing.
+"""
+
+import os
+import json
+import mmap
+import time
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..sqlite_base_cache import BaseSQLiteCache, SharedCache
+from .token_counter import count_tokens, count_tokens_batch
+from .pipeline_stats import record_file_read
+
+logger = logging.getLogger(__name__)
+
+# Files read into memory before tokenizing them as one batch
+_TOKENIZE_CHUNK = 256
+
+# Files at least this large are decoded straight from an mmap instead of
+# being copied into a bytes object first
+MMAP_THRESHOLD = 1024 * 1024
+
+# (stat taken before the read, tokens, content if it was read and kept)
+CountedFile = Tuple[os.stat_result, int, Optional[str]]
+
+
+def content_hash(content: str) -> str:
+    """Hash file content for the content-addressed fallback."""
+    return hashlib.blake2b(
+        content.encode("utf-8", errors="ignore"), digest_size=16
+    ).hexdigest()
+
+
+def read_text_for_tokens(file_path: str) -> str:
+    """Read a file as UTF-8 text the way the context loaders do.
+
+    Produces the same text as a text-mode read with errors ignored (including
+    newline translation) but decodes large files directly from an mmap.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, "utf-8", "ignore")
+        else:
+            content = f.read().decode("utf-8", errors="ignore")
+    record_file_read(size)
+
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    # Remove null bytes which can cause issues
+    return content.replace("\x00", "")
+
+
+class TokenCountCache(BaseSQLiteCache):
+    """SQLite-backed token counts shared by the context builder, optimizer and
+    count_project_tokens."""
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[int] = None):
+        settings = get_settings()
+        if db_path is None:
+            db_path = settings.session.db_path
+        if ttl is None:
+            ttl = settings.session.ttl_seconds
+
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS file_token_counts (
+            file_path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            tokens INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+        """
+
+        super().__init__(
+            db_path=db_path,
+            ttl=ttl,
+            table_name="file_token_counts",
+            create_table_sql=create_table_sql,
+            purge_probability=settings.session.cleanup_probability,
+        )
+
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_file_token_counts_hash "
+                    "ON file_token_counts(content_hash)"
+                )
+
+    def _record(self, hits: int = 0, hash_hits: int = 0, misses: int = 0) -> None:
+        with self._stats_lock:
+            self.hits += hits
+            self.hash_hits += hash_hits
+            self.misses += misses
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters since this cache was created."""
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "hash_hits": self.hash_hits,
+                "misses": self.misses,
+            }
+
+    def get_by_stat(self, entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+        """Look up token counts for (path, size, mtime_ns) entries.
+
+        Returns:
+            Mapping of path to tokens for entries whose stat key still matches
+        """
+        if self._conn is None or not entries:
+            return {}
+
+        wanted = {path: (size, mtime_ns) for path, size, mtime_ns in entries}
+
+        def _select(conn: sqlite3.Connection) -> List[Tuple[str, int, int, int]]:
+            return conn.execute(
+                "SELECT file_path, size, mtime_ns, tokens FROM file_token_counts "
+                "WHERE file_path IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(wanted)),),
+            ).fetchall()
+
+        try:
+            rows = self._read(_select)
+        except sqlite3.Error as e:
+            # Treated as misses: the files are read and counted instead
+            logger.warning(f"[TOKEN_CACHE] Lookup failed: {e}")
+            return {}
+
+        return {
+            path: tokens
+            for path, size, mtime_ns, tokens in rows
+            if wanted[path] == (size, mtime_ns)
+        }
+
+    def get_by_hashes(self, digests: List[str]) -> Dict[str, int]:
+        """Look up token counts by content hash."""
+        if self._conn is None or not digests:
+            return {}
+
+        def _select(conn: sqlite3.Connection) -> List[Tuple[str, int]]:
+            return conn.execute(
+                "SELECT content_hash, tokens FROM file_token_counts "
+                "WHERE content_hash IN (SELECT value FROM json_each(?))",
+                (json.dumps(digests),),
+            ).fetchall()
+
+        try:
+            return dict(self._read(_select))
+        except sqlite3.Error as e:
+            logger.warning(f"[TOKEN_CACHE] Lookup failed: {e}")
+            return {}
+
+    def put_many(self, entries: List[Tuple[str, int, int, str, int]]) -> None:
+        """Store (path, size, mtime_ns, content_hash, tokens) entries."""
+        if self._conn is None or not entries:
+            return
+        now = int(time.time())
+
+        def _write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "REPLACE INTO file_token_counts(file_path, size, mtime_ns, content_hash, tokens, updated_at) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                [(*entry, now) for entry in entries],
+            )
+            if random.random() < self.purge_probability:
+                conn.execute(
+                    "DELETE FROM file_token_counts WHERE updated_at < ?",
+                    (now - self.ttl,),
+                )
+
+        try:
+            self._transaction(_write)
+        except sqlite3.Error as e:
+            # The counts are still returned, just not remembered
+            logger.warning(f"[TOKEN_CACHE] Could not store token counts: {e}")
+
+    def count_content(self, file_path: str, st: os.stat_result, content: str) -> int:
+        """Token count for content already read from file_path."""
+        key = (file_path, int(st.st_size), int(st.st_mtime_ns))
+        cached = self.get_by_stat([key])
+        if file_path in cached:
+            self._record(hits=1)
+            return cached[file_path]
+
+        digest = content_hash(content)
+        tokens = self.get_by_hashes([digest]).get(digest)
+        if tokens is not None:
+            self._record(hash_hits=1)
+        else:
+            self._record(misses=1)
+            tokens = count_tokens([content])
+        self.put_many([(*key, digest, tokens)])
+        return tokens
+
+    def read_and_count(
+        self,
+        file_paths: List[str],
+        keep_content: bool = False,
+        max_tokens_kept: Optional[int] = None,
+    ) -> Dict[str, CountedFile]:
+        """Token counts for files, reading only those whose stat key missed.
+
+        Args:
+            file_paths: Files to count
+            keep_content: Return the content of files that had to be read so
+                callers do not read them a second time
+            max_tokens_kept: Drop kept content of files with more tokens
+
+        Returns:
+            Mapping of path to (stat, tokens, content). Files that cannot be
+            stat'ed or read are left out.
+        """
+        stats: Dict[str, os.stat_result] = {}
+        for path in file_paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                continue
+
+        cached = self.get_by_stat(
+            [(p, int(st.st_size), int(st.st_mtime_ns)) for p, st in stats.items()]
+        )
+        self._record(hits=len(cached))
+        result: Dict[str, CountedFile] = {
+            path: (stats[path], tokens, None) for path, tokens in cached.items()
+        }
+
+        new_entries = []
+        hash_hits = 0
+        pending: List[Tuple[str, os.stat_result, str, str]] = []
+
+        def _keep(content: str, tokens: int) -> Optional[str]:
+            if not keep_content:
+                return None
+            if max_tokens_kept is not None and tokens > max_tokens_kept:
+                return None
+            return content
+
+        misses = 0
+
+        def _flush_pending() -> None:
+            nonlocal hash_hits, misses
+            # One content-hash lookup for the chunk, then tokenize the rest
+            # in one parallel batch
+            known = self.get_by_hashes(list({digest for _, _, digest, _ in pending}))
+            unknown = [item for item in pending if item[2] not in known]
+            counted: Dict[str, int] = {}
+            if unknown:
+                counted = dict(
+                    zip(
+                        [path for path, _, _, _ in unknown],
+                        count_tokens_batch([content for _, _, _, content in unknown]),
+                    )
+                )
+            hash_hits += len(pending) - len(unknown)
+            misses += len(unknown)
+            for path, st, digest, content in pending:
+                tokens = known[digest] if digest in known else counted[path]
+                result[path] = (st, tokens, _keep(content, tokens))
+                new_entries.append(
+                    (path, int(st.st_size), int(st.st_mtime_ns), digest, tokens)
+                )
+            pending.clear()
+
+        for path, st in stats.items():
+            if path in result:
+                continue
+            try:
+                content = read_text_for_tokens(path)
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                logger.warning(f"Could not read file {path} for token counting: {e}")
+                continue
+
+            pending.append((path, st, content_hash(content), content))
+            if len(pending) >= _TOKENIZE_CHUNK:
+                _flush_pending()
+
+        if pending:
+            _flush_pending()
+
+        self.put_many(new_entries)
+        self._record(hash_hits=hash_hits, misses=misses)
+        return result
+
+    def count_files(self, file_paths: List[str]) -> Dict[str, int]:
+        """Token counts for files, reading only those whose stat key missed.
+
+        Files that cannot be stat'ed or read are left out of the result.
+        """
+        return {
+            path: tokens
+            for path, (_, tokens, _) in self.read_and_count(file_paths).items()
+        }
+
+
+_shared = SharedCache(TokenCountCache, "Token count cache")
+
+
+def get_token_cache() -> Optional[TokenCountCache]:
+    """Get the shared token cache, or None if it cannot be opened."""
+    return _shared.get(get_settings().session.db_path)
+
+
+def count_file_tokens(file_paths: List[str]) -> Dict[str, int]:
+    """Token counts for files via the persistent cache when available."""
+    cache = get_token_cache()
+    if cache is not None:
+        return cache.count_files(file_paths)
+
+    counts: Dict[str, int] = {}
+    for path in file_paths:
+        try:
+            counts[path] = count_tokens([read_text_for_tokens(path)])
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read file {path} for token counting: {e}")
+    return counts
+
+
+def read_and_count_files(
+    file_paths: List[str], max_tokens_kept: Optional[int] = None
+) -> Dict[str, CountedFile]:
+    """Stat, count and (where needed) read files in a single pass.
+
+    Content is returned for every file that had to be read so the caller can
+    reuse it instead of reading the file again; files served from the token
+    cache come back without content.
+    """
+    cache = get_token_cache()
+    if cache is not None:
+        return cache.read_and_count(
+            file_paths, keep_content=True, max_tokens_kept=max_tokens_kept
+        )
+
+    result: Dict[str, CountedFile] = {}
+    for path in file_paths:
+        try:
+            st = os.stat(path)
+            content = read_text_for_tokens(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            logger.warning(f"Could not read file {path} for token counting: {e}")
+            continue
+        tokens = count_tokens([content])
+        if max_tokens_kept is not None and tokens > max_tokens_kept:
+            result[path] = (st, tokens, None)
+        else:
+            result[path] = (st, tokens, content)
+    return result
+
+
+def count_loaded_file_tokens(
+    file_path: str, content: str, st: Optional[os.stat_result]
+) -> int:
+    """Token count for content a loader has just read from file_path.
+
+    ``st`` must be taken before the read so a concurrent edit can never be
+    cached under the newer stat key.
+    """
+    cache = get_token_cache()
+    if cache is None or st is None:
+        return count_tokens([content])
+    return cache.count_content(file_path, st, content)
+
+
+def token_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters of the shared token cache (zeros if disabled)."""
+    cache = get_token_cache()
+    if cache is None:
+        return {"hits": 0, "hash_hits": 0, "misses": 0}
+    return cache.stats()
@@ -1,6 +1,9 @@
-from typing import Sequence, Optional
+from typing import Sequence, Optional, List
+import os
 import logging
 
+from .pipeline_stats import record_tokenized
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -15,6 +18,9 @@ except Exception:
 # The looks_pathological() check prevents hangs on repetitive content
 TOKEN_ENCODE_CHAR_CAP = 5_000_000
 
+# Threads for encode_ordinary_batch; tiktoken releases the GIL while encoding
+BATCH_THREADS = min(8, os.cpu_count() or 1)
+
 
 def looks_pathological(text: str, threshold: float = 0.15) -> bool:
     """
@@ -37,30 +43,73 @@ def safe_estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
-def count_tokens(texts: Sequence[str]) -> int:
-    """Count tokens in texts, with fallback for when tiktoken is unavailable or content is problematic."""
+def _estimate_if_unsafe(text: str) -> Optional[int]:
+    """Return an estimate for content tiktoken should not see, else None."""
+    # Use estimation for very large texts or pathological (repetitive) content
+    if len(text) > TOKEN_ENCODE_CHAR_CAP:
+        logger.debug(f"Using estimation for large content: {len(text)} chars")
+        return safe_estimate_tokens(text)
+    if looks_pathological(text):
+        logger.debug(f"Using estimation for pathological content: {len(text)} chars")
+        return safe_estimate_tokens(text)
+    return None
+
+
+def _encode_len(text: str) -> int:
+    """Token count for a single safe text, falling back to estimation on error."""
+    try:
+        return len(_enc.encode_ordinary(text))  # type: ignore[union-attr]
+    except Exception as e:
+        logger.warning(f"tiktoken encoding failed: {e}, falling back to estimation")
+        return safe_estimate_tokens(text)
+
+
+def _encode_len_batch(texts: List[str]) -> List[int]:
+    """Token counts for safe texts using tiktoken's threaded batch encoder."""
+    if len(texts) == 1:
+        return [_encode_len(texts[0])]
+    try:
+        encoded = _enc.encode_ordinary_batch(texts, num_threads=BATCH_THREADS)  # type: ignore[union-attr]
+        return [len(tokens) for tokens in encoded]
+    except Exception as e:
+        logger.warning(f"tiktoken batch encoding failed: {e}, counting one by one")
+        return [_encode_len(text) for text in texts]
+
+
+def count_tokens_batch(texts: Sequence[str]) -> List[int]:
+    """Count tokens for each text, tokenizing in parallel.
+
+    Texts are encoded together with ``encode_ordinary_batch`` threads.
+    Oversized and pathological texts are estimated exactly as in
+    ``count_tokens``.
+
+    Returns:
+        Token count per input text, in input order
+    """
     if _enc is None:
         # Fallback: estimate ~4 chars per token
-        return sum(max(1, len(t) // 4) for t in texts)
-
-    total_tokens = 0
-    for text in texts:
-        # Use estimation for very large texts or pathological (repetitive) content
-        if len(text) > TOKEN_ENCODE_CHAR_CAP or looks_pathological(text):
-            if len(text) > TOKEN_ENCODE_CHAR_CAP:
-                logger.debug(f"Using estimation for large content: {len(text)} chars")
-            else:
-                logger.debug(
-                    f"Using estimation for pathological content: {len(text)} chars"
-                )
-            total_tokens += safe_estimate_tokens(text)
+        estimates = [max(1, len(t) // 4) for t in texts]
+        record_tokenized(len(texts), sum(estimates))
+        return estimates
+
+    counts: List[int] = [0] * len(texts)
+    to_encode: List[int] = []
+    for i, text in enumerate(texts):
+        estimate = _estimate_if_unsafe(text)
+        if estimate is not None:
+            counts[i] = estimate
         else:
-            try:
-                total_tokens += len(_enc.encode(text))
-            except Exception as e:
-                logger.warning(
-                    f"tiktoken encoding failed: {e}, falling back to estimation"
-                )
-                total_tokens += safe_estimate_tokens(text)
-
-    return total_tokens
+            to_encode.append(i)
+
+    if to_encode:
+        encoded = _encode_len_batch([texts[i] for i in to_encode])
+        for i, count in zip(to_encode, encoded):
+            counts[i] = count
+
+    record_tokenized(len(texts), sum(counts))
+    return counts
+
+
+def count_tokens(texts: Sequence[str]) -> int:
+    """Count tokens in texts, with fallback for when tiktoken is unavailable or content is problematic."""
+    return sum(count_tokens_batch(texts))
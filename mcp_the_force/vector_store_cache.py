@@ -272,16 +272,15 @@ class VectorStoreCache(BaseSQLiteCache):
         """
         current_time = int(time.time())
 
-        await self._execute_async(
-            "UPDATE vector_stores SET is_active = 0, updated_at = ? WHERE vector_store_id = ?",
-            (current_time, vector_store_id),
-            fetch=False,
+        # changes() is per connection, so take the count from the writer's cursor
+        rowcount = await self._transaction_async(
+            lambda conn: conn.execute(
+                "UPDATE vector_stores SET is_active = 0, updated_at = ? WHERE vector_store_id = ?",
+                (current_time, vector_store_id),
+            ).rowcount
         )
 
-        # Check if any rows were updated
-        rows = await self._execute_async("SELECT changes() AS count", ())
-
-        updated = rows[0][0] > 0 if rows else False
+        updated = rowcount > 0
         if updated:
             logger.info(f"Marked vector store {vector_store_id} as inactive")
 
@@ -302,16 +301,14 @@ class VectorStoreCache(BaseSQLiteCache):
         new_expires_at = current_time + self.ttl
 
         # Update expiration time and updated_at
-        await self._execute_async(
-            "UPDATE vector_stores SET expires_at = ?, updated_at = ? WHERE session_id = ?",
-            (new_expires_at, current_time, session_id),
-            fetch=False,
+        rowcount = await self._transaction_async(
+            lambda conn: conn.execute(
+                "UPDATE vector_stores SET expires_at = ?, updated_at = ? WHERE session_id = ?",
+                (new_expires_at, current_time, session_id),
+            ).rowcount
         )
 
-        # Check if any rows were updated
-        rows = await self._execute_async("SELECT changes() AS count", ())
-
-        updated = rows[0][0] > 0 if rows else False
+        updated = rowcount > 0
         if updated:
             logger.debug(f"Renewed lease for session {session_id}")
 
@@ -361,16 +358,14 @@ class VectorStoreCache(BaseSQLiteCache):
         Returns:
             True if removed, False if not found
         """
-        await self._execute_async(
-            "DELETE FROM vector_stores WHERE vector_store_id = ?",
-            (vector_store_id,),
-            fetch=False,
+        rowcount = await self._transaction_async(
+            lambda conn: conn.execute(
+                "DELETE FROM vector_stores WHERE vector_store_id = ?",
+                (vector_store_id,),
+            ).rowcount
         )
 
-        # Check if any rows were deleted
-        rows = await self._execute_async("SELECT changes() AS count", ())
-
-        deleted = rows[0][0] > 0 if rows else False
+        deleted = rowcount > 0
         if deleted:
             logger.debug(f"Removed vector store entry {vector_store_id}")
 
@@ -386,14 +381,11 @@ class VectorStoreCache(BaseSQLiteCache):
         """
         cutoff = int(time.time()) - (30 * 24 * 60 * 60)  # 30 days
 
-        await self._execute_async(
-            "DELETE FROM vector_stores WHERE created_at < ?", (cutoff,), fetch=False
+        count = await self._transaction_async(
+            lambda conn: conn.execute(
+                "DELETE FROM vector_stores WHERE created_at < ?", (cutoff,)
+            ).rowcount
         )
-
-        # Get count of deleted rows
-        rows = await self._execute_async("SELECT changes() AS count", ())
-
-        count = rows[0][0] if rows else 0
         if count > 0:
             logger.info(f"Cleaned up {count} orphaned vector store entries")
 
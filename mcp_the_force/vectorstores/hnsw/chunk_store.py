@@ -0,0 +1,208 @@
+"""Append-only chunk metadata store for HNSW vector stores.
+
+Each HNSW store keeps its chunks in a small SQLite database next to the
+index file. Rows are keyed by the HNSW label and hold the chunk text, its
+source path and character offsets in that file, the ID of the file it came
+from and the embedding vector. New
+chunks are appended in a single transaction, so adding files never rewrites
+existing metadata, and search only reads the rows for the labels it returns.
+
+The stored vectors let a store rebuild the part of the HNSW graph that was
+appended after the last index checkpoint, or the whole graph when deleted
+chunks are compacted away. Deleted chunks keep their row (with ``deleted``
+set) so labels are never reused; compaction drops their text and vector.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Let SQLite serve reads from a memory map instead of read() calls
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+class ChunkStore:
+    """SQLite-backed chunk metadata keyed by HNSW label.
+
+    Not thread-safe on its own; callers serialize access with the owning
+    store's lock.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """Open (or create) the chunk database.
+
+        Args:
+            path: Database file, or None for an in-memory store
+        """
+        self.path = path
+        self._conn = sqlite3.connect(
+            str(path) if path is not None else ":memory:", check_same_thread=False
+        )
+        with self._conn:
+            if path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB,
+                    file_id TEXT,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    start_offset INTEGER,
+                    end_offset INTEGER
+                )
+                """
+            )
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")
+            }
+            if "file_id" not in columns:
+                self._conn.execute("ALTER TABLE chunks ADD COLUMN file_id TEXT")
+            if "deleted" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE chunks ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0"
+                )
+            if "start_offset" not in columns:
+                self._conn.execute("ALTER TABLE chunks ADD COLUMN start_offset INTEGER")
+                self._conn.execute("ALTER TABLE chunks ADD COLUMN end_offset INTEGER")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_file_id ON chunks(file_id)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def count(self) -> int:
+        """Return the number of labels allocated so far."""
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(id) + 1, 0) FROM chunks"
+        ).fetchone()
+        return int(row[0])
+
+    def append(
+        self,
+        start_id: int,
+        chunks: Sequence[Dict[str, Any]],
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append chunks with consecutive labels starting at ``start_id``.
+
+        Args:
+            start_id: Label of the first chunk
+            chunks: ``{"text": ..., "source": ..., "file_id": ...}`` dicts,
+                optionally with ``start``/``end`` offsets into the source
+            vectors: Embeddings aligned with ``chunks``, or None when the
+                vectors only live in the HNSW index (legacy stores)
+        """
+        if vectors is not None:
+            vectors = np.asarray(vectors, dtype=np.float32)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO chunks"
+                "(id, source, text, vector, file_id, start_offset, end_offset) "
+                "VALUES(?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        start_id + i,
+                        chunk["source"],
+                        chunk["text"],
+                        vectors[i].tobytes() if vectors is not None else None,
+                        chunk.get("file_id"),
+                        chunk.get("start"),
+                        chunk.get("end"),
+                    )
+                    for i, chunk in enumerate(chunks)
+                ],
+            )
+
+    def get(self, ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch the live chunks for the given labels in one query.
+
+        Offsets are None for chunks written before they were recorded.
+        """
+        if not ids:
+            return {}
+        rows = self._conn.execute(
+            "SELECT id, source, text, start_offset, end_offset FROM chunks "
+            "WHERE id IN (SELECT value FROM json_each(?)) AND deleted = 0",
+            (json.dumps([int(i) for i in ids]),),
+        ).fetchall()
+        return {
+            row[0]: {"text": row[2], "source": row[1], "start": row[3], "end": row[4]}
+            for row in rows
+        }
+
+    def vectors_from(
+        self, start_id: int, dim: int, end_id: Optional[int] = None
+    ) -> Tuple[List[int], np.ndarray]:
+        """Return labels and vectors of live chunks in ``[start_id, end_id)``."""
+        query = (
+            "SELECT id, vector FROM chunks "
+            "WHERE id >= ? AND deleted = 0 AND vector IS NOT NULL"
+        )
+        params: Tuple[int, ...] = (start_id,)
+        if end_id is not None:
+            query += " AND id < ?"
+            params += (end_id,)
+        rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        vectors = np.empty((len(rows), dim), dtype=np.float32)
+        for i, (_, blob) in enumerate(rows):
+            vectors[i] = np.frombuffer(blob, dtype=np.float32)
+        return [row[0] for row in rows], vectors
+
+    def mark_deleted(self, file_ids: Sequence[str]) -> List[int]:
+        """Tombstone the chunks of the given files and return their labels."""
+        if not file_ids:
+            return []
+        with self._conn:
+            rows = self._conn.execute(
+                "UPDATE chunks SET deleted = 1 "
+                "WHERE file_id IN (SELECT value FROM json_each(?)) AND deleted = 0 "
+                "RETURNING id",
+                (json.dumps(list(file_ids)),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def tombstones(self) -> List[int]:
+        """Labels of deleted chunks that have not been compacted away."""
+        rows = self._conn.execute(
+            "SELECT id FROM chunks WHERE deleted = 1 AND vector IS NOT NULL"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge(self, ids: Sequence[int]) -> None:
+        """Drop the text and vector of compacted chunks, keeping their labels."""
+        if not ids:
+            return
+        with self._conn:
+            self._conn.execute(
+                "UPDATE chunks SET text = '', vector = NULL "
+                "WHERE id IN (SELECT value FROM json_each(?)) AND deleted = 1",
+                (json.dumps([int(i) for i in ids]),),
+            )
+
+    def get_checkpoint(self) -> Optional[int]:
+        """Labels below this value are contained in the saved index file."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'checkpoint'"
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def set_checkpoint(self, count: int) -> None:
+        """Record that the saved index file covers labels below ``count``."""
+        with self._conn:
+            self._conn.execute(
+                "REPLACE INTO meta(key, value) VALUES('checkpoint', ?)", (count,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
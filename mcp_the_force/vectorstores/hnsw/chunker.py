@@ -1,15 +1,199 @@
-"""Text chunking strategies for HNSW vector store."""
+"""Text chunking strategies for HNSW vector store.
 
-from typing import List
+Files are first cut at natural boundaries: function and class definitions in
+code, headings in markdown, blank lines elsewhere. Adjacent small sections
+are merged until a chunk reaches ``MIN_CHUNK_TOKENS``, and sections longer
+than ``MAX_CHUNK_TOKENS`` are split into overlapping windows, so every chunk
+fits the embedding model's input and tiny paragraphs do not each become a
+vector of their own.
 
+Token counts are estimated without loading the model. The embedding
+tokenizer splits on every punctuation mark (``_`` included) and breaks
+identifiers and numbers into word pieces, so the estimate counts each
+punctuation mark, every run of up to four letters (a new run starting at each
+capital) and every pair of digits as a token of its own. That overcounts
+plain prose and keeps code chunks within the model's input.
+"""
 
-def chunk_text_by_paragraph(text: str) -> List[str]:
-    """Simple paragraph-based chunking.
+import re
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import List, Optional, Tuple
+
+# paraphrase-MiniLM-L3-v2 truncates its input at 128 word pieces, two of which
+# are the [CLS] and [SEP] markers
+MAX_CHUNK_TOKENS = 120
+# Tokens repeated at the start of the next window when a section is split
+OVERLAP_TOKENS = 20
+# Sections are merged with their neighbours until a chunk has this many tokens
+MIN_CHUNK_TOKENS = 40
+
+_TOKEN_RE = re.compile(r"[A-Z]?[a-z]{1,4}|[A-Z]{1,4}|[0-9]{1,2}|\S")
+
+CODE_EXTENSIONS = {
+    ".py",
+    ".pyi",
+    ".js",
+    ".jsx",
+    ".mjs",
+    ".cjs",
+    ".ts",
+    ".tsx",
+    ".java",
+    ".kt",
+    ".kts",
+    ".scala",
+    ".go",
+    ".rs",
+    ".c",
+    ".h",
+    ".cc",
+    ".cpp",
+    ".hpp",
+    ".cs",
+    ".swift",
+    ".rb",
+    ".php",
+    ".lua",
+    ".sh",
+    ".bash",
+}
+MARKDOWN_EXTENSIONS = {".md", ".markdown", ".mdx", ".rst"}
+
+# A definition at the top level or one indentation level down (methods)
+_CODE_BOUNDARY_RE = re.compile(
+    r"^[ \t]{0,4}"
+    r"(?:(?:export|default|public|private|protected|internal|static|abstract|"
+    r"final|override|async|pub(?:\([^)]*\))?|unsafe|extern)\s+)*"
+    r"(?:def|class|function|func|fn|interface|struct|enum|trait|impl|module|"
+    r"type|object)\b",
+    re.MULTILINE,
+)
+_DECORATOR_RE = re.compile(r"^[ \t]*@")
+_MARKDOWN_BOUNDARY_RE = re.compile(
+    r"^(?:#{1,6}\s|\S.*\n(?:=+|-+)[ \t]*$)", re.MULTILINE
+)
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A piece of a file; ``text == content[start:end]``."""
+
+    text: str
+    start: int
+    end: int
+
+
+def count_tokens(text: str) -> int:
+    """Estimate how many tokens the embedding model sees for text.
+
+    The estimate is meant to stay above the real word piece count.
+    """
+    return len(_TOKEN_RE.findall(text))
+
+
+def chunk_text(
+    text: str,
+    path: Optional[str] = None,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    min_tokens: int = MIN_CHUNK_TOKENS,
+) -> List[Chunk]:
+    """Split text into token-bounded chunks along its natural boundaries.
 
     Args:
         text: Text to chunk
+        path: File path, used to pick code or markdown boundaries
+        max_tokens: Upper bound on the estimated tokens of a chunk
+        overlap_tokens: Tokens shared by consecutive windows of a split section
+        min_tokens: Neighbouring sections are merged until a chunk has this many
 
     Returns:
-        List of non-empty paragraphs
+        Non-empty chunks in file order, with character offsets into text
     """
-    return [chunk.strip() for chunk in text.split("\n\n") if chunk.strip()]
+    chunks: List[Chunk] = []
+    current: Optional[Tuple[int, int]] = None
+    current_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens
+        if current is not None:
+            chunks.append(_make_chunk(text, *current))
+        current, current_tokens = None, 0
+
+    for start, end in _sections(text, path):
+        tokens = count_tokens(text[start:end])
+        if tokens == 0:
+            continue
+        if tokens > max_tokens:
+            flush()
+            chunks.extend(_windows(text, start, end, max_tokens, overlap_tokens))
+            continue
+        if current is not None and (
+            current_tokens >= min_tokens or current_tokens + tokens > max_tokens
+        ):
+            flush()
+        if current is None:
+            current = (start, end)
+        else:
+            current = (current[0], end)
+        current_tokens += tokens
+    flush()
+
+    return [chunk for chunk in chunks if chunk.text]
+
+
+def _sections(text: str, path: Optional[str]) -> List[Tuple[int, int]]:
+    """Return ``[start, end)`` ranges that cover text, cut at boundaries."""
+    suffix = PurePath(path).suffix.lower() if path else ""
+    if suffix in CODE_EXTENSIONS:
+        cuts = _code_boundaries(text)
+    elif suffix in MARKDOWN_EXTENSIONS:
+        cuts = [m.start() for m in _MARKDOWN_BOUNDARY_RE.finditer(text)]
+    else:
+        cuts = [m.end() for m in _PARAGRAPH_RE.finditer(text)]
+
+    bounds = sorted({0, len(text), *cuts})
+    return list(zip(bounds, bounds[1:]))
+
+
+def _code_boundaries(text: str) -> List[int]:
+    """Offsets of lines starting a definition, moved up to its decorators."""
+    cuts = []
+    for match in _CODE_BOUNDARY_RE.finditer(text):
+        start = match.start()
+        # Keep decorators with the definition they belong to
+        while start > 0:
+            prev_start = text.rfind("\n", 0, start - 1) + 1
+            prev_line = text[prev_start : start - 1]
+            if not _DECORATOR_RE.match(prev_line):
+                break
+            start = prev_start
+        cuts.append(start)
+    return cuts
+
+
+def _windows(
+    text: str, start: int, end: int, max_tokens: int, overlap_tokens: int
+) -> List[Chunk]:
+    """Split ``text[start:end]`` into overlapping windows of max_tokens tokens."""
+    spans = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(text, start, end)]
+    step = max(max_tokens - overlap_tokens, 1)
+    windows = []
+    for first in range(0, len(spans), step):
+        last = min(first + max_tokens, len(spans)) - 1
+        windows.append(_make_chunk(text, spans[first][0], spans[last][1]))
+        if last == len(spans) - 1:
+            break
+    return windows
+
+
+def _make_chunk(text: str, start: int, end: int) -> Chunk:
+    """Build a chunk for ``text[start:end]`` without surrounding whitespace."""
+    piece = text[start:end]
+    stripped = piece.strip()
+    if not stripped:
+        return Chunk(text="", start=start, end=start)
+    start += len(piece) - len(piece.lstrip())
+    return Chunk(text=stripped, start=start, end=start + len(stripped))
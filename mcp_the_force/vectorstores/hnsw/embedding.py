@@ -1,64 +1,133 @@
 """Embedding model management for HNSW vector store."""
 
 import logging
+import sqlite3
+import threading
+from collections import OrderedDict
 from threading import Lock
-import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
 import numpy as np
 
+from .embedding_cache import EmbeddingCache, get_embedding_cache, text_key
+
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "paraphrase-MiniLM-L3-v2"
+
+# Vectors kept in memory (384 float32 values each, ~15MB at the limit)
+MEMORY_CACHE_SIZE = 10000
+
 # Global instance and lock for thread-safe lazy initialization
 _model = None
 _lock = Lock()
 
 
 class CachedEmbeddingModel:
-    """Wrapper that adds caching to sentence transformer model."""
-
-    def __init__(self, model):
-        self._model = model
-        # Simple LRU cache for embeddings (max 1000 entries)
-        self._cache = {}
-        self._cache_order = []
-        self._max_cache_size = 1000
-
-    def _get_cached_or_compute(self, text):
-        """Get embedding from cache or compute it."""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
+    """Wrapper that adds caching to sentence transformer model.
 
-        if text_hash in self._cache:
-            # Move to end (most recently used)
-            self._cache_order.remove(text_hash)
-            self._cache_order.append(text_hash)
-            return self._cache[text_hash]
-
-        # Compute embedding
-        embedding = self._model.encode(text, convert_to_numpy=True)
-
-        # Add to cache
-        self._cache[text_hash] = embedding
-        self._cache_order.append(text_hash)
+    Texts are keyed by content hash and looked up in an in-memory LRU, then
+    in the persistent embedding cache. Only the remaining distinct texts are
+    passed to the model, in a single batched ``encode`` call.
+    """
 
-        # Evict oldest if cache is full
+    def __init__(
+        self,
+        model,
+        model_name: str = MODEL_NAME,
+        max_cache_size: int = MEMORY_CACHE_SIZE,
+        persistent_cache: Callable[[], Optional[EmbeddingCache]] = get_embedding_cache,
+    ):
+        self._model = model
+        self._model_name = model_name
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._max_cache_size = max_cache_size
+        self._persistent_cache = persistent_cache
+        self._cache_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters since this model was created."""
+        with self._cache_lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU, evicting the least recently used entry."""
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
         if len(self._cache) > self._max_cache_size:
-            oldest = self._cache_order.pop(0)
-            del self._cache[oldest]
-
-        return embedding
+            self._cache.popitem(last=False)
+
+    def _encode_texts(self, texts: List[str], kwargs) -> np.ndarray:
+        """Embed texts, encoding each distinct uncached text once."""
+        keys = [text_key(text) for text in texts]
+        text_by_key = dict(zip(keys, texts))
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._cache_lock:
+            for key in text_by_key:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = cached
+            self.memory_hits += len(vectors)
+
+        missing = [key for key in text_by_key if key not in vectors]
+        persistent = self._persistent_cache() if missing else None
+        stored: Dict[str, np.ndarray] = {}
+        if persistent is not None:
+            try:
+                stored = persistent.get_many(self._model_name, missing)
+            except sqlite3.Error as e:
+                # The cache only saves inference; encode everything instead
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                persistent = None
+            vectors.update(stored)
+            missing = [key for key in missing if key not in stored]
+            with self._cache_lock:
+                self.disk_hits += len(stored)
+                for key, vector in stored.items():
+                    self._remember(key, vector)
+
+        new_vectors: List[Tuple[str, np.ndarray]] = []
+        if missing:
+            encoded = self._model.encode(
+                [text_by_key[key] for key in missing],
+                **{**kwargs, "convert_to_numpy": True},
+            )
+            new_vectors = list(zip(missing, encoded))
+            vectors.update(new_vectors)
+            with self._cache_lock:
+                self.misses += len(missing)
+                for key, vector in new_vectors:
+                    self._remember(key, vector)
+
+        if persistent is not None:
+            # New vectors and the refreshed hits go in one write
+            try:
+                persistent.put_many(self._model_name, new_vectors, touched=list(stored))
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache update failed: {e}")
+
+        return np.array([vectors[key] for key in keys])
 
     def encode(self, texts, **kwargs):
         """Encode texts with caching for individual strings."""
         # Handle single string
         if isinstance(texts, str):
-            return self._get_cached_or_compute(texts)
+            return self._encode_texts([texts], kwargs)[0]
 
-        # Handle list of strings - cache each individually
+        # Handle list of strings - duplicates and cached texts are not re-encoded
         if isinstance(texts, list) and all(isinstance(t, str) for t in texts):
-            results = []
-            for text in texts:
-                embedding = self._get_cached_or_compute(text)
-                results.append(embedding)
-            return np.array(results)
+            if not texts:
+                return self._model.encode(texts, **kwargs)
+            return self._encode_texts(texts, kwargs)
 
         # Fallback to original model for other cases
         return self._model.encode(texts, **kwargs)
@@ -84,9 +153,7 @@ def _load_sentence_transformer():
     # Check if we should run in offline mode
     offline_mode = os.environ.get("HF_HUB_OFFLINE", "0") == "1"
 
-    model = SentenceTransformer(
-        "paraphrase-MiniLM-L3-v2", local_files_only=offline_mode
-    )
+    model = SentenceTransformer(MODEL_NAME, local_files_only=offline_mode)
     logger.info("HNSW embedding model loaded successfully")
 
     return model
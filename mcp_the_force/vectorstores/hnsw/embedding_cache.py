@@ -0,0 +1,129 @@
+"""Persistent embedding cache for the HNSW vector store.
+
+Vectors are keyed by (model, content hash) so re-indexing chunks that were
+already embedded, in this or an earlier process, costs a lookup instead of
+model inference.
+"""
+
+import json
+import time
+import sqlite3
+import random
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ...config import get_settings
+from ...sqlite_base_cache import BaseSQLiteCache, SharedCache
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text: str) -> str:
+    """Content hash used to key cached embeddings."""
+    return hashlib.blake2b(
+        text.encode("utf-8", errors="ignore"), digest_size=16
+    ).hexdigest()
+
+
+class EmbeddingCache(BaseSQLiteCache):
+    """SQLite-backed embedding vectors stored as float32 blobs."""
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[int] = None):
+        settings = get_settings()
+        if db_path is None:
+            db_path = settings.session.db_path
+        if ttl is None:
+            ttl = settings.session.ttl_seconds
+
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            model TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (model, text_hash)
+        ) WITHOUT ROWID
+        """
+
+        super().__init__(
+            db_path=db_path,
+            ttl=ttl,
+            table_name="embedding_cache",
+            create_table_sql=create_table_sql,
+            purge_probability=settings.session.cleanup_probability,
+        )
+
+    def get_many(self, model: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up the stored vectors for the given content hashes."""
+        if self._conn is None or not keys:
+            return {}
+
+        def _select(conn: sqlite3.Connection) -> List[Tuple[str, bytes]]:
+            return conn.execute(
+                "SELECT text_hash, vector FROM embedding_cache WHERE model = ? "
+                "AND text_hash IN (SELECT value FROM json_each(?))",
+                (model, json.dumps(keys)),
+            ).fetchall()
+
+        rows = self._read(_select)
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+
+    def put_many(
+        self,
+        model: str,
+        items: Iterable[Tuple[str, np.ndarray]],
+        touched: Iterable[str] = (),
+    ) -> None:
+        """Store vectors for content hashes.
+
+        Args:
+            model: Model the vectors were produced by
+            items: (content hash, vector) pairs to store
+            touched: Content hashes served from the cache; their rows get a
+                fresh ``updated_at`` in the same write so TTL cleanup keeps
+                vectors that are still in use
+        """
+        if self._conn is None:
+            return
+        now = int(time.time())
+        rows = [
+            (model, key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items
+        ]
+        touched = list(touched)
+        if not rows and not touched:
+            return
+
+        def _write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "REPLACE INTO embedding_cache(model, text_hash, vector, updated_at) "
+                "VALUES(?, ?, ?, ?)",
+                rows,
+            )
+            if touched:
+                conn.execute(
+                    "UPDATE embedding_cache SET updated_at = ? WHERE model = ? "
+                    "AND text_hash IN (SELECT value FROM json_each(?))",
+                    (now, model, json.dumps(touched)),
+                )
+            if random.random() < self.purge_probability:
+                conn.execute(
+                    "DELETE FROM embedding_cache WHERE updated_at < ?",
+                    (now - self.ttl,),
+                )
+
+        self._transaction(_write)
+
+
+_shared = SharedCache(EmbeddingCache, "Embedding cache")
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the shared embedding cache, or None if disabled or unavailable."""
+    settings = get_settings()
+    if not settings.vector_stores.persist_embeddings:
+        return None
+    return _shared.get(settings.session.db_path)
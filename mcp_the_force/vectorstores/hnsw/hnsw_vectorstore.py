@@ -2,17 +2,44 @@
 
 import asyncio
 import json
+import logging
 import os
+import sqlite3
 import uuid
 import numpy as np
 from pathlib import Path
-from typing import Sequence, Dict, Any, Optional, List, Callable, Protocol
+from typing import (
+    Sequence,
+    Dict,
+    Any,
+    Optional,
+    List,
+    Callable,
+    Protocol,
+    Set,
+    Tuple,
+)
 from threading import Lock
 
 from ..protocol import VectorStore, VectorStoreClient, VSFile, SearchResult
 from ..errors import VectorStoreError
 from .embedding import get_embedding_model, get_embedding_dimensions
-from .chunker import chunk_text_by_paragraph
+from .chunker import chunk_text
+from .chunk_store import ChunkStore
+
+logger = logging.getLogger(__name__)
+
+# The HNSW graph is checkpointed once this many chunks (or this fraction of
+# the checkpointed ones, whichever is larger) were appended since the last
+# checkpoint. Chunks appended in between are rebuilt from the chunk store.
+CHECKPOINT_MIN_PENDING = 1000
+CHECKPOINT_RATIO = 0.25
+
+# Deleted chunks stay in the HNSW graph as tombstones until this many (and
+# at least this fraction of the graph) have accumulated; the graph is then
+# rebuilt from the live vectors in the background.
+COMPACTION_MIN_TOMBSTONES = 100
+COMPACTION_RATIO = 0.3
 
 
 # Persistence directory is computed lazily to ensure correct working directory
@@ -32,6 +59,7 @@ class IndexProtocol(Protocol):
     ) -> tuple[List[List[int]], List[List[float]]]: ...
     def save_index(self, path: str) -> None: ...
     def load_index(self, path: str, max_elements: int) -> None: ...
+    def mark_deleted(self, label: int) -> None: ...
 
 
 def _default_index_factory(dim: int) -> IndexProtocol:  # pragma: no cover
@@ -58,7 +86,11 @@ class HnswVectorStore(VectorStore):
         self._id = store_id
         self._provider = "hnsw"
         self._index: Optional[IndexProtocol] = None
-        self._doc_chunks: List[Dict[str, str]] = []  # {'text': str, 'source': str}
+        self._chunks: Optional[ChunkStore] = None
+        self._count = 0  # Labels allocated so far
+        self._checkpoint_count = 0  # Labels covered by the saved index file
+        self._tombstones: Set[int] = set()  # Deleted labels still in the index
+        self._compaction_task: Optional[asyncio.Task[None]] = None
         self._lock = Lock()
         self._index_factory = index_factory
         self._persist = persist
@@ -87,15 +119,24 @@ class HnswVectorStore(VectorStore):
         # Process files and prepare chunks outside the lock
         all_chunks = []
         all_metadata = []
+        file_ids = []
 
         for file in files:
-            # Chunk the file content
-            chunks = chunk_text_by_paragraph(file.content)
-
-            # Store metadata for each chunk
-            for chunk in chunks:
-                all_chunks.append(chunk)
-                all_metadata.append({"text": chunk, "source": file.path})
+            file_id = f"file_{uuid.uuid4().hex[:12]}"
+            file_ids.append(file_id)
+
+            # Chunk the file content along code/markdown boundaries
+            for chunk in chunk_text(file.content, file.path):
+                all_chunks.append(chunk.text)
+                all_metadata.append(
+                    {
+                        "text": chunk.text,
+                        "source": file.path,
+                        "file_id": file_id,
+                        "start": chunk.start,
+                        "end": chunk.end,
+                    }
+                )
 
         if not all_chunks:
             return []
@@ -115,6 +156,8 @@ class HnswVectorStore(VectorStore):
 
         # Now acquire the lock for index operations
         with self._lock:
+            chunk_store = self._open_chunks()
+
             # Lazy initialize the index
             if self._index is None:
                 self._index = self._index_factory(get_embedding_dimensions())
@@ -123,7 +166,7 @@ class HnswVectorStore(VectorStore):
                 )
 
             # Check if we need to resize the index
-            current_count = len(self._doc_chunks)
+            current_count = self._count
             new_count = current_count + len(all_chunks)
 
             if new_count > self._max_elements:
@@ -135,25 +178,25 @@ class HnswVectorStore(VectorStore):
                     self._max_elements = new_max
                 except AttributeError:
                     # If resize is not supported (e.g., in tests), log warning
-                    import logging
-
-                    logging.warning(
+                    logger.warning(
                         f"Index resize not supported, may hit capacity limit at {self._max_elements} elements"
                     )
 
-            # Add to index
+            # Append metadata and vectors first so the chunks survive a
+            # restart even before the next index checkpoint
             start_idx = current_count
+            try:
+                chunk_store.append(start_idx, all_metadata, embeddings)
+            except sqlite3.Error as e:
+                raise VectorStoreError(f"Failed to save chunk metadata: {e}") from e
+
+            # Add to index
             indices = list(range(start_idx, start_idx + len(all_chunks)))
             self._index.add_items(embeddings, indices)
+            self._count = new_count
 
-            # Store metadata
-            self._doc_chunks.extend(all_metadata)
-
-            # Return file IDs (using indices as IDs for now)
-            file_ids = [f"file_{i}" for i in range(len(files))]
-
-            # Save to disk if persistence is enabled
-            if self._persist:
+            # Checkpoint the index once enough chunks are pending
+            if self._persist and self._checkpoint_due():
                 self._save()
 
             return file_ids
@@ -161,13 +204,25 @@ class HnswVectorStore(VectorStore):
     async def delete_files(self, file_ids: Sequence[str]) -> None:
         """Delete files from the vector store.
 
-        Note: HNSW doesn't support deletion of individual vectors efficiently.
-        This is a limitation of the underlying library. For now, this is a no-op.
-        A full implementation would require rebuilding the entire index.
+        The files' chunks are tombstoned in the chunk store and marked deleted
+        in the HNSW graph, which keeps them out of search results. Once enough
+        tombstones accumulate, the graph is compacted in the background.
         """
-        # TODO: Implement proper deletion by rebuilding index without deleted items
-        # For now, we acknowledge the limitation
-        pass
+        if not file_ids:
+            return
+
+        with self._lock:
+            chunk_store = self._open_chunks()
+            try:
+                labels = chunk_store.mark_deleted(file_ids)
+            except sqlite3.Error as e:
+                raise VectorStoreError(f"Failed to delete chunks: {e}") from e
+            if self._index is not None:
+                self._mark_deleted_in_index(labels)
+            compact = self._compaction_due()
+
+        if compact and (self._compaction_task is None or self._compaction_task.done()):
+            self._compaction_task = asyncio.create_task(self.compact())
 
     async def search(
         self, query: str, k: int = 20, filter: Optional[Dict[str, Any]] = None
@@ -187,37 +242,161 @@ class HnswVectorStore(VectorStore):
             ),
         )
 
-        # 2. Query the HNSW index
-        # This is a blocking CPU-bound call, so run in an executor
-        with self._lock:
-            if not self._index:  # Additional safety check
-                return []
-            # Capture index reference to avoid mypy union type issues
-            index = self._index
-            labels, distances = await loop.run_in_executor(
-                None,
-                lambda: index.knn_query(
-                    query_vector, k=min(k, index.get_current_count())
-                ),
-            )
+        # 2. Query the HNSW index and fetch the returned chunks
+        # This is a blocking CPU-bound call, so run it in an executor; the
+        # lock is taken there, as add_files may resize the graph in place
+        found = await loop.run_in_executor(None, self._query, query_vector, k)
+        if found is None:
+            return []
+        labels, distances, chunks = found
 
-        # 3. Map the resulting labels (IDs) back to the stored chunks
         results = []
         for i, label in enumerate(labels[0]):
-            chunk_meta = self._doc_chunks[label]
+            # Deleted chunks are not returned by the chunk store
+            chunk_meta = chunks.get(int(label))
+            if chunk_meta is None:
+                continue
+            metadata: Dict[str, Any] = {"source": chunk_meta["source"]}
+            if chunk_meta["start"] is not None:
+                metadata["start_offset"] = chunk_meta["start"]
+                metadata["end_offset"] = chunk_meta["end"]
             results.append(
                 SearchResult(
                     file_id=str(label),  # The index in our metadata list
                     content=chunk_meta["text"],
                     score=1.0 - distances[0][i],  # Convert distance to similarity score
-                    metadata={"source": chunk_meta["source"]},
+                    metadata=metadata,
                 )
             )
         return results
 
-    def _save(self) -> None:
-        """Save the index and metadata to disk atomically."""
-        # Ensure the persistence directory exists
+    def _query(
+        self, query_vector: np.ndarray, k: int
+    ) -> Optional[Tuple[List[List[int]], List[List[float]], Dict[int, Dict[str, Any]]]]:
+        """Run a knn query and fetch the live chunks it returned.
+
+        Blocking; holds the lock for the whole query.
+        """
+        with self._lock:
+            if not self._index:
+                return None
+            live_count = self._index.get_current_count() - len(self._tombstones)
+            if live_count <= 0:
+                return None
+            labels, distances = self._index.knn_query(
+                query_vector, k=min(k, live_count)
+            )
+            chunks = self._open_chunks().get([int(label) for label in labels[0]])
+        return labels, distances, chunks
+
+    async def compact(self) -> None:
+        """Rebuild the HNSW graph without deleted chunks.
+
+        The new graph is built from the live vectors in the chunk store
+        without holding the lock; chunks added or deleted meanwhile are
+        applied to it before it replaces the current graph. All of it runs
+        in an executor so the event loop never waits for the lock.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._compact)
+
+    def _compact(self) -> None:
+        """Blocking body of compact()."""
+        with self._lock:
+            if self._index is None or not self._tombstones:
+                return
+            chunk_store = self._open_chunks()
+            watermark = self._count
+            compacted = set(self._tombstones)
+            ids, vectors = chunk_store.vectors_from(
+                0, get_embedding_dimensions(), end_id=watermark
+            )
+
+        max_elements = max(len(ids) * 2, 10000)
+
+        new_index = self._index_factory(get_embedding_dimensions())
+        new_index.init_index(max_elements=max_elements, ef_construction=200, M=16)
+        if ids:
+            new_index.add_items(vectors, ids)
+
+        with self._lock:
+            # Catch up with chunks added while the graph was being built
+            new_ids, new_vectors = chunk_store.vectors_from(
+                watermark, get_embedding_dimensions()
+            )
+            if new_ids:
+                if len(ids) + len(new_ids) > max_elements:
+                    max_elements = (len(ids) + len(new_ids)) * 2
+                    new_index.resize_index(max_elements)  # type: ignore[attr-defined]
+                new_index.add_items(new_vectors, new_ids)
+
+            # Chunks deleted meanwhile are still tombstones in the new graph
+            remaining = {
+                label for label in self._tombstones - compacted if label < watermark
+            }
+            for label in remaining:
+                new_index.mark_deleted(label)
+            if hasattr(new_index, "set_ef"):
+                new_index.set_ef(50)
+
+            self._index = new_index
+            self._max_elements = max_elements
+            self._tombstones = remaining
+            if self._persist:
+                self._save()
+            chunk_store.purge(
+                [
+                    label
+                    for label in chunk_store.tombstones()
+                    if label < watermark and label not in remaining
+                ]
+            )
+
+        logger.info(
+            f"Compacted HNSW store {self._id}: dropped {len(compacted)} deleted chunks"
+        )
+
+    def _migrate_legacy_chunks(self, chunks: List[Dict[str, str]]) -> None:
+        """Move chunks from an old JSON metadata file into the chunk store.
+
+        Vectors are copied out of the loaded graph so the chunks can take
+        part in compaction like any other.
+        """
+        assert self._index is not None and self._chunks is not None
+        vectors = None
+        get_items = getattr(self._index, "get_items", None)
+        if get_items is not None and chunks:
+            vectors = np.asarray(get_items(list(range(len(chunks)))))
+        self._chunks.append(0, chunks, vectors)
+        self._chunks.set_checkpoint(len(chunks))
+        logger.info(f"Migrated {len(chunks)} chunks of {self._id} to a chunk store")
+
+    def _mark_deleted_in_index(self, labels: Sequence[int]) -> None:
+        """Mark labels deleted in the graph, skipping ones it does not hold.
+
+        Must be called with the lock held and an index present.
+        """
+        assert self._index is not None
+        for label in labels:
+            try:
+                self._index.mark_deleted(label)
+            except RuntimeError as e:
+                # hnswlib raises for labels already marked in a saved graph
+                # and for labels it does not hold (compacted or not replayed)
+                if "already deleted" not in str(e):
+                    continue
+            self._tombstones.add(label)
+
+    def _compaction_due(self) -> bool:
+        """Whether enough of the graph consists of deleted chunks."""
+        if self._index is None or len(self._tombstones) < COMPACTION_MIN_TOMBSTONES:
+            return False
+        return (
+            len(self._tombstones) >= self._index.get_current_count() * COMPACTION_RATIO
+        )
+
+    def _ensure_persistence_dir(self) -> None:
+        """Create the persistence directory if needed."""
         try:
             self.client.persistence_dir.mkdir(parents=True, exist_ok=True)
         except (PermissionError, OSError) as e:
@@ -225,18 +404,49 @@ class HnswVectorStore(VectorStore):
                 f"Cannot create persistence directory {self.client.persistence_dir}: {e}"
             ) from e
 
+    def _open_chunks(self) -> ChunkStore:
+        """Open the chunk store on first use (in memory when not persisting).
+
+        Must be called with the lock held.
+        """
+        if self._chunks is None:
+            path = None
+            if self._persist:
+                self._ensure_persistence_dir()
+                path = self.client.chunks_path(self._id)
+            try:
+                self._chunks = ChunkStore(path)
+            except sqlite3.Error as e:
+                raise VectorStoreError(
+                    f"Failed to open chunk store for {self._id}: {e}"
+                ) from e
+        return self._chunks
+
+    def _checkpoint_due(self) -> bool:
+        """Whether enough chunks were appended since the last index checkpoint."""
+        pending = self._count - self._checkpoint_count
+        return pending >= max(
+            CHECKPOINT_MIN_PENDING, int(self._checkpoint_count * CHECKPOINT_RATIO)
+        )
+
+    def _save(self) -> None:
+        """Checkpoint the HNSW index to disk atomically.
+
+        Chunk metadata is appended to the chunk store as files are added, so
+        only the index file is written here.
+        """
+        self._ensure_persistence_dir()
+
         index_path = self.client.persistence_dir / f"{self._id}.bin"
-        meta_path = self.client.persistence_dir / f"{self._id}.json"
 
         # Note: This method should only be called when the lock is already held
         # by the calling method (e.g., add_files), so we don't acquire it here
         if not self._index:
             return
 
-        # Write to temporary files first for atomicity
+        # Write to a temporary file first for atomicity
         # Note: with_suffix replaces the ENTIRE suffix, so we need to be careful
         index_tmp = self.client.persistence_dir / f"{self._id}.bin.tmp"
-        meta_tmp = self.client.persistence_dir / f"{self._id}.json.tmp"
 
         try:
             # Save the HNSW index
@@ -246,33 +456,20 @@ class HnswVectorStore(VectorStore):
             raise VectorStoreError(f"Failed to save HNSW index: {e}") from e
 
         try:
-            # Save the metadata
-            import logging
-
-            logging.debug(
-                f"Saving metadata to {meta_tmp}, doc_chunks={len(self._doc_chunks)}"
-            )
-            with open(meta_tmp, "w") as f:
-                json.dump(self._doc_chunks, f)
-            logging.debug(f"Metadata saved, file exists: {meta_tmp.exists()}")
-        except (OSError, PermissionError) as e:
-            # Clean up both temp files
-            index_tmp.unlink(missing_ok=True)
-            meta_tmp.unlink(missing_ok=True)
-            raise VectorStoreError(f"Failed to save metadata: {e}") from e
-
-        try:
-            # Atomically move the files
+            # Atomically move the file
             os.rename(str(index_tmp), str(index_path))
-            os.rename(str(meta_tmp), str(meta_path))
         except (OSError, PermissionError) as e:
-            # Clean up temp files on error
+            # Clean up temp file on error
             index_tmp.unlink(missing_ok=True)
-            meta_tmp.unlink(missing_ok=True)
             raise VectorStoreError(
                 f"Failed to move files to final location: {e}"
             ) from e
 
+        self._checkpoint_count = self._count
+        if self._chunks is not None:
+            self._chunks.set_checkpoint(self._count)
+        logger.debug(f"Checkpointed HNSW index {self._id} at {self._count} chunks")
+
 
 class HnswVectorStoreClient(VectorStoreClient):
     """Client for creating and managing HNSW vector stores."""
@@ -294,6 +491,10 @@ class HnswVectorStoreClient(VectorStoreClient):
         """Provider name."""
         return self._provider
 
+    def chunks_path(self, store_id: str) -> Path:
+        """Path of the chunk metadata database for a store."""
+        return self.persistence_dir / f"{store_id}.chunks.sqlite3"
+
     async def create(self, name: str, ttl_seconds: Optional[int] = None) -> VectorStore:
         """Create a new vector store."""
         store_id = f"hnsw_{uuid.uuid4().hex[:8]}"
@@ -312,16 +513,24 @@ class HnswVectorStoreClient(VectorStoreClient):
             store._index.init_index(
                 max_elements=store._max_elements, ef_construction=200, M=16
             )
+            store._open_chunks()
             store._save()
 
         return store
 
     async def get(self, store_id: str) -> VectorStore:
-        """Get an existing vector store."""
+        """Get an existing vector store.
+
+        Chunk text stays in the chunk store and is read per search hit; only
+        the index file and the vectors appended since its last checkpoint are
+        loaded here. Stores written with the older JSON metadata file are
+        migrated to a chunk store on first load.
+        """
         index_path = self.persistence_dir / f"{store_id}.bin"
         meta_path = self.persistence_dir / f"{store_id}.json"
+        chunks_path = self.chunks_path(store_id)
 
-        if not index_path.exists() or not meta_path.exists():
+        if not index_path.exists() or not (chunks_path.exists() or meta_path.exists()):
             raise VectorStoreError(f"Store with ID {store_id} not found on disk.")
 
         # Create a new store instance to populate
@@ -333,28 +542,21 @@ class HnswVectorStoreClient(VectorStoreClient):
         )
 
         try:
-            # Load metadata
-            try:
-                with open(meta_path, "r") as f:
-                    store._doc_chunks = json.load(f)
-            except FileNotFoundError:
-                raise VectorStoreError(f"Metadata file not found for store {store_id}")
-            except PermissionError as e:
-                raise VectorStoreError(
-                    f"Permission denied reading metadata for store {store_id}: {e}"
-                ) from e
-            except json.JSONDecodeError as e:
-                raise VectorStoreError(
-                    f"Corrupted metadata file for store {store_id}: {e}"
-                ) from e
+            legacy_chunks: List[Dict[str, str]] = []
+            migrate = not chunks_path.exists()
+            if migrate:
+                legacy_chunks = self._load_legacy_metadata(store_id, meta_path)
+
+            chunk_store = store._open_chunks()
+            migrate = migrate and chunk_store.count() == 0
+            store._count = len(legacy_chunks) if migrate else chunk_store.count()
 
             # Load HNSW index
-            if store._doc_chunks:  # Only load index if there are chunks
+            if store._count:  # Only load index if there are chunks
                 try:
                     store._index = store._index_factory(get_embedding_dimensions())
                     # Load with a larger max_elements to allow growth
-                    current_elements = len(store._doc_chunks)
-                    max_elements = max(current_elements * 2, 10000)
+                    max_elements = max(store._count * 2, 10000)
                     store._index.load_index(str(index_path), max_elements=max_elements)
                     store._max_elements = max_elements
                     # Set ef for better search performance
@@ -367,35 +569,75 @@ class HnswVectorStoreClient(VectorStoreClient):
                         f"Failed to load HNSW index for store {store_id}: {e}"
                     ) from e
 
+                if migrate:
+                    store._migrate_legacy_chunks(legacy_chunks)
+                    meta_path.unlink(missing_ok=True)
+
+                # Re-add chunks appended after the last checkpoint
+                checkpoint = chunk_store.get_checkpoint()
+                if checkpoint is None:
+                    checkpoint = store._index.get_current_count()
+                store._checkpoint_count = checkpoint
+                ids, vectors = chunk_store.vectors_from(
+                    checkpoint, get_embedding_dimensions()
+                )
+                if ids:
+                    store._index.add_items(vectors, ids)
+
+                # Re-apply deletions made after the last checkpoint
+                store._mark_deleted_in_index(chunk_store.tombstones())
+
             return store
         except VectorStoreError:
             # Re-raise our own errors
             raise
+        except sqlite3.Error as e:
+            raise VectorStoreError(
+                f"Failed to read chunk store for store {store_id}: {e}"
+            ) from e
         except Exception as e:
             # Catch any unexpected errors
             raise VectorStoreError(
                 f"Unexpected error loading store {store_id}: {e}"
             ) from e
 
+    @staticmethod
+    def _load_legacy_metadata(store_id: str, meta_path: Path) -> List[Dict[str, str]]:
+        """Read the JSON chunk list written by older versions."""
+        try:
+            with open(meta_path, "r") as f:
+                chunks: List[Dict[str, str]] = json.load(f)
+                return chunks
+        except FileNotFoundError:
+            raise VectorStoreError(f"Metadata file not found for store {store_id}")
+        except PermissionError as e:
+            raise VectorStoreError(
+                f"Permission denied reading metadata for store {store_id}: {e}"
+            ) from e
+        except json.JSONDecodeError as e:
+            raise VectorStoreError(
+                f"Corrupted metadata file for store {store_id}: {e}"
+            ) from e
+
     async def delete(self, store_id: str) -> None:
         """Delete a vector store and its associated files."""
-        index_path = self.persistence_dir / f"{store_id}.bin"
-        meta_path = self.persistence_dir / f"{store_id}.json"
+        chunks_path = self.chunks_path(store_id)
+        paths = [
+            self.persistence_dir / f"{store_id}.bin",
+            self.persistence_dir / f"{store_id}.json",
+            chunks_path,
+            chunks_path.with_name(chunks_path.name + "-wal"),
+            chunks_path.with_name(chunks_path.name + "-shm"),
+        ]
 
         # Delete files if they exist (no error if missing)
-        try:
-            if index_path.exists():
-                index_path.unlink()
-        except (OSError, PermissionError):
-            # Log but don't fail - best effort cleanup
-            pass
-
-        try:
-            if meta_path.exists():
-                meta_path.unlink()
-        except (OSError, PermissionError):
-            # Log but don't fail - best effort cleanup
-            pass
+        for path in paths:
+            try:
+                if path.exists():
+                    path.unlink()
+            except (OSError, PermissionError):
+                # Log but don't fail - best effort cleanup
+                pass
 
     async def close(self) -> None:
         """Close the client."""
@@ -1,16 +1,38 @@
 """In-memory vector store implementation for testing."""
 
+import heapq
+import math
+import re
 import uuid
-from typing import Dict, List, Sequence, Optional, Any, Tuple
+from collections import Counter
+from typing import Dict, List, Sequence, Optional, Any, Set, Tuple
 from datetime import datetime
 import asyncio
 
 from ..protocol import VectorStore, VSFile, SearchResult
 from ..errors import UnsupportedFeatureError
 
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+# Added to files that contain the whole query as a phrase
+_PHRASE_BONUS = 0.5
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split lowercase text into word tokens."""
+    return _TOKEN_RE.findall(text)
+
 
 class InMemoryVectorStore:
-    """In-memory vector store implementation."""
+    """In-memory vector store implementation.
+
+    Files are kept in an inverted index (term -> file_id -> term frequency)
+    and scored with BM25, so a query only touches the postings of its terms.
+    Metadata filters are answered from a (key, value) -> file_ids index.
+    """
 
     def __init__(
         self,
@@ -33,6 +55,13 @@ class InMemoryVectorStore:
         self._lock = asyncio.Lock()
         self._supports_filtering: Optional[bool] = None
 
+        # Search indexes
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> file_id -> tf
+        self._term_counts: Dict[str, Counter] = {}  # file_id -> term -> tf
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._metadata_index: Dict[Tuple[str, Any], Set[str]] = {}
+
         # TTL tracking
         self._created_at = datetime.now().timestamp()
         self._expires_at: Optional[float] = (
@@ -78,19 +107,103 @@ class InMemoryVectorStore:
             file_id = f"file_{self._file_id_counter}"
 
             # Store file
-            self._files[file_id] = (
-                file,
-                file.content.lower(),
-            )  # Store lowercase for search
+            content_lower = file.content.lower()  # Store lowercase for search
+            self._files[file_id] = (file, content_lower)
+            self._index_file(file_id, file, content_lower)
             file_ids.append(file_id)
 
         return file_ids
 
+    def _index_file(self, file_id: str, file: VSFile, content_lower: str) -> None:
+        """Add a file's terms and metadata to the search indexes."""
+        term_counts = Counter(_tokenize(content_lower))
+        for term, tf in term_counts.items():
+            self._postings.setdefault(term, {})[file_id] = tf
+        self._term_counts[file_id] = term_counts
+        length = sum(term_counts.values())
+        self._doc_lengths[file_id] = length
+        self._total_length += length
+
+        for key, value in (file.metadata or {}).items():
+            try:
+                self._metadata_index.setdefault((key, value), set()).add(file_id)
+            except TypeError:
+                # Unhashable values are matched by scanning in _filter_matches
+                continue
+
+    def _unindex_file(self, file_id: str, file: VSFile) -> None:
+        """Remove a file from the search indexes."""
+        for term in self._term_counts.pop(file_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(file_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(file_id, 0)
+
+        for key, value in (file.metadata or {}).items():
+            try:
+                file_ids = self._metadata_index.get((key, value))
+            except TypeError:
+                continue
+            if file_ids is not None:
+                file_ids.discard(file_id)
+                if not file_ids:
+                    del self._metadata_index[(key, value)]
+
     async def delete_files(self, file_ids: Sequence[str]) -> None:
         """Delete files from the store."""
         async with self._lock:
             for file_id in file_ids:
-                self._files.pop(file_id, None)
+                entry = self._files.pop(file_id, None)
+                if entry is not None:
+                    self._unindex_file(file_id, entry[0])
+
+    def _filter_matches(self, filter: Dict[str, Any]) -> Set[str]:
+        """Return the IDs of files whose metadata matches every filter item."""
+        matched: Optional[Set[str]] = None
+        unhashable: List[Tuple[str, Any]] = []
+        for key, value in filter.items():
+            try:
+                file_ids = self._metadata_index.get((key, value), set())
+            except TypeError:
+                unhashable.append((key, value))
+                continue
+            matched = set(file_ids) if matched is None else matched & file_ids
+            if not matched:
+                return set()
+
+        candidates = matched if matched is not None else set(self._files)
+        if unhashable:
+            candidates = {
+                file_id
+                for file_id in candidates
+                if self._metadata_has(file_id, unhashable)
+            }
+        return candidates
+
+    def _metadata_has(self, file_id: str, items: List[Tuple[str, Any]]) -> bool:
+        """Whether a file's metadata contains every (key, value) item."""
+        metadata = self._files[file_id][0].metadata or {}
+        return all(key in metadata and metadata[key] == value for key, value in items)
+
+    def _query_postings(self, term: str) -> Dict[str, int]:
+        """Return postings for a query term.
+
+        A term that is not a whole word in any file falls back to the words
+        containing it, so partial words still match as they did with
+        substring search. Only the vocabulary is scanned, not the files.
+        """
+        postings = self._postings.get(term)
+        if postings is not None:
+            return postings
+
+        merged: Dict[str, int] = {}
+        for word, word_postings in self._postings.items():
+            if term in word:
+                for file_id, tf in word_postings.items():
+                    merged[file_id] = merged.get(file_id, 0) + tf
+        return merged
 
     async def search(
         self, query: str, k: int = 20, filter: Optional[Dict[str, Any]] = None
@@ -100,72 +213,51 @@ class InMemoryVectorStore:
             raise UnsupportedFeatureError("Filtering not supported")
 
         async with self._lock:
-            results = []
-            query_lower = query.lower()
-            query_words = set(query_lower.split())
-
-            for file_id, (file, content_lower) in self._files.items():
-                # Apply metadata filter if provided
-                if filter:
-                    if not file.metadata:
-                        continue
-
-                    # Check all filter conditions
-                    match = True
-                    for key, value in filter.items():
-                        if key not in file.metadata or file.metadata[key] != value:
-                            match = False
-                            break
-
-                    if not match:
-                        continue
-
-                # Calculate relevance score
-                score = 0.0
-
-                # Check for substring match first
-                if query_lower in content_lower:
-                    # Count occurrences
-                    count = content_lower.count(query_lower)
-                    score = min(2.0, 1.0 + (count / 100.0))
-                else:
-                    # Word overlap scoring
-                    content_words = content_lower.split()
-                    content_word_set = set(content_words)
-                    overlap = len(query_words & content_word_set)
-
-                    if overlap == 0:
+            query_lower = query.lower().strip()
+            query_terms = set(_tokenize(query_lower))
+            if not query_terms or not self._files:
+                return []
+
+            allowed = self._filter_matches(filter) if filter else None
+            if allowed is not None and not allowed:
+                return []
+
+            # BM25 over the postings of the query terms
+            total_files = len(self._files)
+            avg_length = max(self._total_length / total_files, 1.0)
+            scores: Dict[str, float] = {}
+            for term in query_terms:
+                postings = self._query_postings(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (total_files - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for file_id, tf in postings.items():
+                    if allowed is not None and file_id not in allowed:
                         continue
-
-                    # Base score on overlap
-                    score = overlap / len(query_words)
-
-                    # Add bonus for exact phrase match
-                    if query_lower in content_lower:
-                        score += 0.5
-
-                    # Add bonus for term frequency
-                    for word in query_words:
-                        count = content_words.count(word)
-                        if count > 1:
-                            score += 0.1 * (count - 1)  # Bonus for repeated words
-
-                # Add result if we have a score
-                if score > 0:
-                    results.append(
-                        SearchResult(
-                            file_id=file_id,
-                            content=file.content,
-                            score=score,
-                            metadata=file.metadata or {},
-                        )
-                    )
-
-            # Sort by score descending
-            results.sort(key=lambda r: r.score, reverse=True)
-
-            # Return top k
-            return results[:k]
+                    length_ratio = self._doc_lengths[file_id] / avg_length
+                    norm = _K1 * (1 - _B + _B * length_ratio)
+                    term_score = idf * tf * (_K1 + 1) / (tf + norm)
+                    scores[file_id] = scores.get(file_id, 0.0) + term_score
+
+            # Bonus for exact phrase matches, checked only on matched files
+            if len(query_terms) > 1:
+                for file_id in scores:
+                    if query_lower in self._files[file_id][1]:
+                        scores[file_id] += _PHRASE_BONUS
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                SearchResult(
+                    file_id=file_id,
+                    content=self._files[file_id][0].content,
+                    score=score,
+                    metadata=self._files[file_id][0].metadata or {},
+                )
+                for file_id, score in top
+                if score > 0
+            ]
 
 
 class InMemoryClient:
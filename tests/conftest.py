@@ -140,6 +140,16 @@ def isolate_test_databases(tmp_path, monkeypatch):
         except Exception:
             pass  # Ignore errors during cleanup
 
+        # Shared caches hold connections to this test's redirected database
+        from mcp_the_force.utils import file_index, token_cache
+        from mcp_the_force.vectorstores.hnsw import embedding_cache
+
+        for module in (token_cache, file_index, embedding_cache):
+            try:
+                module._shared.close()
+            except Exception:
+                pass  # Ignore errors during cleanup
+
     finally:
         # Remove test databases - tmp_path is automatically cleaned up by pytest
         # but we can be explicit about it
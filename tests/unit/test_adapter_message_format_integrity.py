@@ -8,6 +8,9 @@ as they flow through the adapter system, preventing issues like:
 - Incorrect assumptions about message format
 """
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from typing import Dict, Any, List
@@ -369,6 +372,187 @@ async def test_tool_call_format_preservation():
             assert tool_result_msg["output"] == "Found 3 files"
 
 
+@pytest.mark.asyncio
+async def test_tool_calls_of_a_turn_run_concurrently():
+    """Test that a turn's tool calls overlap up to the limit and keep their order."""
+    adapter = MockTestAdapter()
+    adapter.capabilities.provider = "xai"
+
+    with (
+        patch("mcp_the_force.adapters.litellm_base.UnifiedSessionCache") as mock_cache,
+        patch("mcp_the_force.adapters.tool_dispatcher.get_settings") as mock_settings,
+    ):
+        mock_settings.return_value.xai.max_parallel_tool_exec = 2
+        with patch(
+            "mcp_the_force.adapters.litellm_base.aresponses", new_callable=AsyncMock
+        ) as mock_aresponses:
+            mock_cache.get_history = AsyncMock(return_value=[])
+            mock_cache.set_history = AsyncMock()
+
+            first_response = Mock()
+            # Mock(name=...) names the mock itself, so use plain objects
+            first_response.output = [
+                SimpleNamespace(
+                    type="function_call", name=name, call_id=f"call_{i}", arguments="{}"
+                )
+                for i, name in enumerate(["slow", "broken", "fast"])
+            ]
+            second_response = Mock()
+            second_response.output = [Mock(type="message", content=[Mock(text="Done")])]
+            mock_aresponses.side_effect = [first_response, second_response]
+
+            running = 0
+            peak = 0
+
+            async def execute(tool_name, tool_args, context):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.05 if tool_name == "slow" else 0.01)
+                running -= 1
+                if tool_name == "broken":
+                    raise RuntimeError("boom")
+                return f"{tool_name} result"
+
+            tool_dispatcher = Mock()
+            tool_dispatcher.get_tool_declarations.return_value = []
+            tool_dispatcher.execute = execute
+
+            await adapter.generate(
+                prompt="Run the tools",
+                params=TestParams(),
+                ctx=CallContext(session_id="s", project="p", tool="t"),
+                tool_dispatcher=tool_dispatcher,
+            )
+
+            assert peak == 2
+            second_call_messages = mock_aresponses.call_args_list[1][1]["input"]
+            outputs = [
+                (msg["call_id"], msg["output"])
+                for msg in second_call_messages
+                if msg.get("type") == "function_call_output"
+            ]
+            assert outputs == [
+                ("call_0", "slow result"),
+                ("call_1", "Error: boom"),
+                ("call_2", "fast result"),
+            ]
+
+
+def _tracking_execute(results: List[str]):
+    """Tool execute that records finished calls and peak concurrency."""
+    state = {"running": 0, "peak": 0}
+
+    async def execute(tool_name, tool_args, context):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.05 if tool_name == "slow" else 0.01)
+        state["running"] -= 1
+        if tool_name == "broken":
+            raise RuntimeError("boom")
+        results.append(tool_name)
+        return f"{tool_name} result"
+
+    return execute, state
+
+
+@pytest.mark.asyncio
+async def test_gemini_tool_calls_of_a_turn_run_concurrently():
+    """Test that the Gemini tool loop overlaps calls up to the limit in order."""
+    from google.genai import types
+
+    from mcp_the_force.adapters.google.adapter import GeminiAdapter
+
+    adapter = GeminiAdapter.__new__(GeminiAdapter)
+    adapter.model_name = "gemini-test"
+    adapter.capabilities = AdapterCapabilities(provider="google")
+
+    def response(*parts):
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(content=types.Content(role="model", parts=list(parts)))
+            ]
+        )
+
+    first = response(
+        *(
+            types.Part(
+                function_call=types.FunctionCall(id=f"call_{i}", name=name, args={})
+            )
+            for i, name in enumerate(["slow", "broken", "fast"])
+        )
+    )
+    client = Mock()
+    client.aio.models.generate_content = AsyncMock(
+        return_value=response(types.Part(text="Done"))
+    )
+    finished: List[str] = []
+    execute, state = _tracking_execute(finished)
+    tool_dispatcher = Mock()
+    tool_dispatcher.execute = execute
+
+    with patch("mcp_the_force.adapters.tool_dispatcher.get_settings") as mock_settings:
+        mock_settings.return_value.gemini.max_parallel_tool_exec = 2
+        contents: List[types.Content] = []
+        text, interactions = await adapter._handle_tool_loop(
+            client,
+            first,
+            contents,
+            types.GenerateContentConfig(),
+            tool_dispatcher,
+            CallContext(session_id="s", project="p", tool="t"),
+        )
+
+    assert text == "Done"
+    assert state["peak"] == 2
+    # "fast" finishes before "slow" but results keep the call order
+    assert finished == ["fast", "slow"]
+    outputs = [
+        (item["call_id"], item["output"])
+        for item in interactions
+        if item["type"] == "function_call_output"
+    ]
+    assert outputs == [
+        ("call_0", "slow result"),
+        ("call_1", "Error executing tool: boom"),
+        ("call_2", "fast result"),
+    ]
+    responses = contents[-1].parts
+    assert [part.function_response.id for part in responses] == [
+        "call_0",
+        "call_1",
+        "call_2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_is_bounded_and_ordered():
+    """Test that ToolDispatcher.execute_batch honours the limit and call order."""
+    from mcp_the_force.adapters.protocol import ToolCall
+    from mcp_the_force.adapters.tool_dispatcher import ToolDispatcher
+
+    dispatcher = ToolDispatcher.__new__(ToolDispatcher)
+    finished: List[str] = []
+    execute, state = _tracking_execute(finished)
+    dispatcher.execute = execute
+
+    results = await dispatcher.execute_batch(
+        [
+            ToolCall(tool_name=name, tool_args="{}", tool_call_id=f"call_{i}")
+            for i, name in enumerate(["slow", "broken", "fast"])
+        ],
+        CallContext(session_id="s", project="p", tool="t"),
+        limit=2,
+    )
+
+    assert state["peak"] == 2
+    assert results == [
+        "slow result",
+        "Error executing broken: boom",
+        "fast result",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_content_type_variations():
     """Test that different content types are handled correctly."""
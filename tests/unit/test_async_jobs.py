@@ -3,7 +3,7 @@ import uuid
 
 import pytest
 
-from mcp_the_force.jobs.queue import get_job_queue
+from mcp_the_force.jobs.queue import JobQueue, get_job_queue
 from mcp_the_force.jobs.worker import run_job_once
 from mcp_the_force.local_services.async_jobs_service import (
     StartJobService,
@@ -68,3 +68,47 @@ def test_cancel_job():
     asyncio.get_event_loop().run_until_complete(cancel_service.execute(job_id))
     job = asyncio.get_event_loop().run_until_complete(queue.get(job_id))
     assert job["status"] == "cancelled"
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    yield queue
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_never_share_a_job(job_queue):
+    for i in range(5):
+        await job_queue.enqueue(f"job{i}", "count_project_tokens", {"items": []})
+
+    claims = await asyncio.gather(*(job_queue.claim_next_pending() for _ in range(8)))
+    claimed = [c[0] for c in claims if c]
+    assert sorted(claimed) == [f"job{i}" for i in range(5)]
+    assert await job_queue.claim_next_pending() is None
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_excluded_tools(job_queue):
+    await job_queue.enqueue("busy", "chat_with_gpt52", {})
+    await job_queue.enqueue("free", "count_project_tokens", {})
+
+    claimed = await job_queue.claim_next_pending(exclude_tools={"chat_with_gpt52"})
+    assert claimed[0] == "free"
+    assert (await job_queue.get("busy"))["status"] == "pending"
+    assert await job_queue.claim("free") is None
+    assert (await job_queue.claim("busy"))[0] == "busy"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_wakes_waiting_worker(job_queue):
+    generation = job_queue.generation
+    waiter = asyncio.ensure_future(job_queue.wait_for_job(10, generation))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await job_queue.enqueue("job", "count_project_tokens", {})
+    await asyncio.wait_for(waiter, timeout=1)
+
+    # A notify between reading the generation and waiting is not lost
+    await asyncio.wait_for(job_queue.wait_for_job(10, generation), timeout=1)
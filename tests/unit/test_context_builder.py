@@ -9,9 +9,31 @@ from mcp_the_force.utils.context_builder import (
     sort_files_for_stable_list,
     build_context_with_stable_list,
 )
+from mcp_the_force.utils.context_loader import LoadedFile
 from mcp_the_force.utils.stable_list_cache import StableListCache
 
 
+def mock_read_and_count(files, count_tokens, stat=None):
+    """Stand-in for the read-and-count stage over a fake file system."""
+
+    async def _read_and_count(paths, max_tokens_kept=None):
+        result = {}
+        for path in dict.fromkeys(paths):
+            if path not in files:
+                continue
+            st = stat(path) if stat else None
+            result[path] = LoadedFile(
+                path,
+                files[path][0],
+                count_tokens(path),
+                st.st_size if st else len(files[path][0]),
+                st.st_mtime_ns if st else 0,
+            )
+        return result
+
+    return _read_and_count
+
+
 class TestDeterministicSorting:
     """Test deterministic file sorting for stable lists."""
 
@@ -141,8 +163,10 @@ class TestBuildContextWithStableList:
                         return token_map.get(path, 100)
 
                     with patch(
-                        "mcp_the_force.utils.context_builder.count_tokens_from_file",
-                        side_effect=mock_count_tokens_from_file,
+                        "mcp_the_force.utils.context_builder.read_and_count_async",
+                        side_effect=mock_read_and_count(
+                            files, mock_count_tokens_from_file
+                        ),
                     ):
                         (
                             inline_files,
@@ -360,8 +384,10 @@ class TestBuildContextWithStableList:
                         return token_map.get(path, 100)
 
                     with patch(
-                        "mcp_the_force.utils.context_builder.count_tokens_from_file",
-                        side_effect=mock_count_tokens_from_file,
+                        "mcp_the_force.utils.context_builder.read_and_count_async",
+                        side_effect=mock_read_and_count(
+                            files, mock_count_tokens_from_file
+                        ),
                     ):
                         (
                             inline_files,
@@ -440,8 +466,10 @@ class TestBuildContextWithStableList:
                     "os.path.getsize", side_effect=lambda p: mock_stat(p).st_size
                 ):
                     with patch(
-                        "mcp_the_force.utils.context_builder.count_tokens_from_file",
-                        side_effect=mock_count_tokens_from_file,
+                        "mcp_the_force.utils.context_builder.read_and_count_async",
+                        side_effect=mock_read_and_count(
+                            files, mock_count_tokens_from_file, mock_stat
+                        ),
                     ):
                         with patch(
                             "mcp_the_force.utils.context_builder.gather_file_paths_async",
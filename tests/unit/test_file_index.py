@@ -0,0 +1,187 @@
+"""Test the persistent file index behind gather_file_paths."""
+
+import os
+import shutil
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+from mcp_the_force.utils import fs
+from mcp_the_force.utils.file_index import FileIndexCache
+from mcp_the_force.utils.fs import gather_file_paths
+
+
+def _age(root, seconds=60):
+    """Push mtimes of everything under root into the past so the index trusts them."""
+    past = os.stat(root).st_mtime - seconds
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+def _make_tree(root):
+    (root / ".gitignore").write_text("*.log\n")
+    (root / "main.py").write_text("# main")
+    (root / "notes").write_text("plain text without extension")
+    (root / "debug.log").write_text("log data")
+    (root / "pkg").mkdir()
+    (root / "pkg" / "mod.py").write_text("x = 1")
+    (root / "pkg" / "blob").write_bytes(b"\x00\x01\x02")
+    (root / "pkg" / "sub").mkdir()
+    (root / "pkg" / "sub" / "deep.md").write_text("# deep")
+
+
+def test_unchanged_tree_is_served_from_index(tmp_path, monkeypatch):
+    """Test that a rescan of an unchanged tree neither lists nor sniffs files."""
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+    _age(project)
+
+    first = gather_file_paths([str(project)])
+    assert first == sorted(
+        str(project / p)
+        for p in [".gitignore", "main.py", "notes", "pkg/mod.py", "pkg/sub/deep.md"]
+    )
+
+    with (
+        patch.object(fs, "_is_text_file", wraps=fs._is_text_file) as sniff,
+        patch.object(fs.os, "scandir", wraps=os.scandir) as scandir,
+    ):
+        second = gather_file_paths([str(project)])
+        sniff.assert_not_called()
+        scandir.assert_not_called()
+
+    assert second == first
+
+
+def test_changes_are_picked_up(tmp_path, monkeypatch):
+    """Test that added, edited and removed entries are reflected on rescan."""
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+    _age(project)
+    gather_file_paths([str(project)])
+
+    # New file changes only the mtime of pkg/
+    (project / "pkg" / "new.py").write_text("y = 2")
+    # Extensionless file turning binary without a directory change
+    (project / "notes").write_bytes(b"\x00binary now")
+    # Removed directory
+    shutil.rmtree(project / "pkg" / "sub")
+
+    files = gather_file_paths([str(project)])
+    assert str(project / "pkg" / "new.py") in files
+    assert str(project / "notes") not in files
+    assert str(project / "pkg" / "sub" / "deep.md") not in files
+
+    with patch.object(fs, "get_file_index", return_value=None):
+        assert files == gather_file_paths([str(project)])
+
+
+def test_index_persists_and_drops_vanished_dirs(tmp_path):
+    """Test that records survive a restart and removed directories are pruned."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+    _age(project)
+
+    db_path = str(tmp_path / "index.sqlite3")
+    cache = FileIndexCache(db_path=db_path, ttl=3600)
+    with patch.object(fs, "get_file_index", return_value=cache):
+        list(fs._walk_text_files(project))
+    cache.close()
+
+    cache = FileIndexCache(db_path=db_path, ttl=3600)
+    records = cache.load(str(project))
+    assert set(records) == {
+        str(project),
+        str(project / "pkg"),
+        str(project / "pkg" / "sub"),
+    }
+    ignored = {f.name for f in records[str(project)].files if f.ignored}
+    assert ignored == {"debug.log"}
+    assert records[str(project)].gitignore == ["*.log"]
+
+    shutil.rmtree(project / "pkg" / "sub")
+    with patch.object(fs, "get_file_index", return_value=cache):
+        list(fs._walk_text_files(project))
+    assert str(project / "pkg" / "sub") not in cache.load(str(project))
+    cache.close()
+
+
+def test_edited_gitignore_invalidates_records(tmp_path, monkeypatch):
+    """Test that editing a .gitignore in place re-applies the rules below it."""
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+    _age(project)
+    assert str(project / "pkg" / "mod.py") in gather_file_paths([str(project)])
+
+    # Rewriting the file does not change the directory mtime
+    dir_mtime = os.stat(project).st_mtime_ns
+    (project / ".gitignore").write_text("*.log\npkg/\n")
+    os.utime(project, ns=(dir_mtime, dir_mtime))
+
+    files = gather_file_paths([str(project)])
+    assert str(project / "pkg" / "mod.py") not in files
+    assert str(project / "main.py") in files
+
+
+def test_walk_stops_at_the_total_size_limit(tmp_path, monkeypatch):
+    """Test that the size limit stops the walk without pruning the index."""
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+    _age(project)
+
+    cache = FileIndexCache(db_path=str(tmp_path / "index.sqlite3"), ttl=3600)
+    settings = MagicMock()
+    settings.mcp.max_file_size = 1024 * 1024
+    settings.mcp.max_total_size = 1
+    with (
+        patch.object(fs, "get_file_index", return_value=cache),
+        patch.object(fs, "get_settings", return_value=settings),
+    ):
+        with patch.object(fs, "_list_dir", wraps=fs._list_dir) as list_dir:
+            files = gather_file_paths([str(project)])
+        assert len(files) == 1
+        assert [call.args[0] for call in list_dir.call_args_list] == [project]
+
+        settings.mcp.max_total_size = 1024 * 1024
+        gather_file_paths([str(project)])
+        settings.mcp.max_total_size = 1
+        gather_file_paths([str(project)])
+
+    # Directories the stopped walk did not reach stay indexed
+    assert set(cache.load(str(project))) == {
+        str(project),
+        str(project / "pkg"),
+        str(project / "pkg" / "sub"),
+    }
+    cache.close()
+
+
+def test_sqlite_errors_fall_back_to_a_full_walk(tmp_path, monkeypatch):
+    """Test that an unusable index does not fail gather_file_paths."""
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_tree(project)
+
+    cache = FileIndexCache(db_path=str(tmp_path / "index.sqlite3"), ttl=3600)
+    locked = sqlite3.OperationalError("database is locked")
+    with (
+        patch.object(fs, "get_file_index", return_value=cache),
+        patch.object(cache, "_read", side_effect=locked),
+        patch.object(cache, "_transaction", side_effect=locked),
+    ):
+        files = gather_file_paths([str(project)])
+
+    with patch.object(fs, "get_file_index", return_value=None):
+        assert files == gather_file_paths([str(project)])
+    cache.close()
@@ -3,6 +3,8 @@ Unit tests for .gitignore functionality.
 Tests the patterns that our implementation supports.
 """
 
+from pathlib import Path
+
 from mcp_the_force.utils.fs import _parse_gitignore, _is_ignored
 
 
@@ -151,3 +153,99 @@ build/
         # Should not match
         assert not _is_ignored(tmp_path / "module.py", patterns, tmp_path)
         assert not _is_ignored(tmp_path / "foo_test.py", patterns, tmp_path)
+
+
+class TestCompiledMatcher:
+    """Test gitignore semantics beyond simple name globs."""
+
+    def test_anchored_patterns(self, tmp_path):
+        """Test that a leading or middle slash anchors to the .gitignore directory."""
+        patterns = ["/config.py", "docs/*.md"]
+
+        assert _is_ignored(tmp_path / "config.py", patterns, tmp_path)
+        assert not _is_ignored(tmp_path / "src" / "config.py", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "docs" / "guide.md", patterns, tmp_path)
+        # * does not cross directory boundaries
+        assert not _is_ignored(tmp_path / "docs" / "api" / "ref.md", patterns, tmp_path)
+        assert not _is_ignored(
+            tmp_path / "src" / "docs" / "guide.md", patterns, tmp_path
+        )
+
+    def test_double_star_patterns(self, tmp_path):
+        """Test ** as a leading, middle and trailing path component."""
+        patterns = ["**/fixtures/*.json", "logs/**", "a/**/z.txt"]
+
+        assert _is_ignored(tmp_path / "fixtures" / "x.json", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "t" / "fixtures" / "x.json", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "logs" / "2024" / "x.txt", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "a" / "z.txt", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "a" / "b" / "c" / "z.txt", patterns, tmp_path)
+        assert not _is_ignored(tmp_path / "b" / "z.txt", patterns, tmp_path)
+
+    def test_negation_last_match_wins(self, tmp_path):
+        """Test that ! re-includes files, but not inside ignored directories."""
+        patterns = ["*.log", "!keep.log", "build/", "!build/keep.txt"]
+
+        assert _is_ignored(tmp_path / "debug.log", patterns, tmp_path)
+        assert not _is_ignored(tmp_path / "keep.log", patterns, tmp_path)
+        assert not _is_ignored(tmp_path / "src" / "keep.log", patterns, tmp_path)
+        assert _is_ignored(tmp_path / "build" / "keep.txt", patterns, tmp_path)
+
+    def test_directory_only_patterns_skip_files(self, tmp_path):
+        """Test that a trailing slash only matches directories."""
+        patterns = ["cache/"]
+
+        assert _is_ignored(tmp_path / "cache" / "data.txt", patterns, tmp_path)
+        assert not _is_ignored(tmp_path / "cache", patterns, tmp_path)
+
+
+class TestNestedGitignore:
+    """Test .gitignore files found while walking a directory."""
+
+    def test_nested_gitignore_applies_to_its_subtree(self, tmp_path, monkeypatch):
+        """Test that nested files add rules and override parent rules."""
+        from mcp_the_force.utils.fs import gather_file_paths
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".gitignore").write_text("*.tmp\n")
+        (tmp_path / "a.tmp").write_text("x")
+        (tmp_path / "main.py").write_text("x")
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / ".gitignore").write_text("/generated.py\n!wanted.tmp\n")
+        (pkg / "generated.py").write_text("x")
+        (pkg / "wanted.tmp").write_text("x")
+        (pkg / "other.tmp").write_text("x")
+        (pkg / "sub").mkdir()
+        (pkg / "sub" / "generated.py").write_text("x")
+
+        files = gather_file_paths([str(tmp_path)])
+        rel = sorted(str(Path(f).relative_to(tmp_path)) for f in files)
+        assert rel == [
+            ".gitignore",
+            "main.py",
+            "pkg/.gitignore",
+            "pkg/sub/generated.py",
+            "pkg/wanted.tmp",
+        ]
+
+    def test_ignored_directories_are_pruned(self, tmp_path, monkeypatch):
+        """Test that the walk never lists an ignored directory."""
+        import os
+        from unittest.mock import patch
+
+        from mcp_the_force.utils import fs
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".gitignore").write_text("generated-assets/\n")
+        (tmp_path / "main.py").write_text("x")
+        assets = tmp_path / "generated-assets"
+        assets.mkdir()
+        (assets / "bundle.js").write_text("x")
+
+        with patch.object(fs.os, "scandir", wraps=os.scandir) as scandir:
+            files = fs.gather_file_paths([str(tmp_path)])
+
+        listed = [str(call.args[0]) for call in scandir.call_args_list]
+        assert str(assets) not in listed
+        assert str(assets / "bundle.js") not in files
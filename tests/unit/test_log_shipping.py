@@ -0,0 +1,105 @@
+"""
+Unit tests for batched VictoriaLogs shipping.
+"""
+
+import gzip
+import json
+import logging
+import time
+from unittest.mock import MagicMock
+
+from mcp_the_force.logging.handlers import (
+    BatchingQueueListener,
+    DropOldestQueue,
+    TimeoutLokiHandler,
+)
+
+
+def _make_handler(**kwargs):
+    handler = TimeoutLokiHandler(
+        "http://logs.example/insert/loki/api/v1/push",
+        tags={"app": "test"},
+        version="1",
+        **kwargs,
+    )
+    session = MagicMock()
+    session.post.return_value.status_code = 204
+    handler.emitter._session = session
+    return handler, session
+
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord("mcp_the_force.test", level, __file__, 1, msg, (), None)
+
+
+def _pushed_lines(session):
+    lines = []
+    for call in session.post.call_args_list:
+        assert call.kwargs["headers"]["Content-Encoding"] == "gzip"
+        payload = json.loads(gzip.decompress(call.kwargs["data"]))
+        for stream in payload["streams"]:
+            lines.extend(line for _, line in stream["values"])
+    return lines
+
+
+class TestDropOldestQueue:
+    def test_full_queue_drops_oldest(self):
+        q = DropOldestQueue(2)
+        for item in range(4):
+            q.put_nowait(item)
+
+        assert q.dropped == 2
+        assert [q.get_nowait(), q.get_nowait()] == [2, 3]
+
+
+class TestTimeoutLokiHandler:
+    def test_records_are_sent_in_batches(self):
+        handler, session = _make_handler(batch_size=3, max_batch_age=60)
+
+        for i in range(7):
+            handler.handle(_record(f"message {i}"))
+        assert session.post.call_count == 2
+
+        handler.flush()
+        assert session.post.call_count == 3
+        assert _pushed_lines(session) == [f"message {i}" for i in range(7)]
+
+    def test_levels_are_grouped_into_streams(self):
+        handler, session = _make_handler(batch_size=10, max_batch_age=60)
+
+        handler.handle(_record("info"))
+        handler.handle(_record("warning", logging.WARNING))
+        handler.flush()
+
+        payload = json.loads(gzip.decompress(session.post.call_args.kwargs["data"]))
+        levels = sorted(stream["stream"]["severity"] for stream in payload["streams"])
+        assert levels == ["info", "warning"]
+
+    def test_failed_batch_is_dropped_and_counted(self):
+        handler, session = _make_handler(batch_size=2, max_batch_age=60)
+        session.post.return_value.status_code = 500
+
+        handler.handle(_record("a"))
+        handler.handle(_record("b"))
+
+        assert handler.dropped == 2
+        handler.flush()
+        assert session.post.call_count == 1
+
+
+class TestBatchingQueueListener:
+    def test_stop_flushes_and_reports_drops(self):
+        handler, session = _make_handler(batch_size=100, max_batch_age=60)
+        log_queue = DropOldestQueue(3)
+        for i in range(5):
+            log_queue.put_nowait(_record(f"message {i}"))
+
+        listener = BatchingQueueListener(log_queue, handler, flush_interval=60)
+        listener.start()
+        while not log_queue.empty():
+            time.sleep(0.01)
+        listener.stop()
+
+        lines = _pushed_lines(session)
+        assert lines[:3] == ["message 2", "message 3", "message 4"]
+        assert "dropped 2 oldest records" in lines[-1]
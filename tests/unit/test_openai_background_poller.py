@@ -0,0 +1,103 @@
+"""Tests for the shared OpenAI background response poller."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from mcp_the_force.adapters.openai import poller as poller_module
+from mcp_the_force.adapters.openai.poller import (
+    BackgroundResponsePoller,
+    get_background_poller,
+    next_poll_interval,
+)
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(poller_module, "INITIAL_POLL_DELAY_SEC", 0.01)
+    monkeypatch.setattr(poller_module, "MAX_POLL_INTERVAL_SEC", 0.01)
+
+
+def _client(statuses):
+    """Client whose responses report the given statuses, one per poll."""
+    remaining = {rid: list(seq) for rid, seq in statuses.items()}
+    client = MagicMock()
+
+    async def retrieve(response_id):
+        seq = remaining[response_id]
+        status = seq.pop(0) if len(seq) > 1 else seq[0]
+        return SimpleNamespace(id=response_id, status=status)
+
+    client.responses.retrieve = MagicMock(side_effect=retrieve)
+    return client
+
+
+def test_interval_grows_with_elapsed_time_and_is_capped():
+    assert next_poll_interval(0, "in_progress") == pytest.approx(3.0, abs=0.2)
+    assert next_poll_interval(20, "in_progress") == pytest.approx(10.0, abs=0.2)
+    assert next_poll_interval(20, "queued") > next_poll_interval(20, "in_progress")
+    assert next_poll_interval(3600, "in_progress") == 30.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fast_polling")
+async def test_concurrent_responses_share_one_poller():
+    client = _client(
+        {
+            "resp_fast": ["in_progress", "completed"],
+            "resp_slow": ["queued", "in_progress", "in_progress", "completed"],
+        }
+    )
+    poller = get_background_poller(client)
+    assert get_background_poller(client) is poller
+
+    fast, slow = await asyncio.gather(
+        poller.wait("resp_fast", timeout=5),
+        poller.wait("resp_slow", timeout=5),
+    )
+
+    assert (fast.id, fast.status) == ("resp_fast", "completed")
+    assert (slow.id, slow.status) == ("resp_slow", "completed")
+    polled = [call.args[0] for call in client.responses.retrieve.call_args_list]
+    assert polled.count("resp_fast") == 2
+    assert polled.count("resp_slow") == 4
+    assert poller.outstanding == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fast_polling")
+async def test_failed_status_is_returned():
+    client = _client({"resp_1": ["in_progress", "failed"]})
+    job = await BackgroundResponsePoller(client).wait("resp_1", timeout=5)
+    assert job.status == "failed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fast_polling")
+async def test_retrieve_error_is_raised_to_waiter():
+    client = MagicMock()
+
+    async def retrieve(response_id):
+        raise RuntimeError("boom")
+
+    client.responses.retrieve = MagicMock(side_effect=retrieve)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await BackgroundResponsePoller(client).wait("resp_1", timeout=5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fast_polling")
+async def test_timeout_stops_polling_the_response():
+    client = _client({"resp_1": ["in_progress"]})
+    poller = BackgroundResponsePoller(client)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await poller.wait("resp_1", timeout=0.05)
+
+    assert poller.outstanding == 0
+    calls = client.responses.retrieve.call_count
+    await asyncio.sleep(0.05)
+    assert client.responses.retrieve.call_count == calls
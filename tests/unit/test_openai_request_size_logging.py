@@ -0,0 +1,50 @@
+"""Tests that OpenAI flows only tokenize requests for logging when needed."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_the_force.adapters.openai.flow import StreamingFlowStrategy
+
+API_PARAMS = {"input": "hello world", "instructions": "be brief"}
+
+
+@pytest.fixture
+def strategy():
+    context = MagicMock()
+    context.session_id = "test-session"
+    context.request.estimated_prompt_tokens = None
+    return StreamingFlowStrategy(context)
+
+
+def test_planned_prompt_tokens_are_reused(strategy, caplog):
+    strategy.context.request.estimated_prompt_tokens = 200_000
+    caplog.set_level(logging.DEBUG, logger="mcp_the_force.adapters.openai.flow")
+
+    with patch("mcp_the_force.utils.token_counter.count_tokens") as count_tokens:
+        strategy._log_request_size(API_PARAMS, "Streaming API request")
+
+    count_tokens.assert_not_called()
+    assert "200,000 planned prompt tokens" in caplog.text
+
+
+def test_request_is_not_tokenized_without_debug_logging(strategy, caplog):
+    caplog.set_level(logging.INFO, logger="mcp_the_force.adapters.openai.flow")
+
+    with patch("mcp_the_force.utils.token_counter.count_tokens") as count_tokens:
+        strategy._log_request_size(API_PARAMS, "Streaming API request")
+
+    count_tokens.assert_not_called()
+
+
+def test_request_is_tokenized_with_debug_logging(strategy, caplog):
+    caplog.set_level(logging.DEBUG, logger="mcp_the_force.adapters.openai.flow")
+
+    with patch(
+        "mcp_the_force.utils.token_counter.count_tokens", return_value=4
+    ) as count_tokens:
+        strategy._log_request_size(API_PARAMS, "Streaming API request")
+
+    count_tokens.assert_called_once_with(["hello world", "be brief"])
+    assert "Streaming API request with 4 tokens" in caplog.text
@@ -147,14 +147,18 @@ class TestTokenBudgetOptimizer:
             ) as mock_count_tokens,
         ):
             # Mock session history
-            mock_cache.get_history = AsyncMock(
-                return_value=[
-                    {"role": "user", "content": "Previous message 1"},
-                    {"role": "assistant", "content": "Previous response 1"},
-                ]
+            mock_cache.get_history_with_tokens = AsyncMock(
+                return_value=(
+                    [
+                        {"role": "user", "content": "Previous message 1"},
+                        {"role": "assistant", "content": "Previous response 1"},
+                    ],
+                    [250, 250],
+                    [240, 240],
+                )
             )
 
-            # Mock token counting for history (simulate 500 tokens)
+            # History tokens come from the cached per-message counts
             mock_count_tokens.return_value = 500
 
             # Mock context builder to return manageable files
@@ -185,7 +189,11 @@ class TestTokenBudgetOptimizer:
             assert len(plan.overflow_files) >= 0
             assert plan.optimized_prompt
             assert plan.messages
-            assert plan.total_prompt_tokens > 0
+            assert plan.total_prompt_tokens >= 500
+            # The final check counts the history's text, not its serialized size
+            assert plan.total_prompt_tokens == (
+                optimizer._count_new_message_tokens(plan.optimized_prompt) + 480
+            )
 
             # Verify session history was included in messages
             assert len(plan.messages) >= 3  # dev + history + user
@@ -211,7 +219,7 @@ class TestTokenBudgetOptimizer:
             ) as mock_tree,
         ):
             # Mock session history (empty)
-            mock_cache.get_history = AsyncMock(return_value=[])
+            mock_cache.get_history_with_tokens = AsyncMock(return_value=([], [], []))
 
             # Mock file gathering to return all files
             mock_gather.return_value = temp_files
@@ -300,7 +308,7 @@ class TestTokenBudgetOptimizer:
             ) as mock_cache,
         ):
             # Mock session history (empty)
-            mock_cache.get_history = AsyncMock(return_value=[])
+            mock_cache.get_history_with_tokens = AsyncMock(return_value=([], [], []))
 
             # Mock context with priority file
             mock_context.return_value = (
@@ -420,7 +428,7 @@ class TestTokenBudgetOptimizer:
             ) as mock_tree,
         ):
             # Mock session history (empty)
-            mock_cache.get_history = AsyncMock(return_value=[])
+            mock_cache.get_history_with_tokens = AsyncMock(return_value=([], [], []))
 
             # Mock file gathering to return all files
             mock_gather.return_value = temp_files
@@ -572,7 +580,9 @@ class TestOptimizationIntegration:
             with patch(
                 "mcp_the_force.unified_session_cache.unified_session_cache"
             ) as mock_cache:
-                mock_cache.get_history = AsyncMock(return_value=[])
+                mock_cache.get_history_with_tokens = AsyncMock(
+                    return_value=([], [], [])
+                )
 
                 optimizer = TokenBudgetOptimizer(
                     model_limit=2000,
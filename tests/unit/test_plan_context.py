@@ -0,0 +1,55 @@
+"""Tests for the plan_context dry-run service."""
+
+import pytest
+
+from mcp_the_force.local_services.plan_context import PlanContextService
+from mcp_the_force.utils.stable_list_cache import StableListCache
+
+
+@pytest.fixture
+def project(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "main.py").write_text("def main():\n    return 42\n")
+    (src / "util.py").write_text("VALUE = 'x' * 10\n")
+    return src
+
+
+@pytest.mark.asyncio
+async def test_plan_context_reports_plan_and_breakdown(project):
+    """Test that a dry run returns the plan with timings and I/O counters."""
+    service = PlanContextService()
+    result = await service.execute(context=[str(project)], instructions="Review")
+
+    inline = sorted(f["path"] for f in result["plan"]["inline_files"])
+    assert inline == [str(project / "main.py"), str(project / "util.py")]
+    assert result["plan"]["overflow_files"] == []
+    assert result["plan"]["total_prompt_tokens"] > 0
+
+    timings = result["timings_ms"]
+    for stage in ("session_history", "gather_files", "load_candidates", "total"):
+        assert timings[stage] >= 0
+    assert result["files_read"] >= 2
+    assert result["bytes_read"] >= sum(p.stat().st_size for p in project.iterdir())
+    assert result["tokens_counted"] > 0
+
+
+@pytest.mark.asyncio
+async def test_plan_context_does_not_record_the_plan(project):
+    """Test that dry runs leave the session's stable list untouched."""
+    service = PlanContextService()
+    await service.execute(context=[str(project)], session_id="dry-run-session")
+    second = await service.execute(context=[str(project)], session_id="dry-run-session")
+
+    assert await StableListCache().is_first_call("dry-run-session")
+    # The second run still plans a first call and counts files from the cache
+    assert second["plan"]["file_tree_included"]
+    assert second["token_cache"]["hits"] >= 2
+    assert second["token_cache"]["hit_rate"] is not None
+
+
+@pytest.mark.asyncio
+async def test_plan_context_requires_paths():
+    """Test that an empty request is rejected."""
+    with pytest.raises(ValueError):
+        await PlanContextService().execute(context=[])
@@ -276,3 +276,32 @@ class TestSanitizeCompleteConversation:
         # After second pass: same (no more function_calls to remove)
         assert first_pass == second_pass
         assert len(first_pass) == 1  # Only the message remains
+
+    def test_incremental_sanitization_skips_prefix(self):
+        """Only items after the sanitized prefix are processed."""
+        conversation = [{"type": "message", "role": "user", "content": "Hi"}]
+        sanitized = _sanitize_conversation_input(conversation)
+        assert sanitized == 1
+
+        # An item in the prefix is left alone when sanitizing from the offset
+        conversation[0]["content"] = None
+        conversation.extend(
+            [
+                {
+                    "type": "function_call",
+                    "call_id": "call_1",
+                    "name": "test",
+                    "arguments": None,
+                },
+                {"type": "function_call_output", "call_id": "call_1", "output": None},
+            ]
+        )
+        sanitized = _sanitize_conversation_input(conversation, sanitized)
+
+        assert sanitized == 2
+        assert conversation[0]["content"] is None
+        assert conversation[1] == {
+            "type": "function_call_output",
+            "call_id": "call_1",
+            "output": "",
+        }
@@ -0,0 +1,125 @@
+"""Tests for the persistent search result deduplicator."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from mcp_the_force.tools.search_dedup_sqlite import SQLiteSearchDeduplicator
+
+
+def _results(*contents):
+    return [{"content": content, "metadata": {}} for content in contents]
+
+
+@pytest.mark.asyncio
+async def test_results_are_deduplicated_per_session(tmp_path):
+    """Test that a session is not shown the same result twice."""
+    dedup = SQLiteSearchDeduplicator(tmp_path / "dedup.sqlite3")
+    try:
+        first, dupes = await dedup.deduplicate_results(
+            _results("a", "b", "a"), max_results=10, session_id="s1"
+        )
+        assert [r["content"] for r in first] == ["a", "b"]
+        assert dupes == 1
+
+        second, dupes = await dedup.deduplicate_results(
+            _results("b", "c"), max_results=10, session_id="s1"
+        )
+        assert [r["content"] for r in second] == ["c"]
+        assert dupes == 1
+
+        other, _ = await dedup.deduplicate_results(
+            _results("b"), max_results=10, session_id="s2"
+        )
+        assert [r["content"] for r in other] == ["b"]
+
+        stats = await dedup.get_session_stats("s1")
+        assert stats["unique_results_cached"] == 3
+
+        await dedup.clear_session("s1")
+        again, _ = await dedup.deduplicate_results(
+            _results("a"), max_results=10, session_id="s1"
+        )
+        assert len(again) == 1
+    finally:
+        dedup.close()
+
+
+@pytest.mark.asyncio
+async def test_only_selected_results_are_recorded(tmp_path):
+    """Test that results beyond max_results stay available for later searches."""
+    dedup = SQLiteSearchDeduplicator(tmp_path / "dedup.sqlite3")
+    try:
+        contents = [f"result {i}" for i in range(1200)]
+        first, _ = await dedup.deduplicate_results(
+            _results(*contents), max_results=40, session_id="s"
+        )
+        assert len(first) == 40
+
+        rest, dupes = await dedup.deduplicate_results(
+            _results(*contents), max_results=2000, session_id="s"
+        )
+        assert dupes == 40
+        assert [r["content"] for r in rest] == contents[40:]
+    finally:
+        dedup.close()
+
+
+@pytest.mark.asyncio
+async def test_old_databases_keep_their_schema(tmp_path):
+    """Test that databases created by the old deduplicator work unchanged."""
+    db_path = tmp_path / "dedup.sqlite3"
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE search_dedup_cache (
+                session_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                query TEXT,
+                PRIMARY KEY (session_id, content_hash)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX idx_dedup_timestamp ON search_dedup_cache(timestamp)"
+        )
+    conn.close()
+
+    dedup = SQLiteSearchDeduplicator(db_path)
+    try:
+        results, _ = await dedup.deduplicate_results(
+            _results("a"), max_results=10, session_id="s"
+        )
+        assert len(results) == 1
+        _, dupes = await dedup.deduplicate_results(
+            _results("a"), max_results=10, session_id="s"
+        )
+        assert dupes == 1
+    finally:
+        dedup.close()
+
+    conn = sqlite3.connect(db_path)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(search_dedup_cache)")]
+    conn.close()
+    assert columns == ["session_id", "content_hash", "timestamp", "query"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_of_a_session_share_results(tmp_path):
+    """Test that sibling searches in one turn never return the same result."""
+    dedup = SQLiteSearchDeduplicator(tmp_path / "dedup.sqlite3")
+    try:
+        contents = [f"result {i}" for i in range(20)]
+        outcomes = await asyncio.gather(
+            *(
+                dedup.deduplicate_results(
+                    _results(*contents), max_results=20, session_id="s"
+                )
+                for _ in range(5)
+            )
+        )
+        returned = [r["content"] for results, _ in outcomes for r in results]
+        assert sorted(returned) == sorted(contents)
+    finally:
+        dedup.close()
@@ -165,6 +165,259 @@ async def test_concurrent_access():
         os.unlink(db_path)
 
 
+@pytest.mark.asyncio
+async def test_set_session_writes_only_new_suffix():
+    """Test that history is stored as an append-only message log."""
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        history = [{"role": "user", "content": f"msg {i}"} for i in range(3)]
+        session = UnifiedSession(
+            project="test-project",
+            tool="test-tool",
+            session_id="log_test",
+            updated_at=int(time.time()),
+            history=list(history),
+        )
+        await cache.set_session(session)
+
+        # Unchanged prefix rows must survive a later turn untouched
+        await cache._execute_async(
+            "UPDATE session_messages SET role = 'marker' WHERE seq = 0", fetch=False
+        )
+        session.history.append({"role": "assistant", "content": "reply"})
+        await cache.set_session(session)
+
+        rows = await cache._execute_async(
+            "SELECT seq, role FROM session_messages WHERE session_id = ? ORDER BY seq",
+            ("log_test",),
+        )
+        assert [r[0] for r in rows] == [0, 1, 2, 3]
+        assert rows[0][1] == "marker"
+        assert rows[3][1] == "assistant"
+
+        # The metadata row no longer carries a history blob
+        blob = await cache._execute_async(
+            "SELECT history FROM unified_sessions WHERE session_id = ?",
+            ("log_test",),
+        )
+        assert blob[0][0] is None
+
+        # Rewriting an earlier message replaces the log from that point on
+        session.history[1] = {"role": "user", "content": "edited"}
+        await cache.set_session(session)
+        result = await cache.get_session("test-project", "test-tool", "log_test")
+        assert result.history == [
+            history[0],
+            {"role": "user", "content": "edited"},
+            history[2],
+            {"role": "assistant", "content": "reply"},
+        ]
+
+        # Shrinking the history drops the trailing rows
+        session.history = session.history[:2]
+        await cache.set_session(session)
+        result = await cache.get_session("test-project", "test-tool", "log_test")
+        assert len(result.history) == 2
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_get_messages_range_and_append():
+    """Test ranged history reads and appends without a full rewrite."""
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        messages = [{"role": "user", "content": str(i)} for i in range(10)]
+        await cache.append_messages("p", "t", "range_test", messages[:6])
+        await cache.append_messages("p", "t", "range_test", messages[6:])
+
+        assert await cache.get_messages("p", "t", "range_test") == messages
+        assert (
+            await cache.get_messages("p", "t", "range_test", start=-3)
+            == (messages[-3:])
+        )
+        assert await cache.get_messages("p", "t", "range_test", 2, 5) == (messages[2:5])
+        assert await cache.get_messages("p", "t", "missing") == []
+
+        await cache.delete_session("p", "t", "range_test")
+        rows = await cache._execute_async("SELECT COUNT(*) FROM session_messages")
+        assert rows[0][0] == 0
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_legacy_history_blob_is_migrated_on_write():
+    """Test that sessions stored as a JSON blob stay readable and move to the log."""
+    import orjson
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        legacy = [{"role": "user", "content": "old"}]
+        await cache._execute_async(
+            "INSERT INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) "
+            "VALUES(?,?,?,?,?,?)",
+            (
+                "p",
+                "t",
+                "legacy",
+                orjson.dumps(legacy).decode(),
+                '{"response_id": "r1"}',
+                int(time.time()),
+            ),
+            fetch=False,
+        )
+
+        assert await cache.get_messages("p", "t", "legacy") == legacy
+
+        await cache.append_messages(
+            "p", "t", "legacy", [{"role": "assistant", "content": "new"}]
+        )
+        session = await cache.get_session("p", "t", "legacy")
+        assert [m["content"] for m in session.history] == ["old", "new"]
+        assert session.provider_metadata == {"response_id": "r1"}
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_message_token_counts_are_cached():
+    """Test that token counts are stored per message and backfilled when missing."""
+    import orjson
+    from unittest.mock import patch
+
+    from mcp_the_force.utils.token_counter import count_tokens
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        messages = [
+            {"role": "user", "content": "hello"},
+            {"role": "assistant", "content": "a much longer reply " * 20},
+        ]
+        await cache.append_messages("p", "t", "tokens", messages[:1])
+        await cache.set_session(
+            UnifiedSession(
+                project="p",
+                tool="t",
+                session_id="tokens",
+                history=messages,
+                updated_at=int(time.time()),
+            )
+        )
+
+        expected = [count_tokens([orjson.dumps(m).decode()]) for m in messages]
+        expected_text = [count_tokens([m["content"]]) for m in messages]
+        with patch(
+            "mcp_the_force.unified_session_cache.count_tokens_batch"
+        ) as mock_count:
+            history, tokens, text_tokens = await cache.get_messages_with_tokens(
+                "p", "t", "tokens"
+            )
+            mock_count.assert_not_called()
+        assert history == messages
+        assert tokens == expected
+        assert text_tokens == expected_text
+        assert all(t < n for t, n in zip(text_tokens, tokens))
+
+        # Rows stored before counts existed are counted once on read
+        await cache._execute_async(
+            "UPDATE session_messages SET tokens = NULL, text_tokens = NULL",
+            fetch=False,
+        )
+        assert await cache.get_messages_with_tokens("p", "t", "tokens") == (
+            messages,
+            expected,
+            expected_text,
+        )
+        rows = await cache._execute_async(
+            "SELECT COUNT(*) FROM session_messages "
+            "WHERE tokens IS NULL OR text_tokens IS NULL"
+        )
+        assert rows[0][0] == 0
+        assert await cache.get_messages_with_tokens("p", "t", "missing") == (
+            [],
+            [],
+            [],
+        )
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_responses_history_text_is_counted_and_indexed():
+    """Test that Responses API input_text/output_text parts count as text."""
+    from mcp_the_force.utils.token_counter import count_tokens
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        messages = [
+            {
+                "role": "user",
+                "content": [{"type": "input_text", "text": "Why is parsing slow?"}],
+            },
+            {
+                "type": "message",
+                "role": "assistant",
+                "content": [
+                    {"type": "output_text", "text": "The lexer backtracks."},
+                    {"type": "refusal", "refusal": "ignored"},
+                ],
+            },
+            {
+                "type": "function_call",
+                "call_id": "call_1",
+                "name": "search",
+                "arguments": "{}",
+            },
+            {
+                "type": "function_call_output",
+                "call_id": "call_1",
+                "output": "lexer.py matched",
+            },
+        ]
+        await cache.append_messages("p", "t", "responses", messages)
+
+        _, _, text_tokens = await cache.get_messages_with_tokens("p", "t", "responses")
+        assert text_tokens == [
+            count_tokens(["Why is parsing slow?"]),
+            count_tokens(["The lexer backtracks."]),
+            count_tokens([""]),
+            count_tokens(["lexer.py matched"]),
+        ]
+
+        hits = await cache.search_messages("lexer")
+        assert sorted(h["message_index"] for h in hits) == [1, 3]
+        hits = await cache.search_messages("parsing")
+        assert [h["message_index"] for h in hits] == [0]
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
 @pytest.mark.asyncio
 async def test_long_ids_rejected():
     """Test that overly long IDs are rejected."""
@@ -329,3 +582,187 @@ class TestSessionCacheSummary:
         # Summary should be invalidated (None)
         summary = await unified_session_cache.get_summary(project, tool, session_id)
         assert summary is None
+
+
+@pytest.mark.asyncio
+async def test_search_messages_uses_full_text_index():
+    """Test that message text is indexed on write and ranked on search."""
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        session = UnifiedSession(
+            project="p",
+            tool="chat_with_gpt52",
+            session_id="fts",
+            updated_at=int(time.time()),
+            history=[
+                {"role": "user", "content": "Why is the memory vault slow?"},
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [
+                        {"type": "text", "text": "The vault rebuilds its index."}
+                    ],
+                },
+            ],
+        )
+        await cache.set_session(session)
+        await cache.append_messages(
+            "p", "chat_with_gpt52_pro", "other", [{"role": "user", "content": "vault"}]
+        )
+
+        hits = await cache.search_messages("VAULT index")
+        assert [(h["session_id"], h["message_index"]) for h in hits] == [("fts", 1)]
+        assert hits[0]["role"] == "assistant"
+        assert "rebuilds" in hits[0]["snippet"]
+        assert 0 < hits[0]["score"] < 1
+
+        hits = await cache.search_messages("vault", tool="chat_with_gpt52")
+        assert {h["session_id"] for h in hits} == {"fts"}
+        assert len(await cache.search_messages("vault", tool_prefix="chat_with_")) == 3
+
+        # Rewriting history re-indexes only the changed suffix
+        session.history[1] = {"role": "assistant", "content": "Compaction fixed it."}
+        await cache.set_session(session)
+        assert await cache.search_messages("rebuilds") == []
+        assert len(await cache.search_messages("compaction")) == 1
+
+        await cache.delete_session("p", "chat_with_gpt52", "fts")
+        rows = await cache._execute_async("SELECT COUNT(*) FROM session_messages_fts")
+        assert rows[0][0] == 1
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_fts_index_backfills_existing_sessions():
+    """Test that legacy blobs and existing log rows are indexed on upgrade."""
+    import sqlite3
+
+    import orjson
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        await cache.append_messages(
+            "p", "t", "logged", [{"role": "user", "content": "quantum widgets"}]
+        )
+        cache.close()
+
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("DROP TABLE session_messages_fts")
+            conn.execute(
+                "INSERT INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) "
+                "VALUES(?,?,?,?,?,?)",
+                (
+                    "p",
+                    "t",
+                    "legacy",
+                    orjson.dumps(
+                        [{"role": "user", "content": "legacy widgets"}]
+                    ).decode(),
+                    None,
+                    int(time.time()),
+                ),
+            )
+        conn.close()
+
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        hits = await cache.search_messages("widgets")
+        assert {h["session_id"] for h in hits} == {"logged", "legacy"}
+        session = await cache.get_session("p", "t", "legacy")
+        assert session.history == [{"role": "user", "content": "legacy widgets"}]
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_session_lookups_use_covering_indexes():
+    """Test that listing and lookup by session_id never read table rows."""
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        queries = [
+            (
+                "SELECT tool, session_id FROM unified_sessions WHERE project = ? "
+                "ORDER BY updated_at DESC LIMIT 5",
+                ("p",),
+            ),
+            (
+                "SELECT project, tool FROM unified_sessions WHERE session_id = ? LIMIT 1",
+                ("s",),
+            ),
+            (
+                "SELECT project FROM unified_sessions WHERE session_id = ? AND tool = ? LIMIT 1",
+                ("s", "t"),
+            ),
+        ]
+        for query, params in queries:
+            plan = await cache._execute_async(f"EXPLAIN QUERY PLAN {query}", params)
+            details = " ".join(row[3] for row in plan)
+            assert "COVERING INDEX" in details, details
+            assert "TEMP B-TREE" not in details, details
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_legacy_history_blobs_are_moved_out_on_open():
+    """Test that opening the cache moves history blobs into the message log."""
+    import sqlite3
+
+    import orjson
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600).close()
+        legacy = [
+            {"role": "user", "content": "old question"},
+            {"role": "assistant", "content": "old answer"},
+        ]
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute(
+                "INSERT INTO unified_sessions(project, tool, session_id, history, provider_metadata, updated_at) "
+                "VALUES(?,?,?,?,?,?)",
+                (
+                    "p",
+                    "t",
+                    "blob",
+                    orjson.dumps(legacy).decode(),
+                    None,
+                    int(time.time()),
+                ),
+            )
+        conn.close()
+
+        cache = _SQLiteUnifiedSessionCache(db_path=db_path, ttl=3600)
+        rows = await cache._execute_async(
+            "SELECT COUNT(*) FROM unified_sessions WHERE history IS NOT NULL"
+        )
+        assert rows[0][0] == 0
+        history, tokens, text_tokens = await cache.get_messages_with_tokens(
+            "p", "t", "blob"
+        )
+        assert history == legacy
+        assert all(count > 0 for count in tokens)
+        assert all(0 < t < n for t, n in zip(text_tokens, tokens))
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
@@ -0,0 +1,153 @@
+"""Tests for the read pool and batched writer of BaseSQLiteCache."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from mcp_the_force.sqlite_base_cache import BaseSQLiteCache, SharedCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = BaseSQLiteCache(
+        db_path=str(tmp_path / "cache.sqlite3"),
+        ttl=3600,
+        table_name="items",
+        create_table_sql=(
+            "CREATE TABLE IF NOT EXISTS items("
+            "key TEXT PRIMARY KEY, value TEXT, updated_at INTEGER NOT NULL)"
+        ),
+    )
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_all_committed(cache):
+    """Test that writes queued together land and are readable afterwards."""
+    await asyncio.gather(
+        *(
+            cache._execute_async(
+                "INSERT INTO items(key, value, updated_at) VALUES(?,?,?)",
+                (f"k{i}", str(i), i),
+                fetch=False,
+            )
+            for i in range(50)
+        )
+    )
+
+    rows = await cache._execute_async("SELECT COUNT(*) FROM items")
+    assert rows[0][0] == 50
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_roll_back_its_batch(cache):
+    """Test that one failing request in a batch only undoes its own changes."""
+    release = threading.Event()
+    # Hold the writer so the following requests queue up as one batch
+    blocker = asyncio.ensure_future(
+        cache._transaction_async(lambda conn: release.wait(5))
+    )
+    await asyncio.sleep(0.05)
+
+    def failing(conn):
+        conn.execute("INSERT INTO items(key, value, updated_at) VALUES('bad', 'x', 0)")
+        raise ValueError("boom")
+
+    good = cache._execute_async(
+        "INSERT INTO items(key, value, updated_at) VALUES('good', 'y', 0)",
+        fetch=False,
+    )
+    bad = cache._transaction_async(failing)
+    tasks = asyncio.gather(good, bad, return_exceptions=True)
+    await asyncio.sleep(0.05)
+    release.set()
+    await blocker
+    results = await tasks
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    rows = await cache._execute_async("SELECT key FROM items")
+    assert [row[0] for row in rows] == ["good"]
+
+
+@pytest.mark.asyncio
+async def test_reads_are_not_blocked_by_a_pending_write(cache):
+    """Test that SELECTs use pooled connections while the writer is busy."""
+    await cache._execute_async(
+        "INSERT INTO items(key, value, updated_at) VALUES('a', '1', 0)", fetch=False
+    )
+    release = threading.Event()
+    writer = asyncio.ensure_future(
+        cache._transaction_async(lambda conn: release.wait(5))
+    )
+    await asyncio.sleep(0.05)
+
+    rows = await asyncio.wait_for(
+        cache._execute_async("SELECT value FROM items WHERE key = 'a'"), timeout=2
+    )
+    assert rows == [("1",)]
+
+    release.set()
+    await writer
+
+
+@pytest.mark.asyncio
+async def test_read_connections_reject_writes(cache):
+    """Test that pooled read connections are query-only."""
+    with pytest.raises(sqlite3.OperationalError):
+        await cache._read_async(
+            lambda conn: conn.execute(
+                "INSERT INTO items(key, value, updated_at) VALUES('x', 'x', 0)"
+            )
+        )
+
+
+def test_close_waits_for_read_connections_in_use(cache):
+    """Test that close() does not close a read connection another thread holds."""
+    conn = cache._acquire_reader()
+    closer = threading.Thread(target=cache.close)
+    closer.start()
+    closer.join(0.2)
+    assert closer.is_alive()
+
+    conn.execute("BEGIN")
+    conn.execute("SELECT COUNT(*) FROM items").fetchone()
+    conn.execute("COMMIT")
+    cache._readers.put(conn)
+
+    closer.join(5)
+    assert not closer.is_alive()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    with pytest.raises(RuntimeError):
+        cache._acquire_reader()
+
+
+def test_shared_cache_fails_once_and_reopens_on_new_path(tmp_path):
+    """Test that a failed open is not retried until db_path changes."""
+    calls = []
+
+    def factory(db_path):
+        calls.append(db_path)
+        if db_path.endswith("bad"):
+            raise RuntimeError("cannot open")
+        return BaseSQLiteCache(
+            db_path=db_path,
+            ttl=60,
+            table_name="items",
+            create_table_sql=(
+                "CREATE TABLE IF NOT EXISTS items(key TEXT, updated_at INTEGER)"
+            ),
+        )
+
+    shared = SharedCache(factory, "Test cache")
+    assert shared.get("bad") is None
+    assert shared.get("bad") is None
+    good = shared.get(str(tmp_path / "good.sqlite3"))
+    assert good is not None
+    assert shared.get(str(tmp_path / "good.sqlite3")) is good
+    assert calls == ["bad", str(tmp_path / "good.sqlite3")]
+    good.close()
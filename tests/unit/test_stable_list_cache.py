@@ -269,6 +269,72 @@ async def test_file_changed_since_last_send_no_change():
         os.unlink(db_path)
 
 
+@pytest.mark.asyncio
+async def test_get_changed_files_batches_lookup():
+    """Test that get_changed_files classifies many files in one call."""
+    with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as f:
+        db_path = f.name
+
+    try:
+        cache = StableListCache(db_path=db_path, ttl=3600)
+
+        await cache.batch_update_sent_files(
+            "test_session",
+            [
+                ("/api/same.py", 100, 1700000000),
+                ("/api/edited.py", 200, 1700000000),
+                ("/api/grown.py", 300, 1700000000),
+            ],
+        )
+        await cache.update_sent_file_info("other_session", "/api/new.py", 1, 1)
+
+        info = await cache.get_sent_files_info(
+            "test_session", ["/api/same.py", "/api/new.py"]
+        )
+        assert info == {"/api/same.py": (100, 1700000000)}
+
+        changed, unchanged = await cache.get_changed_files(
+            "test_session",
+            [
+                ("/api/same.py", 100, 1700000000),
+                ("/api/edited.py", 200, 1700000001),
+                ("/api/grown.py", 301, 1700000000),
+                ("/api/new.py", 1, 1),
+            ],
+        )
+        assert changed == {"/api/edited.py", "/api/grown.py", "/api/new.py"}
+        assert unchanged == {"/api/same.py"}
+
+        assert await cache.get_changed_files("test_session", []) == (set(), set())
+
+        cache.close()
+    finally:
+        os.unlink(db_path)
+
+
+@pytest.mark.asyncio
+async def test_get_file_change_status_treats_missing_files_as_changed(tmp_path):
+    """Test that files which can no longer be stat'ed are reported as changed."""
+    db_path = str(tmp_path / "cache.sqlite3")
+    cache = StableListCache(db_path=db_path, ttl=3600)
+
+    present = tmp_path / "present.py"
+    present.write_text("x = 1\n")
+    st = os.stat(present)
+    await cache.update_sent_file_info(
+        "test_session", str(present), st.st_size, st.st_mtime_ns
+    )
+    missing = str(tmp_path / "missing.py")
+
+    changed, unchanged = await cache.get_file_change_status(
+        "test_session", [missing, str(present)]
+    )
+    assert changed == [missing]
+    assert unchanged == [str(present)]
+
+    cache.close()
+
+
 @pytest.mark.asyncio
 async def test_reset_session():
     """Test resetting all data for a session."""
@@ -23,6 +23,17 @@ async def temp_files():
         yield files
 
 
+def _changed_files(predicate):
+    """Build a get_changed_files mock that marks paths matching predicate as changed."""
+
+    async def get_changed_files(session_id, files_info):
+        paths = {path for path, _, _ in files_info}
+        changed = {path for path in paths if predicate(path)}
+        return changed, paths - changed
+
+    return AsyncMock(side_effect=get_changed_files)
+
+
 @pytest.fixture
 async def mock_cache():
     """Create a mock StableListCache."""
@@ -31,7 +42,7 @@ async def mock_cache():
     cache.save_stable_list = AsyncMock()
     cache.update_sent_file_info = AsyncMock()
     cache.batch_update_sent_files = AsyncMock()
-    cache.file_changed_since_last_send = AsyncMock(return_value=True)
+    cache.get_changed_files = _changed_files(lambda path: True)
     return cache
 
 
@@ -83,9 +94,7 @@ class TestStableListRegression:
 
         # Setup for second call - stable list exists
         mock_cache.get_stable_list = AsyncMock(return_value=temp_files)
-        mock_cache.file_changed_since_last_send = AsyncMock(
-            return_value=False
-        )  # No changes
+        mock_cache.get_changed_files = _changed_files(lambda path: False)  # No changes
 
         # Second call - should not resend unchanged files
         files_sent, overflow_files, file_tree = await build_context_with_stable_list(
@@ -112,11 +121,8 @@ class TestStableListRegression:
         mock_cache.get_stable_list = AsyncMock(return_value=temp_files)
 
         # Mock that only the first file has changed
-        async def file_changed_mock(sid, filepath):
-            return filepath.endswith("file0.txt")
-
-        mock_cache.file_changed_since_last_send = AsyncMock(
-            side_effect=file_changed_mock
+        mock_cache.get_changed_files = _changed_files(
+            lambda path: path.endswith("file0.txt")
         )
 
         # Mock both gather_file_paths_async and load_specific_files_async
@@ -181,13 +187,9 @@ class TestStableListRegression:
 
         mock_cache.get_stable_list = AsyncMock(return_value=regular_files)
 
-        # Mock file_changed_since_last_send to return False for regular files (already sent)
-        # and True for priority file (new)
-        async def file_changed_mock(sid, filepath):
-            return filepath == priority_file
-
-        mock_cache.file_changed_since_last_send = AsyncMock(
-            side_effect=file_changed_mock
+        # Regular files were already sent; only the priority file is new
+        mock_cache.get_changed_files = _changed_files(
+            lambda path: path == priority_file
         )
 
         # Mock both gather_file_paths_async and load_specific_files_async
@@ -257,3 +257,71 @@ class TestNonexistentPathHandling:
 
             # Should gracefully handle the nonexistent file
             assert "/nonexistent/path/file.txt" not in plan.inline_files
+
+
+class TestOverflowPromotion:
+    """Tests for promoting overflow files when there is budget to spare."""
+
+    @staticmethod
+    def _subsequent_call_cache():
+        mock_cache_instance = create_mock_stable_cache()
+        mock_cache_instance.is_first_call = AsyncMock(return_value=False)
+        return mock_cache_instance
+
+    @pytest.mark.asyncio
+    async def test_all_overflow_files_are_considered(self, tmp_path):
+        """Every overflow file is a promotion candidate, not just the first 50."""
+        from mcp_the_force.optimization.token_budget_optimizer import (
+            TokenBudgetOptimizer,
+        )
+
+        for i in range(80):
+            (tmp_path / f"mod{i:02d}.py").write_text(f"value_{i} = {i}\n")
+
+        with patch(
+            "mcp_the_force.optimization.token_budget_optimizer.StableListCache"
+        ) as MockCache:
+            cache = self._subsequent_call_cache()
+            MockCache.return_value = cache
+
+            optimizer = TokenBudgetOptimizer(
+                model_limit=100_000,
+                fixed_reserve=10_000,
+                session_id="test-session-promotion",
+                context_paths=[str(tmp_path)],
+                developer_prompt="Test",
+                instructions="Test",
+                output_format="text",
+            )
+            plan = await optimizer.optimize()
+
+        saved_inline = cache.save_stable_list.call_args[0][1]
+        assert len(saved_inline) == 80
+        assert plan.overflow_files == []
+
+    @pytest.mark.asyncio
+    async def test_smallest_files_are_promoted_first(self, tmp_path):
+        """Promotion fits as many files as possible into the spare budget."""
+        from mcp_the_force.optimization.token_budget_optimizer import (
+            TokenBudgetOptimizer,
+        )
+        from mcp_the_force.utils.token_utils import file_wrapper_tokens
+
+        small = tmp_path / "small.py"
+        small.write_text("x = 1\n")
+        large = tmp_path / "large.py"
+        large.write_text("y = 2\n" * 2000)
+
+        optimizer = TokenBudgetOptimizer(
+            model_limit=100_000,
+            fixed_reserve=10_000,
+            session_id="test-session-knapsack",
+            context_paths=[],
+        )
+        budget = 10 + file_wrapper_tokens(str(small))
+        promoted = await optimizer._promote_files_to_fill_budget(
+            [str(large), str(small)], budget
+        )
+
+        assert [path for path, _, _ in promoted] == [str(small)]
+        assert promoted[0][1] == "x = 1\n"
@@ -0,0 +1,157 @@
+"""Test the persistent token count cache."""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+from mcp_the_force.utils.token_cache import TokenCountCache
+from mcp_the_force.utils.token_counter import count_tokens
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_unchanged_files_are_served_from_stat_key(tmp_path):
+    """Test that a second count of unchanged files does not tokenize."""
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    a = _write(tmp_path / "a.py", "def a():\n    return 1\n")
+    b = _write(tmp_path / "b.py", "print('hello world')\n")
+
+    first = cache.count_files([a, b])
+    assert first[a] == count_tokens([open(a).read()])
+    assert cache.stats() == {"hits": 0, "hash_hits": 0, "misses": 2}
+
+    with patch("mcp_the_force.utils.token_cache.count_tokens_batch") as mock_count:
+        second = cache.count_files([a, b])
+        mock_count.assert_not_called()
+
+    assert second == first
+    assert cache.stats()["hits"] == 2
+    cache.close()
+
+
+def test_touched_file_uses_content_hash(tmp_path):
+    """Test that a changed mtime with identical content reuses the count."""
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    a = _write(tmp_path / "a.py", "x = 1\n" * 20)
+    tokens = cache.count_files([a])[a]
+
+    st = os.stat(a)
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    with patch("mcp_the_force.utils.token_cache.count_tokens_batch") as mock_count:
+        assert cache.count_files([a])[a] == tokens
+        mock_count.assert_not_called()
+    assert cache.stats()["hash_hits"] == 1
+    cache.close()
+
+
+def test_modified_file_is_recounted(tmp_path):
+    """Test that new content is tokenized again."""
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    a = _write(tmp_path / "a.py", "short\n")
+    cache.count_files([a])
+
+    _write(tmp_path / "a.py", "a much longer line of content than before\n")
+    st = os.stat(a)
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    assert cache.count_files([a])[a] == count_tokens([open(a).read()])
+    assert cache.stats()["misses"] == 2
+    cache.close()
+
+
+def test_missing_files_are_skipped(tmp_path):
+    """Test that unreadable paths are left out of the result."""
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    assert cache.count_files([str(tmp_path / "missing.py")]) == {}
+    cache.close()
+
+
+def test_counts_persist_across_instances(tmp_path):
+    """Test that counts survive a restart."""
+    db_path = str(tmp_path / "tokens.sqlite3")
+    a = _write(tmp_path / "a.py", "value = 42\n")
+
+    cache1 = TokenCountCache(db_path=db_path, ttl=3600)
+    cache1.count_files([a])
+    cache1.close()
+
+    cache2 = TokenCountCache(db_path=db_path, ttl=3600)
+    cache2.count_files([a])
+    assert cache2.stats() == {"hits": 1, "hash_hits": 0, "misses": 0}
+    cache2.close()
+
+
+def test_read_and_count_reads_each_file_once(tmp_path):
+    """Test that counting and loading share a single read per file."""
+    from mcp_the_force.utils import context_loader, token_cache
+
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    warm = _write(tmp_path / "warm.py", "print('warm')\n")
+    cold = _write(tmp_path / "cold.py", "print('cold')\n")
+    big = _write(tmp_path / "big.py", "x = 1\n" * 200)
+    cache.count_files([warm])
+
+    reads = []
+    real_read = token_cache.read_text_for_tokens
+
+    def counting_read(path):
+        reads.append(path)
+        return real_read(path)
+
+    with (
+        patch.object(token_cache, "get_token_cache", return_value=cache),
+        patch.object(token_cache, "read_text_for_tokens", counting_read),
+        patch.object(context_loader, "read_text_for_tokens", counting_read),
+    ):
+        counted = context_loader.read_and_count([warm, cold, big], max_tokens_kept=50)
+        by_path = {f.path: f for f in counted}
+        # Cache hits are not read; files over the limit drop their content
+        assert by_path[warm].content is None
+        assert by_path[cold].content == "print('cold')\n"
+        assert by_path[big].content is None
+
+        loaded = context_loader.load_counted_files(counted)
+
+    assert [f.path for f in loaded] == [warm, cold, big]
+    assert all(f.content == open(f.path).read() for f in loaded)
+    assert sorted(reads) == sorted([cold, big, warm, big])
+    assert reads.count(cold) == 1
+    cache.close()
+
+
+def test_sqlite_errors_fall_back_to_counting(tmp_path):
+    """Test that a locked database costs the cache, not the token counts."""
+    cache = TokenCountCache(db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600)
+    a = _write(tmp_path / "a.py", "def a():\n    return 1\n")
+    b = _write(tmp_path / "b.py", "print('hello world')\n")
+    locked = sqlite3.OperationalError("database is locked")
+
+    with (
+        patch.object(cache, "_read", side_effect=locked),
+        patch.object(cache, "_transaction", side_effect=locked),
+    ):
+        counts = cache.count_files([a, b])
+        assert cache.count_content(a, os.stat(a), open(a).read()) == counts[a]
+
+    assert counts == {
+        a: count_tokens([open(a).read()]),
+        b: count_tokens([open(b).read()]),
+    }
+    cache.close()
+
+
+def test_mmap_read_matches_text_mode(tmp_path, monkeypatch):
+    """Test that large files decoded from an mmap equal a text-mode read."""
+    from mcp_the_force.utils import token_cache
+
+    monkeypatch.setattr(token_cache, "MMAP_THRESHOLD", 16)
+    path = tmp_path / "crlf.txt"
+    path.write_bytes("héllo\r\nwörld\rend\x00\n".encode("utf-8") + b"\xff tail")
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        expected = f.read().replace("\x00", "")
+    assert token_cache.read_text_for_tokens(str(path)) == expected
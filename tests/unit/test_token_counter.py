@@ -3,7 +3,11 @@ Unit tests for token counting functionality.
 """
 
 from unittest.mock import patch, Mock
-from mcp_the_force.utils.token_counter import count_tokens
+from mcp_the_force.utils.token_counter import (
+    TOKEN_ENCODE_CHAR_CAP,
+    count_tokens,
+    count_tokens_batch,
+)
 
 
 class TestTokenCounter:
@@ -60,14 +64,55 @@ class TestTokenCounter:
         """Test token counting with tiktoken encoder."""
         # Mock tiktoken encoder
         mock_enc = Mock()
-        mock_enc.encode.return_value = [1, 2, 3]  # 3 tokens
+        mock_enc.encode_ordinary.return_value = [1, 2, 3]  # 3 tokens
 
         with patch("mcp_the_force.utils.token_counter._enc", mock_enc):
             texts = ["test text"]
             count = count_tokens(texts)
 
             assert count == 3
-            mock_enc.encode.assert_called_once_with("test text")
+            mock_enc.encode_ordinary.assert_called_once_with("test text")
+
+    def test_batch_uses_threaded_encoder(self):
+        """Test that several texts are encoded in one batch call."""
+        mock_enc = Mock()
+        mock_enc.encode_ordinary_batch.return_value = [[1], [1, 2], [1, 2, 3]]
+
+        with patch("mcp_the_force.utils.token_counter._enc", mock_enc):
+            counts = count_tokens_batch(["a", "bb", "ccc"])
+
+        assert counts == [1, 2, 3]
+        mock_enc.encode_ordinary_batch.assert_called_once()
+        assert mock_enc.encode_ordinary_batch.call_args[0][0] == ["a", "bb", "ccc"]
+
+    def test_batch_keeps_estimation_fallbacks(self):
+        """Test that oversized and pathological texts are estimated, not encoded."""
+        mock_enc = Mock()
+        mock_enc.encode_ordinary.return_value = [1, 2]
+        pathological = "a" * 20_000
+        oversized = "ab" * (TOKEN_ENCODE_CHAR_CAP // 2 + 1)
+
+        with patch("mcp_the_force.utils.token_counter._enc", mock_enc):
+            counts = count_tokens_batch(["ok", pathological, oversized])
+
+        assert counts == [2, len(pathological) // 4, len(oversized) // 4]
+        mock_enc.encode_ordinary.assert_called_once_with("ok")
+
+    def test_batch_falls_back_when_encoder_fails(self):
+        """Test per-text fallback when the batch encoder raises."""
+        mock_enc = Mock()
+        mock_enc.encode_ordinary_batch.side_effect = RuntimeError("boom")
+        mock_enc.encode_ordinary.side_effect = [[1], RuntimeError("bad text")]
+
+        with patch("mcp_the_force.utils.token_counter._enc", mock_enc):
+            counts = count_tokens_batch(["x", "abcdefgh"])
+
+        assert counts == [1, 2]
+
+    def test_batch_matches_count_tokens(self):
+        """Test that batch counts sum to the scalar API."""
+        texts = ["Hello world", "def f(): pass", ""]
+        assert sum(count_tokens_batch(texts)) == count_tokens(texts)
 
     def test_large_text_sequence(self):
         """Test counting tokens in large text sequence."""
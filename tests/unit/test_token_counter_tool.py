@@ -254,3 +254,34 @@ class TestCountProjectTokens:
         # All directories should have correct file counts
         for dir_info in result["largest_directories"]:
             assert dir_info["file_count"] > 0
+
+    async def test_unchanged_files_are_not_read_again(self, temp_project_dir, tmp_path):
+        """Should serve unchanged files from the token cache by their stat."""
+        from mcp_the_force.utils import token_cache
+
+        cache = token_cache.TokenCountCache(
+            db_path=str(tmp_path / "tokens.sqlite3"), ttl=3600
+        )
+        reads = []
+        real_read = token_cache.read_text_for_tokens
+
+        def counting_read(path):
+            reads.append(path)
+            return real_read(path)
+
+        tool = CountProjectTokens()
+        tool.items = ["file1.txt", "file2.py"]
+        with (
+            patch.object(token_cache, "get_token_cache", return_value=cache),
+            patch.object(token_cache, "read_text_for_tokens", counting_read),
+            patch.object(cache, "put_many", wraps=cache.put_many) as put_many,
+        ):
+            first = await tool.generate()
+            assert len(reads) == 2
+            assert put_many.call_count == 1
+
+            second = await tool.generate()
+
+        assert len(reads) == 2
+        assert second["total_tokens"] == first["total_tokens"]
+        cache.close()
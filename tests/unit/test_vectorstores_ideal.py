@@ -923,6 +923,61 @@ class TestIntegrationScenarios:
         assert "store_id" in store_info
 
 
+class TestInMemorySearchIndex:
+    """Test the inverted index behind InMemoryVectorStore.search."""
+
+    @pytest.mark.asyncio
+    async def test_rare_terms_rank_higher(self):
+        """BM25 should weight a term found in few files above a common one."""
+        from mcp_the_force.vectorstores.in_memory import InMemoryClient
+
+        client = InMemoryClient()
+        store = await client.create("test")
+        files = [VSFile(path=f"{i}.txt", content="common words") for i in range(5)]
+        files.append(VSFile(path="rare.txt", content="common rare"))
+        await store.add_files(files)
+
+        results = await store.search("rare common", k=3)
+        assert results[0].content == "common rare"
+        assert results[0].score > results[1].score
+
+    @pytest.mark.asyncio
+    async def test_deleted_files_leave_the_index(self):
+        """Deleted files should not keep postings or metadata entries."""
+        from mcp_the_force.vectorstores.in_memory import InMemoryClient
+
+        client = InMemoryClient()
+        store = await client.create("test")
+        ids = await store.add_files(
+            [VSFile(path="a.txt", content="alpha beta", metadata={"kind": "a"})]
+        )
+        await store.delete_files(ids)
+
+        assert store._postings == {}
+        assert store._metadata_index == {}
+        assert store._total_length == 0
+        assert await store.search("alpha") == []
+
+    @pytest.mark.asyncio
+    async def test_partial_words_and_punctuation_match(self):
+        """Queries should match words inside punctuation and word prefixes."""
+        from mcp_the_force.vectorstores.in_memory import InMemoryClient
+
+        client = InMemoryClient()
+        store = await client.create("test")
+        await store.add_files(
+            [
+                VSFile(path="config.json", content='{"timeout": 30}'),
+                VSFile(path="notes.txt", content="tokenization notes"),
+            ]
+        )
+
+        results = await store.search("timeout")
+        assert [r.content for r in results] == ['{"timeout": 30}']
+        results = await store.search("token")
+        assert [r.content for r in results] == ["tokenization notes"]
+
+
 # Additional test considerations:
 # - Performance tests (search latency, upload speed)
 # - Concurrency tests (multiple simultaneous operations)
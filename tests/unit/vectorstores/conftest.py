@@ -17,6 +17,7 @@ class IndexProtocol(Protocol):
     def save_index(self, path: str) -> None: ...
     def load_index(self, path: str, max_elements: int) -> None: ...
     def resize_index(self, new_max: int) -> None: ...
+    def mark_deleted(self, label: int) -> None: ...
 
 
 class FakeIndex:
@@ -24,6 +25,7 @@ class FakeIndex:
 
     def __init__(self, *args, **kwargs):
         self._vectors = {}  # id -> vector
+        self._deleted = set()
 
     def init_index(self, max_elements: int, ef_construction: int, M: int) -> None:
         """No-op initialization."""
@@ -42,12 +44,12 @@ class FakeIndex:
         self, queries: np.ndarray, k: int = 10
     ) -> tuple[list[list[int]], list[list[float]]]:
         """Return deterministic dummy results."""
-        num_results = min(k, len(self._vectors))
+        num_results = min(k, len(self._vectors) - len(self._deleted))
         if num_results == 0:
             return [[] for _ in range(len(queries))], [[] for _ in range(len(queries))]
 
-        # Return first k items as results for each query
-        vec_ids = list(self._vectors.keys())[:num_results]
+        # Return first k live items as results for each query
+        vec_ids = [i for i in self._vectors if i not in self._deleted][:num_results]
         labels = [vec_ids for _ in range(len(queries))]
         dists = [[0.1] * num_results for _ in range(len(queries))]
         return labels, dists
@@ -64,6 +66,12 @@ class FakeIndex:
         """No-op resize."""
         pass
 
+    def mark_deleted(self, label: int) -> None:
+        """Hide a stored vector from queries, like hnswlib."""
+        if label not in self._vectors:
+            raise RuntimeError("Label not found")
+        self._deleted.add(label)
+
 
 def fake_index_factory(dim: int) -> IndexProtocol:
     """Factory that creates fake indices for testing."""
@@ -98,10 +106,32 @@ def mock_embedding_model(monkeypatch):
 
 
 @pytest.fixture
-def hnsw_test_client(mock_embedding_model):
+def stub_embedding_model(monkeypatch):
+    """Stub model with the output shapes of a real sentence transformer."""
+    from mcp_the_force.vectorstores.hnsw import embedding
+
+    class StubModel:
+        def encode(self, texts, **kwargs):
+            if isinstance(texts, str):
+                return np.random.rand(384).astype(np.float32)
+            return np.random.rand(len(texts), 384).astype(np.float32)
+
+    monkeypatch.setattr(embedding, "_load_sentence_transformer", StubModel)
+    monkeypatch.setattr(embedding, "_model", None)
+
+
+@pytest.fixture
+def hnsw_test_client(mock_embedding_model, monkeypatch):
     """Provides an HNSW client configured for unit testing."""
+    from mcp_the_force.config import get_settings
+    from mcp_the_force.vectorstores.hnsw import embedding_cache
     from mcp_the_force.vectorstores.hnsw.hnsw_vectorstore import HnswVectorStoreClient
 
+    # Keep embeddings out of the session database as well
+    settings = get_settings().model_copy(deep=True)
+    settings.vector_stores.persist_embeddings = False
+    monkeypatch.setattr(embedding_cache, "get_settings", lambda: settings)
+
     return HnswVectorStoreClient(
         index_factory=fake_index_factory,
         persist=False,  # Disable filesystem operations
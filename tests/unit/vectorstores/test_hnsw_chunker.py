@@ -0,0 +1,90 @@
+"""Tests for the HNSW chunker."""
+
+from pathlib import Path
+
+import pytest
+
+from mcp_the_force.vectorstores.hnsw.chunker import chunk_text, count_tokens
+from mcp_the_force.vectorstores.hnsw.embedding import MODEL_NAME
+
+PACKAGE_DIR = Path(__file__).resolve().parents[3] / "mcp_the_force"
+
+
+def _assert_offsets(text, chunks):
+    for chunk in chunks:
+        assert text[chunk.start : chunk.end] == chunk.text
+
+
+def test_small_paragraphs_are_merged():
+    """Test that tiny paragraphs share a chunk instead of one each."""
+    text = "\n\n".join(f"Note {i}." for i in range(10))
+    chunks = chunk_text(text, "notes.txt")
+
+    assert len(chunks) < 10
+    assert "Note 0." in chunks[0].text
+    _assert_offsets(text, chunks)
+
+
+def test_long_lines_are_split_into_overlapping_windows():
+    """Test that a minified file is bounded and consecutive windows overlap."""
+    text = ";".join(f"var a{i}={i}" for i in range(200))
+    chunks = chunk_text(text, "bundle.min.js", max_tokens=50, overlap_tokens=10)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk.text) <= 50 for chunk in chunks)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following.start < previous.end
+    assert chunks[-1].end == len(text)
+    _assert_offsets(text, chunks)
+
+
+def test_code_is_split_at_definitions():
+    """Test that functions and classes start their own chunks."""
+    body = "\n".join(f"    x{i} = compute({i}, 'value')" for i in range(8))
+    text = (
+        "import os\n\n\n"
+        f"@decorator\ndef first():\n{body}\n\n\n"
+        f"class Second:\n    def method(self):\n{body}\n"
+    )
+    chunks = chunk_text(text, "module.py", min_tokens=1)
+
+    starts = [chunk.text.splitlines()[0] for chunk in chunks]
+    assert starts == ["import os", "@decorator", "class Second:", "def method(self):"]
+    _assert_offsets(text, chunks)
+
+
+def test_markdown_is_split_at_headings():
+    """Test that each markdown section starts at its heading."""
+    section = " ".join(["word"] * 60)
+    text = f"# Intro\n\n{section}\n\n## Usage\n\n{section}\n"
+    chunks = chunk_text(text, "README.md")
+
+    assert [chunk.text.splitlines()[0] for chunk in chunks] == ["# Intro", "## Usage"]
+    _assert_offsets(text, chunks)
+
+
+def test_identifiers_count_as_several_tokens():
+    """Test that underscores, case changes and long words add to the estimate."""
+    assert count_tokens("walk") == 1
+    assert count_tokens("walk_text_files") == 6
+    assert count_tokens("maxTotalSize") == 3
+    assert count_tokens("12345") == 3
+
+
+def test_code_chunks_fit_the_embedding_tokenizer():
+    """Test that code chunks stay within the model's 128 word pieces."""
+    pytest.importorskip("tokenizers")
+    hub = pytest.importorskip("huggingface_hub")
+    from tokenizers import Tokenizer
+
+    path = hub.try_to_load_from_cache(
+        f"sentence-transformers/{MODEL_NAME}", "tokenizer.json"
+    )
+    if not isinstance(path, str):
+        pytest.skip("embedding tokenizer is not cached locally")
+    tokenizer = Tokenizer.from_file(path)
+    tokenizer.no_truncation()
+
+    for source in sorted(PACKAGE_DIR.rglob("*.py")):
+        for chunk in chunk_text(source.read_text(), str(source)):
+            assert len(tokenizer.encode(chunk.text).ids) <= 128, (source, chunk.text)
@@ -1,8 +1,15 @@
 """Unit tests for HNSW delete functionality."""
 
+import asyncio
+import time
+
 import pytest
 
+from mcp_the_force.vectorstores.hnsw import hnsw_vectorstore
 from mcp_the_force.vectorstores.hnsw.hnsw_vectorstore import HnswVectorStoreClient
+from mcp_the_force.vectorstores.protocol import VSFile
+
+pytest_plugins = ["tests.unit.vectorstores.conftest"]
 
 
 @pytest.mark.asyncio
@@ -71,3 +78,155 @@ async def test_delete_partial_store(tmp_path):
     await client.delete(store_id2)
 
     assert not index_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_deleted_files_are_not_returned(tmp_path, stub_embedding_model):
+    """Test that deleting a file removes its chunks from search, across reloads."""
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path
+    store = await client.create(name="edits")
+
+    keep_id, drop_id = await store.add_files(
+        [
+            VSFile(path="keep.py", content="keep one\n\nkeep two"),
+            VSFile(path="drop.py", content="drop one\n\ndrop two"),
+        ]
+    )
+    assert keep_id != drop_id
+
+    await store.delete_files([drop_id])
+    results = await store.search("anything", k=10)
+    assert [r.content for r in results] == ["keep one\n\nkeep two"]
+
+    client2 = HnswVectorStoreClient(persist=True)
+    client2.persistence_dir = tmp_path
+    loaded = await client2.get(store.id)
+    results = await loaded.search("anything", k=10)
+    assert [r.content for r in results] == ["keep one\n\nkeep two"]
+
+    # Deleting unknown or already deleted files is a no-op
+    await loaded.delete_files([drop_id, "file_unknown"])
+    assert len(await loaded.search("anything", k=10)) == 1
+
+
+@pytest.mark.asyncio
+async def test_tombstones_trigger_compaction(
+    tmp_path, monkeypatch, stub_embedding_model
+):
+    """Test that the graph is rebuilt once enough chunks are deleted."""
+    monkeypatch.setattr(hnsw_vectorstore, "COMPACTION_MIN_TOMBSTONES", 2)
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path
+    store = await client.create(name="compact")
+
+    file_ids = await store.add_files(
+        [VSFile(path=f"f{i}.py", content=f"chunk {i}") for i in range(5)]
+    )
+    await store.delete_files(file_ids[:1])
+    assert store._compaction_task is None
+    assert store._tombstones == {0}
+
+    await store.delete_files(file_ids[1:3])
+    await store._compaction_task
+
+    assert store._tombstones == set()
+    assert store._index.get_current_count() == 2
+    assert store._chunks.tombstones() == []
+    results = await store.search("anything", k=10)
+    assert sorted(r.content for r in results) == ["chunk 3", "chunk 4"]
+
+    # Labels are not reused after compaction
+    (new_id,) = await store.add_files([VSFile(path="new.py", content="chunk 5")])
+    assert store._count == 6
+
+    client2 = HnswVectorStoreClient(persist=True)
+    client2.persistence_dir = tmp_path
+    loaded = await client2.get(store.id)
+    assert loaded._index.get_current_count() == 3
+    results = await loaded.search("anything", k=10)
+    assert sorted(r.content for r in results) == ["chunk 3", "chunk 4", "chunk 5"]
+
+
+@pytest.mark.asyncio
+async def test_search_during_compaction(monkeypatch, stub_embedding_model):
+    """Test that a slow search and a background compaction do not block each other."""
+    from tests.unit.vectorstores.conftest import FakeIndex
+
+    class SlowIndex(FakeIndex):
+        def knn_query(self, queries, k=10):
+            time.sleep(0.5)
+            return super().knn_query(queries, k)
+
+    class SlowBuildIndex(SlowIndex):
+        def add_items(self, vectors, ids):
+            # The rebuilt graph is ready while the search is still querying
+            time.sleep(0.2)
+            super().add_items(vectors, ids)
+
+    indexes = []
+
+    def index_factory(dim):
+        indexes.append(SlowBuildIndex() if indexes else SlowIndex())
+        return indexes[-1]
+
+    monkeypatch.setattr(hnsw_vectorstore, "COMPACTION_MIN_TOMBSTONES", 2)
+    client = HnswVectorStoreClient(index_factory=index_factory, persist=False)
+    store = await client.create(name="busy")
+
+    file_ids = await store.add_files(
+        [VSFile(path=f"f{i}.py", content=f"chunk {i}") for i in range(5)]
+    )
+    await store.delete_files(file_ids[:3])
+    assert store._compaction_task is not None
+
+    results, _ = await asyncio.wait_for(
+        asyncio.gather(store.search("anything", k=10), store._compaction_task),
+        timeout=5,
+    )
+
+    assert sorted(r.content for r in results) == ["chunk 3", "chunk 4"]
+    assert store._tombstones == set()
+
+
+@pytest.mark.asyncio
+async def test_search_does_not_overlap_index_resize(stub_embedding_model):
+    """Test that add_files cannot resize the graph while a search queries it."""
+    from tests.unit.vectorstores.conftest import FakeIndex
+
+    overlaps = []
+
+    class CheckedIndex(FakeIndex):
+        querying = False
+
+        def knn_query(self, queries, k=10):
+            self.querying = True
+            time.sleep(0.3)
+            self.querying = False
+            return super().knn_query(queries, k)
+
+        def resize_index(self, new_max):
+            overlaps.append(self.querying)
+
+        def add_items(self, vectors, ids):
+            overlaps.append(self.querying)
+            super().add_items(vectors, ids)
+
+    client = HnswVectorStoreClient(
+        index_factory=lambda dim: CheckedIndex(), persist=False
+    )
+    store = await client.create(name="resize")
+    store._max_elements = 2
+    await store.add_files([VSFile(path="a.py", content="chunk a")])
+
+    async def add_later():
+        await asyncio.sleep(0.1)
+        await store.add_files(
+            [VSFile(path=f"f{i}.py", content=f"chunk {i}") for i in range(3)]
+        )
+
+    results, _ = await asyncio.gather(store.search("anything", k=10), add_later())
+
+    assert [r.content for r in results] == ["chunk a"]
+    assert overlaps == [False, False, False]
+    assert store._count == 4
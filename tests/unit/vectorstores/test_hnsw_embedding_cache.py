@@ -0,0 +1,124 @@
+"""Tests for the batched, persistent HNSW embedding cache."""
+
+import sqlite3
+
+import numpy as np
+
+from mcp_the_force.vectorstores.hnsw.embedding import CachedEmbeddingModel
+from mcp_the_force.vectorstores.hnsw.embedding_cache import EmbeddingCache, text_key
+
+
+class CountingModel:
+    """Deterministic model that records every batch it encodes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append((list(texts), kwargs))
+        return np.array([[len(t), sum(map(ord, t))] for t in texts], dtype=np.float32)
+
+
+def test_batch_is_deduplicated_and_encoded_once():
+    """Test that distinct misses are encoded together with the caller's kwargs."""
+    model = CountingModel()
+    cached = CachedEmbeddingModel(model, persistent_cache=lambda: None)
+
+    vectors = cached.encode(["a", "bb", "a", "ccc"], batch_size=32)
+
+    assert model.batches == [
+        (["a", "bb", "ccc"], {"batch_size": 32, "convert_to_numpy": True})
+    ]
+    assert vectors.shape == (4, 2)
+    assert np.array_equal(vectors[0], vectors[2])
+
+    # A second call with overlap only encodes the new text
+    cached.encode(["bb", "dddd"], batch_size=32)
+    assert model.batches[-1][0] == ["dddd"]
+    assert cached.stats() == {"memory_hits": 1, "disk_hits": 0, "misses": 4}
+
+    # Single strings return a 1-D vector
+    assert cached.encode("a").shape == (2,)
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the in-memory cache keeps recently used texts."""
+    model = CountingModel()
+    cached = CachedEmbeddingModel(
+        model, max_cache_size=2, persistent_cache=lambda: None
+    )
+
+    cached.encode(["a", "b"])
+    cached.encode(["a"])  # refresh "a"
+    cached.encode(["c"])  # evicts "b"
+    model.batches.clear()
+
+    cached.encode(["a", "b", "c"])
+    assert model.batches[0][0] == ["b"]
+
+
+def test_vectors_persist_across_models(tmp_path):
+    """Test that a new process reuses stored vectors without model inference."""
+    store = EmbeddingCache(db_path=str(tmp_path / "emb.sqlite3"), ttl=3600)
+
+    first = CachedEmbeddingModel(CountingModel(), persistent_cache=lambda: store)
+    expected = first.encode(["alpha", "beta"])
+
+    model = CountingModel()
+    second = CachedEmbeddingModel(model, persistent_cache=lambda: store)
+    assert np.array_equal(second.encode(["beta", "alpha"]), expected[::-1])
+    assert model.batches == []
+    assert second.stats()["disk_hits"] == 2
+
+    # Vectors are keyed per model
+    other = CachedEmbeddingModel(
+        CountingModel(), model_name="other-model", persistent_cache=lambda: store
+    )
+    other.encode(["alpha"])
+    assert other.stats()["misses"] == 1
+    store.close()
+
+
+def test_disk_hits_refresh_their_timestamp(tmp_path):
+    """Test that vectors served from disk are kept alive for TTL cleanup."""
+    store = EmbeddingCache(db_path=str(tmp_path / "emb.sqlite3"), ttl=3600)
+    CachedEmbeddingModel(CountingModel(), persistent_cache=lambda: store).encode(
+        ["alpha", "beta"]
+    )
+    with store._lock, store._conn:
+        store._conn.execute("UPDATE embedding_cache SET updated_at = 0")
+
+    second = CachedEmbeddingModel(CountingModel(), persistent_cache=lambda: store)
+    second.encode(["alpha", "gamma"])
+
+    with store._lock:
+        rows = dict(
+            store._conn.execute(
+                "SELECT text_hash, updated_at FROM embedding_cache"
+            ).fetchall()
+        )
+    assert rows[text_key("alpha")] > 0
+    assert rows[text_key("gamma")] > 0
+    assert rows[text_key("beta")] == 0
+    store.close()
+
+
+class LockedCache:
+    """Persistent cache whose database is locked by another process."""
+
+    def get_many(self, model, keys):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put_many(self, model, items, touched=()):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_cache_errors_fall_back_to_encoding():
+    """Test that a failing persistent cache does not fail the encode."""
+    model = CountingModel()
+    cached = CachedEmbeddingModel(model, persistent_cache=LockedCache)
+
+    vectors = cached.encode(["alpha", "beta"])
+
+    assert model.batches[0][0] == ["alpha", "beta"]
+    assert vectors.shape == (2, 2)
@@ -0,0 +1,124 @@
+"""Tests for incremental HNSW persistence and the chunk store."""
+
+import json
+
+import numpy as np
+import pytest
+
+from mcp_the_force.vectorstores.hnsw import hnsw_vectorstore
+from mcp_the_force.vectorstores.hnsw.chunk_store import ChunkStore
+from mcp_the_force.vectorstores.hnsw.hnsw_vectorstore import (
+    HnswVectorStoreClient,
+    _default_index_factory,
+)
+from mcp_the_force.vectorstores.protocol import VSFile
+
+pytest_plugins = ["tests.unit.vectorstores.conftest"]
+
+
+def _files(prefix, n):
+    return [
+        VSFile(path=f"{prefix}{i}.txt", content=f"{prefix} chunk {i}") for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_add_files_appends_without_rewriting_index(
+    tmp_path, stub_embedding_model
+):
+    """Test that adds below the checkpoint threshold only append chunk rows."""
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path
+    store = await client.create(name="incremental")
+
+    index_path = tmp_path / f"{store.id}.bin"
+    saved = index_path.read_bytes()
+    assert not (tmp_path / f"{store.id}.json").exists()
+
+    await store.add_files(_files("a", 3))
+    await store.add_files(_files("b", 2))
+
+    # The index file is untouched; chunks went to the chunk store
+    assert index_path.read_bytes() == saved
+    chunks = ChunkStore(client.chunks_path(store.id))
+    assert chunks.count() == 5
+    assert chunks.get([3]) == {
+        3: {"text": "b chunk 0", "source": "b0.txt", "start": 0, "end": 9}
+    }
+    chunks.close()
+
+    # A fresh client rebuilds the pending chunks from the stored vectors
+    client2 = HnswVectorStoreClient(persist=True)
+    client2.persistence_dir = tmp_path
+    loaded = await client2.get(store.id)
+    results = await loaded.search("chunk", k=10)
+    assert sorted(r.content for r in results) == sorted(
+        [f"a chunk {i}" for i in range(3)] + [f"b chunk {i}" for i in range(2)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_is_checkpointed_periodically(
+    tmp_path, monkeypatch, stub_embedding_model
+):
+    """Test that the index file is rewritten once enough chunks are pending."""
+    monkeypatch.setattr(hnsw_vectorstore, "CHECKPOINT_MIN_PENDING", 4)
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path
+    store = await client.create(name="checkpoint")
+
+    await store.add_files(_files("a", 3))
+    assert store._checkpoint_count == 0
+    await store.add_files(_files("b", 2))
+    assert store._checkpoint_count == 5
+
+    client2 = HnswVectorStoreClient(persist=True)
+    client2.persistence_dir = tmp_path
+    loaded = await client2.get(store.id)
+    assert loaded._checkpoint_count == 5
+    assert loaded._index.get_current_count() == 5
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_store_is_migrated(tmp_path, stub_embedding_model):
+    """Test that stores saved with a JSON metadata file still load."""
+    store_id = "hnsw_legacy"
+    index = _default_index_factory(384)
+    index.init_index(max_elements=10, ef_construction=200, M=16)
+    index.add_items(np.random.rand(2, 384).astype(np.float32), [0, 1])
+    index.save_index(str(tmp_path / f"{store_id}.bin"))
+    (tmp_path / f"{store_id}.json").write_text(
+        json.dumps(
+            [
+                {"text": "first", "source": "a.txt"},
+                {"text": "second", "source": "b.txt"},
+            ]
+        )
+    )
+
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path
+    store = await client.get(store_id)
+
+    assert not (tmp_path / f"{store_id}.json").exists()
+    assert client.chunks_path(store_id).exists()
+    results = await store.search("anything", k=2)
+    assert sorted(r.content for r in results) == ["first", "second"]
+
+    # New chunks continue after the migrated labels
+    await store.add_files([VSFile(path="c.txt", content="third")])
+    results = await store.search("anything", k=3)
+    assert sorted(r.content for r in results) == ["first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_chunk_store(tmp_path, stub_embedding_model):
+    """Test that deleting a store removes its chunk database."""
+    client = HnswVectorStoreClient(persist=True)
+    client.persistence_dir = tmp_path / "hnsw"
+    store = await client.create(name="to-delete")
+    await store.add_files(_files("a", 1))
+    store._chunks.close()
+
+    await client.delete(store.id)
+    assert list(client.persistence_dir.iterdir()) == []
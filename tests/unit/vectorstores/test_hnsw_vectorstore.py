@@ -1,7 +1,6 @@
 """Tests for HNSW vector store implementation using dependency injection."""
 
 import pytest
-import json
 
 from mcp_the_force.vectorstores.protocol import VSFile
 from mcp_the_force.vectorstores import registry
@@ -56,8 +55,7 @@ async def test_persistence_disabled(hnsw_test_client, tmp_path):
     await store.add_files([VSFile(path="test.txt", content="test content")])
 
     # Check that no files were created (persistence disabled)
-    assert len(list(tmp_path.glob("*.bin"))) == 0
-    assert len(list(tmp_path.glob("*.json"))) == 0
+    assert list(tmp_path.iterdir()) == []
 
 
 @pytest.mark.asyncio
@@ -92,6 +90,7 @@ async def test_add_empty_file_list(hnsw_test_client):
 @pytest.mark.skip(reason="Integration test - requires real hnswlib")
 async def test_persistence_enabled(tmp_path):
     """Test actual persistence when enabled."""
+    from mcp_the_force.vectorstores.hnsw.chunk_store import ChunkStore
     from mcp_the_force.vectorstores.hnsw.hnsw_vectorstore import HnswVectorStoreClient
 
     # Create client with persistence enabled
@@ -107,17 +106,23 @@ async def test_persistence_enabled(tmp_path):
 
     # Check files were created
     index_path = tmp_path / f"{store_id}.bin"
-    meta_path = tmp_path / f"{store_id}.json"
+    chunks_path = client.chunks_path(store_id)
 
     assert index_path.exists(), "Index file not created"
-    assert meta_path.exists(), "Metadata file not created"
+    assert chunks_path.exists(), "Chunk store not created"
 
     # Verify metadata content
-    with open(meta_path, "r") as f:
-        metadata = json.load(f)
-    assert len(metadata) == 1
-    assert metadata[0]["text"] == "The secret is hnswlib"
-    assert metadata[0]["source"] == "/test.txt"
+    chunks = ChunkStore(chunks_path)
+    assert chunks.count() == 1
+    assert chunks.get([0]) == {
+        0: {
+            "text": "The secret is hnswlib",
+            "source": "/test.txt",
+            "start": 0,
+            "end": 21,
+        }
+    }
+    chunks.close()
 
 
 @pytest.mark.asyncio